@@ -0,0 +1,104 @@
+"""
+Aho-Corasick multi-pattern string matching in pure Python.
+- Every pattern is added to one trie; build() links each state to the longest
+  proper suffix that is also a trie path (failure links) and merges the
+  outputs along those links
+- iter() then reports every occurrence of every pattern in a single left-to-right
+  pass over the text, in time linear in the text plus the number of matches,
+  however many patterns there are
+- Patterns carry an arbitrary value (a paragraph index, a word id, ...); callers
+  normalize text and patterns the same way before adding / scanning
+
+    automaton = Automaton()
+    automaton.add('he', 1)
+    automaton.add('she', 2)
+    automaton.build()
+    list(automaton.iter('ushers'))   # [(3, 2), (3, 1)]: (end index, value)
+"""
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class Automaton:
+    """Trie with failure links; add() all patterns, build() once, then iter() any number of texts."""
+
+    __slots__ = ('_goto', '_fail', '_out', '_built', 'patterns')
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]  # state -> {char: next state}
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]  # state -> [(pattern length, value)] ending here
+        self._built = False
+        self.patterns = 0
+
+    def __len__(self) -> int:
+        return self.patterns
+
+    def add(self, pattern: str, value: Any = None) -> None:
+        """Add pattern (non-empty) with the value reported for its matches."""
+        if not pattern:
+            raise ValueError("empty pattern")
+        if self._built:
+            raise RuntimeError("add() after build()")
+        goto = self._goto
+        state = 0
+        for ch in pattern:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = goto[state][ch] = len(goto)
+                goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), value))
+        self.patterns += 1
+
+    def build(self) -> 'Automaton':
+        """Compute failure links breadth first; outputs of suffix states are merged in."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+        self._built = True
+        return self
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """(end index, value) of every match, by end position; end index is inclusive."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                for _, value in out[state]:
+                    yield i, value
+
+    def iter_spans(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """(start, end, value) of every match, end exclusive, like a slice."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                for length, value in out[state]:
+                    yield i + 1 - length, i + 1, value
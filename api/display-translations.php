@@ -12,6 +12,10 @@ $scrollKey  = isset($_GET['scroll_key']) && $_GET['scroll_key'] !== '' ? (int)$_
 $chapter    = isset($_GET['chapter']) && $_GET['chapter'] !== '' ? (int)$_GET['chapter'] : null;
 $verse      = isset($_GET['verse']) && $_GET['verse'] !== '' ? (int)$_GET['verse'] : null;
 
+// Verse coverage of cite ranges; created by the migration and by yy_translation imports, but a
+// database restored from an older dump may not have it yet (start verses only, no range ends)
+$hasCoverage = (bool)$pdo->query("SELECT to_regclass('yy_translation_verse') IS NOT NULL")->fetchColumn();
+
 $conditions = [];
 $params = [];
 
@@ -30,8 +34,41 @@ if ($chapter !== null) {
 }
 
 if ($verse !== null) {
-    $conditions[] = "v.yah_verse_number = ?";
-    $params[] = $verse;
+    // Resolve the verse filter to yah_verse keys once, within the scroll / chapter filters
+    $verseConditions = ["rv.yah_verse_number = ?"];
+    $verseParams = [$verse];
+    if ($citeBookId !== null) {
+        $verseConditions[] = "rc.yah_scroll_key IN (SELECT yah_scroll_key FROM yy_cite_book WHERE cite_book_id = ?)";
+        $verseParams[] = $citeBookId;
+    } elseif ($scrollKey !== null) {
+        $verseConditions[] = "rc.yah_scroll_key = ?";
+        $verseParams[] = $scrollKey;
+    }
+    if ($chapter !== null) {
+        $verseConditions[] = "rc.yah_chapter_number = ?";
+        $verseParams[] = $chapter;
+    }
+    $verseStmt = $pdo->prepare("
+        SELECT rv.yah_verse_key FROM yah_verse rv
+        JOIN yah_chapter rc ON rc.yah_chapter_key = rv.yah_chapter_key
+        WHERE " . implode(' AND ', $verseConditions));
+    $verseStmt->execute($verseParams);
+    $verseKeys = array_map('intval', $verseStmt->fetchAll(PDO::FETCH_COLUMN));
+    if (!$verseKeys) {
+        jsonResponse([]);
+    }
+
+    // Start verse, or any verse inside the translation's cite range (yy_translation_verse);
+    // rows entered in the admin have no coverage rows, only their start verse
+    $verseIn = implode(',', array_fill(0, count($verseKeys), '?'));
+    if ($hasCoverage) {
+        $conditions[] = "(t.yah_verse_key IN ($verseIn) OR t.yy_translation_key IN (
+            SELECT yy_translation_key FROM yy_translation_verse WHERE yah_verse_key IN ($verseIn)))";
+        array_push($params, ...$verseKeys, ...$verseKeys);
+    } else {
+        $conditions[] = "t.yah_verse_key IN ($verseIn)";
+        array_push($params, ...$verseKeys);
+    }
 }
 
 $where = count($conditions) > 0 ? 'WHERE ' . implode(' AND ', $conditions) : '';
@@ -64,5 +101,90 @@ $stmt = $pdo->prepare("
              vol.yy_volume_file, t.yy_translation_page
 ");
 $stmt->execute($params);
+$rows = $stmt->fetchAll();
+
+// Range ends from yy_translation_verse in one grouped query over the returned keys
+if ($rows && $hasCoverage) {
+    $keys = array_column($rows, 'translation_id');
+    $in = implode(',', array_fill(0, count($keys), '?'));
+    $endStmt = $pdo->prepare("
+        SELECT tv.yy_translation_key, MAX(rv.yah_verse_number) AS verse_end
+        FROM yy_translation_verse tv
+        JOIN yah_verse rv ON rv.yah_verse_key = tv.yah_verse_key
+        WHERE tv.yy_translation_key IN ($in)
+        GROUP BY tv.yy_translation_key
+    ");
+    $endStmt->execute($keys);
+    $verseEnds = [];
+    foreach ($endStmt->fetchAll() as $end) {
+        $verseEnds[$end['yy_translation_key']] = (int)$end['verse_end'];
+    }
+    foreach ($rows as &$row) {
+        $end = $verseEnds[$row['translation_id']] ?? null;
+        if ($end !== null && $end > (int)$row['translation_cite_verse']) {
+            $row['translation_cite_verse_end'] = $end;
+        }
+    }
+    unset($row);
+}
+
+// Word links tagged offline by build_word_tags.py: [start, end, word_id] UTF-16 offsets into the copy,
+// plus the popup details of those words, so the reader needs no word-lookup.php round trip.
+// Tags computed from an older copy (edited or re-imported since) are skipped; such rows come
+// back without tags and the reader looks their words up live
+if ($rows) {
+    try {
+        $keys = array_column($rows, 'translation_id');
+        $in = implode(',', array_fill(0, count($keys), '?'));
+        $tagStmt = $pdo->prepare("
+            SELECT tw.yy_translation_key, tw.match_start, tw.match_end, tw.word_id
+            FROM yy_translation_word tw
+            JOIN yy_translation t ON t.yy_translation_key = tw.yy_translation_key
+            WHERE tw.yy_translation_key IN ($in) AND tw.copy_md5 = md5(t.yy_translation_copy)
+            ORDER BY tw.yy_translation_key, tw.match_start
+        ");
+        $tagStmt->execute($keys);
+        $tags = [];
+        $wordIds = [];
+        foreach ($tagStmt->fetchAll() as $tag) {
+            $tags[$tag['yy_translation_key']][] = [(int)$tag['match_start'], (int)$tag['match_end'], (int)$tag['word_id']];
+            $wordIds[(int)$tag['word_id']] = true;
+        }
+
+        $words = [];
+        if ($wordIds) {
+            $ids = array_keys($wordIds);
+            $idIn = implode(',', array_fill(0, count($ids), '?'));
+            $wordStmt = $pdo->prepare("
+                SELECT w.word_id, w.word_yt, w.word_hebrew, w.word_strongs,
+                       w.word_gender, w.word_flag_plural,
+                       w.word_flag_noun, w.word_flag_verb, w.word_flag_adjective,
+                       w.word_flag_adverb, w.word_flag_preposition, w.word_flag_conjunction,
+                       w.word_flag_subst, w.word_definition_kirk, w.word_definition_yy,
+                       w.word_definition_external
+                FROM yy_word w
+                WHERE w.word_id IN ($idIn) AND w.word_active_flag = true
+            ");
+            $wordStmt->execute($ids);
+            foreach ($wordStmt->fetchAll() as $word) {
+                $words[(int)$word['word_id']] = $word;
+            }
+        }
+
+        foreach ($rows as &$row) {
+            $row['translation_words'] = [];
+            $row['words'] = new stdClass();
+            foreach ($tags[$row['translation_id']] ?? [] as $tag) {
+                if (isset($words[$tag[2]])) {
+                    $row['translation_words'][] = $tag;
+                    $row['words']->{$tag[2]} = $words[$tag[2]];
+                }
+            }
+        }
+        unset($row);
+    } catch (PDOException $e) {
+        // yy_translation_word not built yet: rows go out without tags and the page falls back to word-lookup.php
+    }
+}
 
-jsonResponse($stmt->fetchAll());
+jsonResponse($rows);
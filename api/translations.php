@@ -79,14 +79,15 @@ function handleGet(PDO $db, array $user): void {
     $scrollKey = $_GET['scroll_key'] ?? null;
     $chapterKey = $_GET['chapter_key'] ?? null;
     $verseKey = $_GET['verse_key'] ?? null;
+    $search = isset($_GET['search']) ? trim($_GET['search']) : '';
 
     // Must have at least one filter (or use list=all above)
-    if (!$verseKey && !$chapterKey && !$scrollKey) {
+    if (!$verseKey && !$chapterKey && !$scrollKey && $search === '') {
         // Show all translations if 'all_translations' flag is set
         if (isset($_GET['all_translations'])) {
             $scrollKey = null; // no filter
         } else {
-            errorResponse('verse_key, chapter_key, scroll_key, all_translations, translation_key, or list=all is required');
+            errorResponse('verse_key, chapter_key, scroll_key, search, all_translations, translation_key, or list=all is required');
         }
     }
 
@@ -104,6 +105,12 @@ function handleGet(PDO $db, array $user): void {
         $where[] = 't.yah_verse_key = ?';
         $params[] = (int)$verseKey;
     }
+    if ($search !== '') {
+        // Full-text match on tag-stripped copy, maintained by build_search_index.py
+        $where[] = "t.yy_translation_key IN (SELECT yy_translation_key FROM yy_translation_search
+                    WHERE yy_translation_tsv @@ websearch_to_tsquery('simple', ?))";
+        $params[] = $search;
+    }
 
     $whereClause = count($where) > 0 ? 'WHERE ' . implode(' AND ', $where) : '';
 
@@ -44,31 +44,15 @@ function handleGet(PDO $db): void {
         $chapterKey = isset($_GET['filter_chapter']) && ctype_digit($_GET['filter_chapter']) ? (int)$_GET['filter_chapter'] : null;
         $verseKey = isset($_GET['filter_verse']) && ctype_digit($_GET['filter_verse']) ? (int)$_GET['filter_verse'] : null;
 
-        $sql = "SELECT yy_translation_copy FROM yy_translation WHERE yah_scroll_key = ?";
+        // yy_verse_word is materialized from <span class="word"> spellings by build_scope_index.py
+        $sql = "SELECT DISTINCT word_id FROM yy_verse_word WHERE yah_scroll_key = ?";
         $params = [$scrollKey];
         if ($chapterKey) { $sql .= " AND yah_chapter_key = ?"; $params[] = $chapterKey; }
         if ($verseKey) { $sql .= " AND yah_verse_key = ?"; $params[] = $verseKey; }
 
         $stmt = $db->prepare($sql);
         $stmt->execute($params);
-
-        $spellings = [];
-        while ($row = $stmt->fetch()) {
-            $copy = $row['yy_translation_copy'];
-            if ($copy && preg_match_all('/<span\s+class="word"[^>]*>(.*?)<\/span>/si', $copy, $m)) {
-                foreach ($m[1] as $w) {
-                    $clean = strtolower(trim(strip_tags($w)));
-                    if ($clean !== '') $spellings[$clean] = true;
-                }
-            }
-        }
-
-        if (empty($spellings)) { jsonResponse(['word_ids' => []]); }
-
-        $phs = implode(',', array_fill(0, count($spellings), '?'));
-        $stmt2 = $db->prepare("SELECT DISTINCT word_id FROM yy_word_spelling WHERE LOWER(word_spelling_text) IN ($phs)");
-        $stmt2->execute(array_keys($spellings));
-        $ids = array_map('intval', array_column($stmt2->fetchAll(), 'word_id'));
+        $ids = array_map('intval', array_column($stmt->fetchAll(), 'word_id'));
 
         jsonResponse(['word_ids' => $ids]);
     }
@@ -77,19 +61,23 @@ function handleGet(PDO $db): void {
     if (isset($_GET['search']) && trim($_GET['search']) !== '') {
         $term = '%' . trim($_GET['search']) . '%';
         $stmt = $db->prepare("
-            SELECT DISTINCT w.word_id, w.word_strongs, w.word_hebrew, w.word_yt, w.word_active_flag,
+            SELECT w.word_id, w.word_strongs, w.word_hebrew, w.word_yt, w.word_active_flag,
                    w.word_definition_kirk, w.word_definition_yy, w.word_definition_external, w.word_count_yy,
                    (SELECT string_agg(s.word_spelling_text, ', ' ORDER BY s.word_spelling_sort, s.word_spelling_id)
                     FROM yy_word_spelling s WHERE s.word_id = w.word_id) AS spellings_display
             FROM yy_word w
-            LEFT JOIN yy_word_spelling s ON s.word_id = w.word_id
-            WHERE w.word_strongs LIKE ?
-               OR w.word_hebrew LIKE ?
-               OR w.word_yt LIKE ?
-               OR s.word_spelling_text ILIKE ?
-               OR w.word_definition_kirk ILIKE ?
-               OR w.word_definition_yy ILIKE ?
-               OR w.word_definition_external ILIKE ?
+            WHERE w.word_id IN (
+                -- Each predicate is served by a pg_trgm index (build_search_index.py)
+                SELECT word_id FROM yy_word
+                WHERE word_strongs LIKE ?
+                   OR word_hebrew LIKE ?
+                   OR word_yt LIKE ?
+                   OR word_definition_kirk ILIKE ?
+                   OR word_definition_yy ILIKE ?
+                   OR word_definition_external ILIKE ?
+                UNION
+                SELECT word_id FROM yy_word_spelling WHERE word_spelling_text ILIKE ?
+            )
             ORDER BY w.word_strongs
             LIMIT 200
         ");
@@ -277,6 +265,29 @@ function insertSpellings(PDO $db, int $wordId, array $spellings): void {
 }
 
 function countSpellingInTranslations(PDO $db, string $spelling): int {
+    // Occurrences in <i> and <span class="word"> fragments, precomputed by build_spelling_index.py.
+    // A spelling the index has not counted yet (a phrase added since the last build, or no index
+    // at all) is counted live; the next incremental build picks the phrase up.
+    $text = substr(strtolower($spelling), 0, 250);
+    $indexed = (bool)$db->query("SELECT to_regclass('yy_word_spelling_phrase') IS NOT NULL")->fetchColumn();
+    if ($indexed) {
+        $stmt = $db->prepare("SELECT SUM(occurrence_count) FROM yy_word_spelling_occurrence WHERE word_spelling_text = ?");
+        $stmt->execute([$text]);
+        $count = $stmt->fetchColumn();
+        if ($count !== null) {
+            return min((int)$count, 32767); // smallint max
+        }
+        // A phrase the index has scanned for and found nowhere
+        $stmt = $db->prepare("SELECT 1 FROM yy_word_spelling_phrase WHERE word_spelling_text = ?");
+        $stmt->execute([$text]);
+        if ($stmt->fetchColumn()) {
+            return 0;
+        }
+    }
+    return countSpellingLive($db, $spelling);
+}
+
+function countSpellingLive(PDO $db, string $spelling): int {
     // Extract italicized text from all translations and count occurrences
     $stmt = $db->query("SELECT yy_translation_copy FROM yy_translation WHERE yy_translation_copy IS NOT NULL");
     $pattern = '/(?<![a-zA-Z\'])' . preg_quote(strtolower($spelling), '/') . '(?![a-zA-Z\'])/i';
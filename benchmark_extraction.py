@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Word translation extraction pipeline on synthetic YY volumes.
+
+Generates realistic .docx volumes with python-docx (bold curly-quote
+translations, bold-cite paragraphs, multi-paragraph quotes, cite-terminated
+quotes, font switches, yy_chapter_# headings and lastRenderedPageBreaks),
+then times each phase of parse_word_translations:
+
+    parse        Document() load
+    view         DocumentView setup (runs are materialized on demand during extract)
+    extract      extract_translations_from_doc on the view (includes consolidate)
+    consolidate  time spent inside consolidate_html
+    paginate     build_page_map_from_xml
+    persist      save_translation into a session temp table (--database only)
+
+Results are compared against a stored baseline; a throughput drop beyond the
+tolerance, or a translation count that differs from what was generated,
+exits non-zero.
+
+Usage:
+    python benchmark_extraction.py
+    python benchmark_extraction.py --size large --save-baseline
+    python benchmark_extraction.py --paragraphs 20000 --database
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import platform
+from pathlib import Path
+from typing import Dict, Optional
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+
+import parse_word_translations as pwt
+from document_view import DocumentView
+
+SIZES = {'small': 2000, 'medium': 10000, 'large': 40000}
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+DEFAULT_TOLERANCE = 0.20  # fail when throughput falls more than 20% below baseline
+
+CITES = [
+    "Yirma'yah / Yah Uplifts / Jeremiah",
+    "Mizmowr / Song / Psalm",
+    "Yasha'yah / Isaiah",
+    "Dabarym / Words / Deuteronomy",
+    "Bare'shyth / In the Beginning / Genesis",
+    "Yownah / Jonah",
+]
+WORDS = ("and the of to in that is was he for it with as his on be at by this had not are but from "
+         "or have an they which one you were her all she there would their we him been has when who "
+         "will more no if out so said what up its about into than them can only other new some").split()
+TRANSLITERATIONS = ["Yahowah", "'elohym", "towrah", "shamar", "yada'", "beryth", "qodesh", "'ow'ath"]
+FONT_SWITCH = "YadaTowrah"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _cite(rng: random.Random) -> str:
+    chapter, verse = rng.randint(1, 50), rng.randint(1, 30)
+    suffix = f"-{verse + rng.randint(1, 3)}" if rng.random() < 0.2 else ""
+    note = " - in part" if rng.random() < 0.1 else ""
+    return f"{rng.choice(CITES)} {chapter}:{verse}{suffix}{note}"
+
+
+def _add_translation_runs(paragraph, rng: random.Random, bold: bool = True) -> None:
+    """Append a mix of plain, italic-transliteration, font-switch and private-use runs."""
+    for _ in range(rng.randint(2, 6)):
+        kind = rng.random()
+        if kind < 0.25:
+            run = paragraph.add_run(rng.choice(TRANSLITERATIONS))
+            run.italic = True
+        elif kind < 0.32:
+            run = paragraph.add_run(rng.choice(["hwhy", "Myhla", "hrwt"]))
+            run.font.name = FONT_SWITCH
+        elif kind < 0.35:
+            run = paragraph.add_run(" Yahow\uf065h ")
+        else:
+            run = paragraph.add_run(" " + _sentence(rng, rng.randint(4, 14)) + " ")
+        run.bold = bold
+
+
+def _page_break(paragraph) -> None:
+    run = paragraph.add_run()
+    run._r.append(OxmlElement('w:lastRenderedPageBreak'))
+
+
+def generate_volume(path: Path, paragraphs: int, seed: int = 1) -> Dict[str, int]:
+    """
+    Write a synthetic YY volume to path.
+
+    Args:
+        path: Output .docx path
+        paragraphs: Approximate number of body paragraphs
+        seed: Random seed (same seed and size -> same document)
+
+    Returns:
+        Dict with paragraphs, translations (expected extraction count), chapters, pages
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    doc.styles.add_style('yy_chapter_#', WD_STYLE_TYPE.PARAGRAPH)
+    counts = {'paragraphs': 0, 'translations': 0, 'chapters': 0, 'pages': 1}
+    chapter = 0
+
+    def para(style=None):
+        counts['paragraphs'] += 1
+        p = doc.add_paragraph(style=style)
+        if counts['paragraphs'] % 12 == 0:
+            _page_break(p)
+            counts['pages'] += 1
+        return p
+
+    while counts['paragraphs'] < paragraphs:
+        if counts['paragraphs'] % 400 == 0:
+            chapter += 1
+            para('yy_chapter_#').add_run(str(chapter))
+            counts['chapters'] += 1
+            continue
+
+        kind = rng.random()
+        if kind < 0.70:
+            # Commentary, sometimes with an inline or trailing (non-bold) reference
+            p = para()
+            _add_translation_runs(p, rng, bold=False)
+            if rng.random() < 0.15:
+                p.add_run(f" ({_cite(rng)})")
+        elif kind < 0.82:
+            # Single-paragraph quote translation with trailing cite
+            p = para()
+            p.add_run("Lead-in: ")
+            p.add_run("“").bold = True
+            _add_translation_runs(p, rng)
+            p.add_run("”").bold = True
+            p.add_run(f" ({_cite(rng)})")
+            counts['translations'] += 1
+        elif kind < 0.87:
+            # Multi-paragraph quote translation
+            p = para()
+            p.add_run("“").bold = True
+            _add_translation_runs(p, rng)
+            for _ in range(rng.randint(1, 3)):
+                _add_translation_runs(para(), rng)
+            p = para()
+            _add_translation_runs(p, rng)
+            p.add_run("”").bold = True
+            p.add_run(f" ({_cite(rng)})")
+            counts['translations'] += 1
+        elif kind < 0.91:
+            # Cite-terminated quote (no closing quote)
+            p = para()
+            p.add_run("“").bold = True
+            _add_translation_runs(p, rng)
+            p.add_run(f" ({_cite(rng)})")
+            counts['translations'] += 1
+        elif kind < 0.97:
+            # Bold-cite paragraph, sometimes preceded by bold continuation paragraphs
+            for _ in range(rng.choice([0, 0, 1])):
+                _add_translation_runs(para(), rng)
+            p = para()
+            _add_translation_runs(p, rng)
+            p.add_run(f" ({_cite(rng)})")
+            counts['translations'] += 1
+        else:
+            # Quote without a cite (skipped by the extractor)
+            p = para()
+            p.add_run("“").bold = True
+            _add_translation_runs(p, rng)
+            p.add_run("”").bold = True
+            p.add_run(" he said.")
+
+    doc.save(str(path))
+    return counts
+
+
+class _PersistTarget:
+    """Session with a temp 'translation' table shadowing the real one, so benchmarks never touch data."""
+
+    def __init__(self):
+        self.conn = pwt.init_database(pwt.get_db_connection())
+        cur = self.conn.cursor()
+        cur.execute("CREATE TEMP TABLE translation (LIKE public.translation INCLUDING DEFAULTS)")
+        self.conn.commit()
+        cur.close()
+
+    def close(self):
+        self.conn.close()
+
+
+def run_benchmark(doc_path: Path, expected: Dict[str, int], persist: Optional[_PersistTarget] = None) -> Dict:
+    """Time every phase for one generated document."""
+    phases = {}
+    consolidate_time = [0.0]
+    original_consolidate = pwt.consolidate_html
+
+    def timed_consolidate(html):
+        t0 = time.perf_counter()
+        result = original_consolidate(html)
+        consolidate_time[0] += time.perf_counter() - t0
+        return result
+
+    t0 = time.perf_counter()
+    doc = Document(str(doc_path))
+    phases['parse'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    view = DocumentView(doc)
+    phases['view'] = time.perf_counter() - t0
+
+    pwt.consolidate_html = timed_consolidate
+    try:
+        t0 = time.perf_counter()
+        translations = pwt.extract_translations_from_doc(doc_path, doc=view)
+        phases['extract'] = time.perf_counter() - t0
+    finally:
+        pwt.consolidate_html = original_consolidate
+    phases['consolidate'] = consolidate_time[0]
+
+    t0 = time.perf_counter()
+    page_map = pwt.build_page_map_from_xml(doc_path)
+    phases['paginate'] = time.perf_counter() - t0
+
+    if persist is not None:
+        for t in translations:
+            t.para_idx = None
+        t0 = time.perf_counter()
+        for t in translations:
+            pwt.save_translation(persist.conn, t)
+        phases['persist'] = time.perf_counter() - t0
+
+    extract_time = (phases['view'] + phases['extract']) or 1e-9
+    return {
+        'document': doc_path.name,
+        'paragraphs': expected['paragraphs'],
+        'expected_translations': expected['translations'],
+        'translations': len(translations),
+        'pages': max(page_map.values()) if page_map else 0,
+        'phases': {k: round(v, 4) for k, v in phases.items()},
+        'paragraphs_per_sec': round(expected['paragraphs'] / extract_time, 1),
+        'translations_per_sec': round(len(translations) / extract_time, 1),
+    }
+
+
+def compare_to_baseline(result: Dict, baseline: Dict, tolerance: float) -> list:
+    """Return regression messages (empty when within tolerance)."""
+    problems = []
+    for metric in ('paragraphs_per_sec', 'translations_per_sec'):
+        base = baseline.get(metric)
+        if base and result[metric] < base * (1 - tolerance):
+            problems.append(f"{metric} {result[metric]} is {100 * (1 - result[metric] / base):.0f}% below baseline {base}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translation extraction on synthetic YY volumes")
+    parser.add_argument("--size", choices=sorted(SIZES), default='medium', help="Preset document size (default: medium)")
+    parser.add_argument("--paragraphs", type=int, help="Exact paragraph count (overrides --size)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the generated volume")
+    parser.add_argument("--keep", type=str, help="Directory to keep the generated .docx in")
+    parser.add_argument("--database", action="store_true", help="Also time persistence (into a session temp table)")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE, help=f"Baseline JSON file (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline for its size")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed throughput drop (default: 0.20)")
+    args = parser.parse_args()
+
+    pwt.setup_logging(False)
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    paragraphs = args.paragraphs or SIZES[args.size]
+    label = f"{paragraphs}p-seed{args.seed}"
+    out_dir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    doc_path = out_dir / f"YY-bench-{label}.docx"
+
+    t0 = time.perf_counter()
+    expected = generate_volume(doc_path, paragraphs, seed=args.seed)
+    print(f"Generated {doc_path.name}: {expected['paragraphs']} paragraphs, "
+          f"{expected['translations']} translations, {expected['pages']} pages "
+          f"({time.perf_counter() - t0:.1f}s)")
+
+    persist = _PersistTarget() if args.database else None
+    try:
+        result = run_benchmark(doc_path, expected, persist)
+    finally:
+        if persist:
+            persist.close()
+        if not args.keep:
+            try:
+                os.unlink(doc_path)
+                os.rmdir(out_dir)
+            except OSError:
+                pass
+
+    result['python'] = platform.python_version()
+    print(json.dumps(result, indent=2))
+
+    failures = []
+    if result['translations'] != result['expected_translations']:
+        failures.append(f"extracted {result['translations']} translations, generated {result['expected_translations']}")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+    if args.save_baseline:
+        baselines[label] = {k: result[k] for k in ('paragraphs_per_sec', 'translations_per_sec', 'phases')}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline for {label} saved to {args.baseline}")
+    elif label in baselines:
+        failures.extend(compare_to_baseline(result, baselines[label], args.tolerance))
+    else:
+        print(f"No baseline for {label} in {args.baseline}; run with --save-baseline to record one")
+
+    if failures:
+        for msg in failures:
+            print(f"REGRESSION: {msg}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
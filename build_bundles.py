@@ -0,0 +1,375 @@
+"""
+Build the static chapter bundles the reader loads instead of display-translations.php.
+- Renders every scripture chapter's translations, with the same fields as
+  api/display-translations.php (cite labels, "Chapter n:name" label, verse
+  range, word tags and word details), plus the verse numbers each translation
+  covers, into public/bundles/<scroll_key>/<chapter>.json
+- Word tags are computed from the copy being rendered (word_tagger), not read
+  from yy_translation_word, so a bundle never carries offsets from another copy
+- Chapter labels come from one pass over yy_chapter per volume instead of a
+  correlated subquery per row
+- Each bundle is written with .gz (and .br when the brotli package is installed)
+  next to it for nginx gzip_static; its content hash (ETag) goes into
+  public/bundles/manifest.json, which the reader uses as the URL version
+- Incremental by default: only chapters whose translations were revised since
+  the last build (per rev_yy_translation), or whose volume's chapter labels were
+  (per rev_yy_chapter), are re-rendered; unchanged output is not rewritten
+- Imports refresh the bundles when they finish (refresh()); edits made through
+  the admin API are picked up by --watch, which the production compose file runs
+  as the bundles service. Builds take an advisory lock, so they never overlap
+- yy_translation_verse is created (empty) if a restored dump lacks it; --watch
+  only retries lost connections, any other database error ends it
+
+Word and spelling edits do not show up in either revision table; run with
+--full after changing yy_word or yy_word_spelling.
+
+    python build_bundles.py
+    python build_bundles.py --full
+    python build_bundles.py --watch 10
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import psycopg2
+
+import db
+import index_state
+import translation_loader
+from word_tagger import WordTagger
+
+try:
+    import brotli
+except ImportError:  # optional; gzip bundles are always written
+    brotli = None
+
+INDEX_NAME = 'chapter_bundle'
+BUNDLE_DIR = Path(__file__).resolve().parent / 'public' / 'bundles'
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+ENCODINGS = ('.gz', '.br')
+
+WORD_COLUMNS = ['word_id', 'word_yt', 'word_hebrew', 'word_strongs', 'word_gender', 'word_flag_plural',
+                'word_flag_noun', 'word_flag_verb', 'word_flag_adjective', 'word_flag_adverb',
+                'word_flag_preposition', 'word_flag_conjunction', 'word_flag_subst',
+                'word_definition_kirk', 'word_definition_yy', 'word_definition_external']
+
+
+def bundle_name(scroll_key: int, chapter_number: int) -> str:
+    """Manifest key and path (without .json) of a chapter's bundle."""
+    return f"{scroll_key}/{chapter_number}"
+
+
+def load_chapter_labels(cur) -> Dict[int, Tuple[List[int], List[str]]]:
+    """yy_volume_key -> (chapter start pages ascending, 'Chapter n:name' labels)."""
+    cur.execute("""
+        SELECT yy_volume_key, yy_chapter_page, 'Chapter ' || yy_chapter_number || ':' || yy_chapter_name
+        FROM yy_chapter WHERE yy_chapter_page IS NOT NULL
+        ORDER BY yy_volume_key, yy_chapter_page, yy_chapter_key
+    """)
+    labels: Dict[int, Tuple[List[int], List[str]]] = {}
+    for volume_key, page, label in cur.fetchall():
+        pages, names = labels.setdefault(volume_key, ([], []))
+        pages.append(page)
+        names.append(label)
+    return labels
+
+
+def chapter_label(labels, volume_key: int, page: Optional[int]) -> Optional[str]:
+    """Label of the last chapter starting on or before page, as display-translations.php picks it."""
+    if page is None or volume_key not in labels:
+        return None
+    pages, names = labels[volume_key]
+    i = bisect_right(pages, page)
+    return names[i - 1] if i else None
+
+
+def render_chapters(cur, tagger: WordTagger, chapter_keys: Optional[List[int]] = None) -> Dict[int, dict]:
+    """
+    Bundle content of every chapter with translations, or only chapter_keys.
+
+    Returns:
+        Dict mapping yah_chapter_key -> {'scroll_key', 'chapter', 'translations'}
+    """
+    sql = """
+        SELECT t.yy_translation_key, vol.yy_volume_file, t.yy_translation_page, t.yy_translation_copy,
+               s.yah_scroll_label_yy, s.yah_scroll_label_common, c.yah_chapter_number, v.yah_verse_number,
+               t.yah_scroll_key, vol.yy_volume_flip_code, t.yy_volume_key, t.yah_chapter_key
+        FROM yy_translation t
+        JOIN yah_scroll s ON s.yah_scroll_key = t.yah_scroll_key
+        JOIN yah_chapter c ON c.yah_chapter_key = t.yah_chapter_key
+        JOIN yah_verse v ON v.yah_verse_key = t.yah_verse_key
+        JOIN yy_volume vol ON vol.yy_volume_key = t.yy_volume_key
+    """
+    order = """
+        ORDER BY s.yah_scroll_sort ASC, s.yah_scroll_label_yy ASC,
+                 c.yah_chapter_number ASC, v.yah_verse_number ASC,
+                 vol.yy_volume_file, t.yy_translation_page
+    """
+    if chapter_keys is None:
+        cur.execute(sql + order)
+    else:
+        cur.execute(sql + " WHERE t.yah_chapter_key = ANY(%s)" + order, (list(chapter_keys),))
+    rows = cur.fetchall()
+    if not rows:
+        return {}
+    keys = [row[0] for row in rows]
+
+    # Verses each translation covers (yy_translation_verse), for the range end and the reader's verse filter
+    covered = defaultdict(list)
+    cur.execute("""
+        SELECT tv.yy_translation_key, rv.yah_chapter_key, rv.yah_verse_number
+        FROM yy_translation_verse tv JOIN yah_verse rv ON rv.yah_verse_key = tv.yah_verse_key
+        WHERE tv.yy_translation_key = ANY(%s)
+    """, (keys,))
+    for key, chapter_key, verse_number in cur.fetchall():
+        covered[key].append((chapter_key, verse_number))
+
+    tags = {row[0]: [list(tag) for tag in tagger.tag(row[3])] for row in rows}
+    words = {}
+    word_ids = sorted({tag[2] for key_tags in tags.values() for tag in key_tags})
+    if word_ids:
+        cur.execute(f"SELECT {', '.join('w.' + c for c in WORD_COLUMNS)} FROM yy_word w "
+                    "WHERE w.word_id = ANY(%s) AND w.word_active_flag = true", (word_ids,))
+        for values in cur.fetchall():
+            words[values[0]] = dict(zip(WORD_COLUMNS, values))
+
+    labels = load_chapter_labels(cur)
+    chapters: Dict[int, dict] = {}
+    for (key, volume_file, page, copy, label_yy, label_common, chapter_number, verse_number,
+         scroll_key, flip_code, volume_key, chapter_key) in rows:
+        verse_end = max((n for _, n in covered[key] if n > verse_number), default=None)
+        verses = sorted({verse_number} | {n for c, n in covered[key] if c == chapter_key})
+        row_tags = [tag for tag in tags[key] if tag[2] in words]
+        row = {
+            'translation_id': key,
+            'translation_book': volume_file,
+            'translation_page': page,
+            'translation_text_word': copy,
+            'translation_cite': f"{label_yy} / {label_common}",
+            'cite_book_hebrew': label_yy,
+            'cite_book_common': label_common,
+            'translation_cite_chapter': chapter_number,
+            'translation_cite_verse': verse_number,
+            'translation_cite_verse_end': verse_end,
+            'translation_cite_book_id': scroll_key,
+            'yy_volume_flip_code': flip_code,
+            'yy_chapter_name': chapter_label(labels, volume_key, page),
+            'translation_verses': verses,
+            'translation_words': row_tags,
+            'words': {str(tag[2]): words[tag[2]] for tag in row_tags},
+        }
+        chapter = chapters.setdefault(chapter_key, {'scroll_key': scroll_key, 'chapter': chapter_number,
+                                                    'translations': []})
+        chapter['translations'].append(row)
+    return chapters
+
+
+def encode(content: dict) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:20]
+
+
+def _write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_bundle(bundle_dir: Path, name: str, body: bytes) -> List[str]:
+    """Write name.json and its precompressed variants; returns the encodings written."""
+    path = bundle_dir / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write(path, body)
+    written = ['.gz']
+    _write(path.with_name(path.name + '.gz'), gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write(path.with_name(path.name + '.br'), brotli.compress(body, quality=11))
+        written.append('.br')
+    return written
+
+
+def remove_bundle(bundle_dir: Path, name: str) -> None:
+    path = bundle_dir / f"{name}.json"
+    for candidate in [path] + [path.with_name(path.name + ext) for ext in ENCODINGS]:
+        if candidate.exists():
+            candidate.unlink()
+
+
+def load_manifest(bundle_dir: Path) -> dict:
+    try:
+        manifest = json.loads((bundle_dir / MANIFEST_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def changed_volume_chapter_keys(cur, since) -> List[int]:
+    """yah_chapter keys holding translations from volumes whose yy_chapter labels changed since."""
+    cur.execute("""
+        SELECT DISTINCT t.yah_chapter_key FROM yy_translation t
+        WHERE t.yy_volume_key IN (
+            SELECT yy_volume_key FROM rev_yy_chapter WHERE _revision_dtime >= %s AND yy_volume_key IS NOT NULL
+        )
+    """, (since,))
+    return [row[0] for row in cur.fetchall()]
+
+
+def build(conn, full: bool = False, bundle_dir: Path = BUNDLE_DIR) -> dict:
+    """
+    Render and write the changed bundles, then the manifest if anything changed.
+
+    Returns:
+        Dict with mode, chapters_rendered, bundles_written, bundles_unchanged, bundles_removed, bytes
+    """
+    cur = conn.cursor()
+    # One build at a time (an import's refresh() and the --watch service share the directory)
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (INDEX_NAME,))
+    translation_loader.ensure_coverage_table(cur)
+    watermark = index_state.start_build(cur)
+    previous = load_manifest(bundle_dir).get('bundles')
+    # Without a manifest (new output directory) there is nothing to update incrementally
+    last = None if full or previous is None else index_state.get_last_build(cur, INDEX_NAME)
+    previous = previous or {}
+
+    if last is None:
+        chapters = render_chapters(cur, WordTagger.load(cur))
+        stale = set(previous)
+        stats = {'mode': 'full'}
+    else:
+        chapter_keys = sorted(set(index_state.changed_chapter_keys(cur, last))
+                              | set(changed_volume_chapter_keys(cur, last)))
+        chapters = render_chapters(cur, WordTagger.load(cur), chapter_keys) if chapter_keys else {}
+        stale = set()
+        if chapter_keys:
+            cur.execute("SELECT yah_chapter_key, yah_scroll_key, yah_chapter_number FROM yah_chapter "
+                        "WHERE yah_chapter_key = ANY(%s)", (chapter_keys,))
+            stale = {bundle_name(scroll_key, number) for chapter_key, scroll_key, number in cur.fetchall()
+                     if chapter_key not in chapters}
+        stats = {'mode': 'incremental'}
+    stats.update(chapters_rendered=len(chapters), bundles_written=0, bundles_unchanged=0, bytes=0)
+
+    bundles = dict(previous) if last is not None else {}
+    for chapter in chapters.values():
+        name = bundle_name(chapter['scroll_key'], chapter['chapter'])
+        stale.discard(name)
+        body = encode(chapter)
+        tag = etag(body)
+        old = previous.get(name)
+        if old and old['etag'] == tag and (bundle_dir / f"{name}.json").exists():
+            bundles[name] = old
+            stats['bundles_unchanged'] += 1
+            continue
+        encodings = write_bundle(bundle_dir, name, body)
+        bundles[name] = {'etag': tag, 'translations': len(chapter['translations']),
+                         'bytes': len(body), 'encodings': encodings}
+        stats['bundles_written'] += 1
+        stats['bytes'] += len(body)
+
+    for name in stale:
+        remove_bundle(bundle_dir, name)
+        bundles.pop(name, None)
+    stats['bundles_removed'] = len(stale)
+
+    if last is None or stats['bundles_written'] or stale:
+        bundle_dir.mkdir(parents=True, exist_ok=True)
+        _write(bundle_dir / MANIFEST_FILE, encode({
+            'version': MANIFEST_VERSION,
+            'built': watermark.isoformat(timespec='seconds'),
+            'bundles': dict(sorted(bundles.items())),
+        }))
+    index_state.set_last_build(cur, INDEX_NAME, watermark)
+    conn.commit()
+    cur.close()
+    return stats
+
+
+def refresh(conn, bundle_dir: Path = BUNDLE_DIR) -> Optional[dict]:
+    """Incremental build after an import; None (nothing done) where no bundles have been built."""
+    if not (bundle_dir / MANIFEST_FILE).exists():
+        return None
+    stats = build(conn, bundle_dir=bundle_dir)
+    if stats['bundles_written'] or stats['bundles_removed']:
+        logging.info(f"Bundles: {stats['bundles_written']} written, {stats['bundles_removed']} removed")
+    return stats
+
+
+def watch(interval: float, bundle_dir: Path = BUNDLE_DIR) -> None:
+    """
+    Build incrementally every interval seconds until interrupted, reconnecting after connection loss.
+
+    Any other database error is raised: a missing table or a bad query does not go away by retrying.
+    """
+    conn = None
+    try:
+        while True:
+            try:
+                if conn is None or conn.closed:
+                    conn = db.connect()
+                stats = build(conn, bundle_dir=bundle_dir)
+                if stats['mode'] == 'full' or stats['bundles_written'] or stats['bundles_removed']:
+                    logging.info(f"{stats['mode']}: {stats['chapters_rendered']} chapters rendered, "
+                                 f"{stats['bundles_written']} written, {stats['bundles_removed']} removed")
+            except psycopg2.OperationalError as e:
+                logging.error(f"Database connection lost ({e}); retrying")
+                if conn is not None:
+                    conn.close()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if conn is not None and not conn.closed:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static chapter bundles in public/bundles")
+    parser.add_argument('--full', action='store_true', help="Re-render every chapter instead of only revised ones")
+    parser.add_argument('--output', type=Path, default=BUNDLE_DIR, help=f"Bundle directory (default: {BUNDLE_DIR})")
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="Keep running and rebuild changed chapters every SECONDS (after a first build)")
+    args = parser.parse_args()
+
+    if args.watch:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+        if args.full:
+            conn = db.connect()
+            try:
+                build(conn, full=True, bundle_dir=args.output)
+            finally:
+                conn.close()
+        watch(args.watch, bundle_dir=args.output)
+        return
+
+    conn = db.connect()
+    t0 = time.perf_counter()
+    try:
+        stats = build(conn, full=args.full, bundle_dir=args.output)
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Mode:                {stats['mode']}")
+    print(f"Chapters rendered:   {stats['chapters_rendered']}")
+    print(f"Bundles written:     {stats['bundles_written']}")
+    print(f"Bundles unchanged:   {stats['bundles_unchanged']}")
+    print(f"Bundles removed:     {stats['bundles_removed']}")
+    print(f"Bytes written:       {stats['bytes']}{'' if brotli else '  (gzip only; pip install brotli for .br)'}")
+    print(f"Elapsed:             {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Build the scripture-scope word index behind the words API scope filter.
+- Materializes yy_verse_word: (yah_scroll_key, yah_chapter_key, yah_verse_key, word_id)
+  for every <span class="word"> spelling that resolves to a yy_word
+- Adds a functional LOWER(word_spelling_text) index on yy_word_spelling
+- Incremental by default: only verses whose translations were revised since
+  the last build (per rev_yy_translation) are rebuilt
+
+Spelling edits do not show up in rev_yy_translation; run with --full after
+changing yy_word_spelling.
+
+    python build_scope_index.py
+    python build_scope_index.py --full
+"""
+import argparse
+import time
+from collections import defaultdict
+
+import psycopg2
+
+import db
+import index_state
+from pg_copy import copy_rows
+from translation_text import word_span_fragments
+
+INDEX_NAME = 'verse_word'
+COLUMNS = ['yah_scroll_key', 'yah_chapter_key', 'yah_verse_key', 'word_id']
+
+
+def ensure_index_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_verse_word (
+            yah_scroll_key INT NOT NULL,
+            yah_chapter_key INT NOT NULL,
+            yah_verse_key INT NOT NULL,
+            word_id INT NOT NULL,
+            PRIMARY KEY (yah_verse_key, word_id)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_verse_word_scroll ON yy_verse_word(yah_scroll_key, word_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_verse_word_chapter ON yy_verse_word(yah_chapter_key, word_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_word_spelling_lower ON yy_word_spelling(LOWER(word_spelling_text))")
+
+
+def load_spelling_map(cur) -> dict:
+    """Lowercase spelling -> set of word_ids."""
+    cur.execute("SELECT LOWER(word_spelling_text), word_id FROM yy_word_spelling WHERE word_id IS NOT NULL")
+    spelling_map = defaultdict(set)
+    for text, word_id in cur.fetchall():
+        spelling_map[text.strip()].add(word_id)
+    return spelling_map
+
+
+def scope_rows(conn, spelling_map: dict, verse_keys=None) -> set:
+    """Distinct (scroll, chapter, verse, word_id) rows for all translations, or only those in verse_keys."""
+    cur = conn.cursor(name='scope_index_scan')
+    sql = """
+        SELECT yah_scroll_key, yah_chapter_key, yah_verse_key, yy_translation_copy
+        FROM yy_translation WHERE yy_translation_copy IS NOT NULL
+    """
+    if verse_keys is None:
+        cur.execute(sql)
+    else:
+        cur.execute(sql + " AND yah_verse_key = ANY(%s)", (list(verse_keys),))
+    rows = set()
+    for scroll_key, chapter_key, verse_key, html in cur:
+        for fragment in word_span_fragments(html):
+            for word_id in spelling_map.get(fragment.strip().lower(), ()):
+                rows.add((scroll_key, chapter_key, verse_key, word_id))
+    cur.close()
+    return rows
+
+
+def build(conn, full: bool = False) -> dict:
+    """
+    Build or refresh yy_verse_word in one transaction.
+
+    Returns:
+        Dict with mode, verses_refreshed, rows_written
+    """
+    cur = conn.cursor()
+    ensure_index_table(cur)
+    watermark = index_state.start_build(cur)
+    last = None if full else index_state.get_last_build(cur, INDEX_NAME)
+    spelling_map = load_spelling_map(cur)
+
+    if last is None:
+        cur.execute("TRUNCATE yy_verse_word")
+        rows = scope_rows(conn, spelling_map)
+        stats = {'mode': 'full', 'verses_refreshed': len({r[2] for r in rows})}
+    else:
+        verse_keys = index_state.changed_verse_keys(cur, last)
+        rows = set()
+        if verse_keys:
+            cur.execute("DELETE FROM yy_verse_word WHERE yah_verse_key = ANY(%s)", (verse_keys,))
+            rows = scope_rows(conn, spelling_map, verse_keys)
+        stats = {'mode': 'incremental', 'verses_refreshed': len(verse_keys)}
+
+    stats['rows_written'] = copy_rows(cur, 'yy_verse_word', COLUMNS, sorted(rows))
+    index_state.set_last_build(cur, INDEX_NAME, watermark)
+    conn.commit()
+    cur.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the yy_verse_word scripture-scope index")
+    parser.add_argument('--full', action='store_true', help="Rebuild every verse instead of only revised ones")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    t0 = time.perf_counter()
+    try:
+        stats = build(conn, full=args.full)
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Mode:              {stats['mode']}")
+    print(f"Verses refreshed:  {stats['verses_refreshed']}")
+    print(f"Index rows:        {stats['rows_written']}")
+    print(f"Elapsed:           {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Build the search indexes for translations and word definitions.
+- yy_translation_search: tag-stripped yy_translation_copy with a tsvector (GIN)
+  and a pg_trgm trigram index, so translation search is an index lookup
+- pg_trgm GIN indexes on the yy_word / yy_word_spelling columns the words API
+  searches with LIKE/ILIKE '%term%'; PostgreSQL keeps those current by itself
+- Incremental by default: only translations revised since the last build
+  (per rev_yy_translation) are re-stripped; the yy_translation imports run
+  update() after saving, which does that once the index has been built
+
+    python build_search_index.py
+    python build_search_index.py --full
+"""
+import argparse
+import html
+import re
+import time
+from typing import Optional
+
+import psycopg2
+
+import db
+import index_state
+from pg_copy import copy_rows
+from translation_text import strip_tags
+
+INDEX_NAME = 'translation_search'
+TS_CONFIG = 'simple'  # transliterations do not survive English stemming
+
+# Columns the words API matches with LIKE/ILIKE '%term%'
+WORD_TRIGRAM_COLUMNS = [
+    ('yy_word', 'word_strongs'),
+    ('yy_word', 'word_hebrew'),
+    ('yy_word', 'word_yt'),
+    ('yy_word', 'word_definition_kirk'),
+    ('yy_word', 'word_definition_yy'),
+    ('yy_word', 'word_definition_external'),
+    ('yy_word_spelling', 'word_spelling_text'),
+]
+
+WHITESPACE_RE = re.compile(r'\s+')
+BREAK_RE = re.compile(r'<br\s*/?>', re.I)
+
+
+def ensure_indexes(cur) -> None:
+    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_translation_search (
+            yy_translation_key INT PRIMARY KEY,
+            yy_translation_text TEXT NOT NULL,
+            yy_translation_tsv TSVECTOR NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_translation_search_tsv ON yy_translation_search USING gin (yy_translation_tsv)")
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_yy_translation_search_trgm
+        ON yy_translation_search USING gin (yy_translation_text gin_trgm_ops)
+    """)
+    for table, column in WORD_TRIGRAM_COLUMNS:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def plain_text(copy: str) -> str:
+    """yy_translation_copy with tags removed, entities decoded and whitespace collapsed."""
+    text = html.unescape(strip_tags(BREAK_RE.sub(' ', copy)))
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def refresh(conn, keys=None) -> int:
+    """
+    Re-strip and re-index translations (all when keys is None) within the caller's transaction.
+
+    Returns:
+        Number of translations indexed
+    """
+    cur = conn.cursor()
+    if keys is None:
+        cur.execute("TRUNCATE yy_translation_search")
+    else:
+        keys = list(keys)
+        if not keys:
+            return 0
+        cur.execute("DELETE FROM yy_translation_search WHERE yy_translation_key = ANY(%s)", (keys,))
+
+    scan = conn.cursor(name='search_index_scan')
+    sql = "SELECT yy_translation_key, yy_translation_copy FROM yy_translation WHERE yy_translation_copy IS NOT NULL"
+    if keys is None:
+        scan.execute(sql)
+    else:
+        scan.execute(sql + " AND yy_translation_key = ANY(%s)", (keys,))
+    rows = [(key, plain_text(copy)) for key, copy in scan]
+    scan.close()
+
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS tmp_translation_search (
+            yy_translation_key INT, yy_translation_text TEXT
+        ) ON COMMIT DROP
+    """)
+    cur.execute("TRUNCATE tmp_translation_search")
+    copy_rows(cur, 'tmp_translation_search', ['yy_translation_key', 'yy_translation_text'], rows)
+    cur.execute(f"""
+        INSERT INTO yy_translation_search (yy_translation_key, yy_translation_text, yy_translation_tsv)
+        SELECT yy_translation_key, yy_translation_text, to_tsvector('{TS_CONFIG}', yy_translation_text)
+        FROM tmp_translation_search
+    """)
+    cur.close()
+    return len(rows)
+
+
+def build(conn, full: bool = False) -> dict:
+    """
+    Create missing indexes and bring yy_translation_search up to date in one transaction.
+
+    Returns:
+        Dict with mode, translations_indexed
+    """
+    cur = conn.cursor()
+    ensure_indexes(cur)
+    watermark = index_state.start_build(cur)
+    keys = index_state.translations_since(cur, INDEX_NAME, full)
+    stats = {'mode': 'full' if keys is None else 'incremental'}
+    stats['translations_indexed'] = refresh(conn, keys)
+    index_state.set_last_build(cur, INDEX_NAME, watermark)
+    conn.commit()
+    cur.close()
+    return stats
+
+
+def update(conn) -> Optional[dict]:
+    """Incremental build after an import; None (nothing done) until the index has been built once."""
+    cur = conn.cursor()
+    last = index_state.get_last_build(cur, INDEX_NAME)
+    cur.close()
+    if last is None:
+        conn.commit()
+        return None
+    return build(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build full-text and trigram search indexes")
+    parser.add_argument('--full', action='store_true', help="Rebuild every translation instead of only revised ones")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    t0 = time.perf_counter()
+    try:
+        stats = build(conn, full=args.full)
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Mode:                  {stats['mode']}")
+    print(f"Translations indexed:  {stats['translations_indexed']}")
+    print(f"Elapsed:               {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Build the spelling occurrence index behind yy_word_spelling.word_spelling_count_yy.
+- Tokenizes every translation's <i> and <span class="word"> fragments once
+- Writes yy_word_spelling_occurrence: spelling -> (yy_translation_key, count)
+- Refreshes word_spelling_count_yy from the index, so the API reads counts
+  instead of regex-scanning the whole corpus for every saved spelling
+- Incremental by default: only translations revised since the last build
+  (per rev_yy_translation) are re-tokenized; the corpus is rescanned only for
+  multi-token spellings not yet in yy_word_spelling_phrase, so a phrase that
+  occurs nowhere is scanned for once
+
+Run after parse_word_translations.py, or on demand:
+    python build_spelling_index.py
+    python build_spelling_index.py --full
+"""
+import argparse
+import time
+
+import psycopg2
+
+import db
+import index_state
+from pg_copy import copy_rows
+from translation_text import count_tokens, is_simple_spelling, phrase_pattern, spelling_fragments
+
+INDEX_NAME = 'spelling_occurrence'
+COUNT_MAX = 32767  # word_spelling_count_yy is SMALLINT
+
+
+def ensure_index_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_word_spelling_occurrence (
+            word_spelling_text VARCHAR(250) NOT NULL,
+            yy_translation_key INT NOT NULL,
+            occurrence_count INT NOT NULL,
+            PRIMARY KEY (word_spelling_text, yy_translation_key)
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_yy_word_spelling_occurrence_translation
+        ON yy_word_spelling_occurrence(yy_translation_key)
+    """)
+    # Multi-token spellings the index has counted, including those with no occurrences
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_word_spelling_phrase (
+            word_spelling_text VARCHAR(250) PRIMARY KEY
+        )
+    """)
+
+
+def load_phrases(cur) -> dict:
+    """Known spellings that span more than one token (e.g. 'ha 'elohym'), lowercase -> compiled pattern."""
+    cur.execute("SELECT DISTINCT LOWER(word_spelling_text) FROM yy_word_spelling WHERE word_spelling_text IS NOT NULL")
+    return {s: phrase_pattern(s) for (s,) in cur.fetchall() if s.strip() and not is_simple_spelling(s)}
+
+
+def phrase_texts(phrases) -> list:
+    """Distinct phrase keys as stored (truncated like the occurrence rows)."""
+    return sorted({p[:250] for p in phrases})
+
+
+def index_rows(key: int, html: str, phrases: dict) -> list:
+    """(spelling, translation_key, count) rows for one translation."""
+    fragments = spelling_fragments(html)
+    if not fragments:
+        return []
+    counts = count_tokens(fragments)
+    for phrase, pattern in phrases.items():
+        n = sum(len(pattern.findall(f)) for f in fragments)
+        if n:
+            counts[phrase] += n
+    return [(text[:250], key, n) for text, n in counts.items()]
+
+
+def iter_translations(conn, keys=None):
+    """Stream (key, copy) pairs with a server-side cursor, optionally limited to keys."""
+    cur = conn.cursor(name='spelling_index_scan')
+    if keys is None:
+        cur.execute("SELECT yy_translation_key, yy_translation_copy FROM yy_translation WHERE yy_translation_copy IS NOT NULL")
+    else:
+        cur.execute("""
+            SELECT yy_translation_key, yy_translation_copy FROM yy_translation
+            WHERE yy_translation_copy IS NOT NULL AND yy_translation_key = ANY(%s)
+        """, (list(keys),))
+    for row in cur:
+        yield row
+    cur.close()
+
+
+def refresh_counts(cur, spellings=None) -> int:
+    """
+    Set word_spelling_count_yy from the index, for all spellings or only the given lowercase texts.
+
+    Returns:
+        Number of yy_word_spelling rows whose count changed
+    """
+    scope = "WHERE LOWER(sp.word_spelling_text) = ANY(%s)" if spellings is not None else ""
+    cur.execute(f"""
+        UPDATE yy_word_spelling s
+        SET word_spelling_count_yy = c.total
+        FROM (
+            SELECT sp.word_spelling_id, LEAST(COALESCE(SUM(o.occurrence_count), 0), {COUNT_MAX}) AS total
+            FROM yy_word_spelling sp
+            LEFT JOIN yy_word_spelling_occurrence o ON o.word_spelling_text = LOWER(sp.word_spelling_text)
+            {scope}
+            GROUP BY sp.word_spelling_id
+        ) c
+        WHERE s.word_spelling_id = c.word_spelling_id
+          AND s.word_spelling_count_yy IS DISTINCT FROM c.total
+    """, (list(spellings),) if spellings is not None else None)
+    return cur.rowcount
+
+
+def build(conn, full: bool = False) -> dict:
+    """
+    Build or refresh the index and the spelling counts in one transaction.
+
+    Returns:
+        Dict with translations_indexed, rows_written, counts_updated, mode
+    """
+    cur = conn.cursor()
+    ensure_index_table(cur)
+    watermark = index_state.start_build(cur)
+    keys = index_state.translations_since(cur, INDEX_NAME, full)
+    phrases = load_phrases(cur)
+    stats = {'mode': 'full' if keys is None else 'incremental',
+             'translations_indexed': 0, 'rows_written': 0, 'counts_updated': 0}
+
+    if keys is None:
+        cur.execute("TRUNCATE yy_word_spelling_occurrence, yy_word_spelling_phrase")
+        rows = []
+        for key, html in iter_translations(conn):
+            rows.extend(index_rows(key, html, phrases))
+            stats['translations_indexed'] += 1
+        stats['rows_written'] = copy_rows(cur, 'yy_word_spelling_occurrence',
+                                          ['word_spelling_text', 'yy_translation_key', 'occurrence_count'], rows)
+        stats['counts_updated'] = refresh_counts(cur)
+        copy_rows(cur, 'yy_word_spelling_phrase', ['word_spelling_text'], [(p,) for p in phrase_texts(phrases)])
+    else:
+        affected = set()
+        rows = []
+        if keys:
+            cur.execute("DELETE FROM yy_word_spelling_occurrence WHERE yy_translation_key = ANY(%s) RETURNING word_spelling_text",
+                        (keys,))
+            affected.update(r[0] for r in cur.fetchall())
+            for key, html in iter_translations(conn, keys):
+                rows.extend(index_rows(key, html, phrases))
+                stats['translations_indexed'] += 1
+
+        # Multi-token spellings added since the last build have never been counted anywhere
+        cur.execute("SELECT word_spelling_text FROM yy_word_spelling_phrase")
+        indexed = {r[0] for r in cur.fetchall()}
+        new_phrases = {p: pattern for p, pattern in phrases.items() if p[:250] not in indexed}
+        if new_phrases:
+            # Counted by an index built before phrases were recorded: recount them with the rest
+            cur.execute("DELETE FROM yy_word_spelling_occurrence WHERE word_spelling_text = ANY(%s)",
+                        (phrase_texts(new_phrases),))
+            changed = set(keys)
+            for key, html in iter_translations(conn):
+                if key in changed:
+                    continue
+                fragments = spelling_fragments(html)
+                for phrase, pattern in new_phrases.items():
+                    n = sum(len(pattern.findall(f)) for f in fragments)
+                    if n:
+                        rows.append((phrase[:250], key, n))
+
+        affected.update(r[0] for r in rows)
+        affected.update(new_phrases)
+        copy_rows(cur, 'yy_word_spelling_phrase', ['word_spelling_text'], [(p,) for p in phrase_texts(new_phrases)])
+        stats['rows_written'] = copy_rows(cur, 'yy_word_spelling_occurrence',
+                                          ['word_spelling_text', 'yy_translation_key', 'occurrence_count'], rows)
+        if affected:
+            stats['counts_updated'] = refresh_counts(cur, affected)
+
+    index_state.set_last_build(cur, INDEX_NAME, watermark)
+    conn.commit()
+    cur.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the yy_word_spelling occurrence index and counts")
+    parser.add_argument('--full', action='store_true', help="Rebuild from scratch instead of only revised translations")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    t0 = time.perf_counter()
+    try:
+        stats = build(conn, full=args.full)
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Mode:                  {stats['mode']}")
+    print(f"Translations indexed:  {stats['translations_indexed']}")
+    print(f"Index rows written:    {stats['rows_written']}")
+    print(f"Spelling counts set:   {stats['counts_updated']}")
+    print(f"Elapsed:               {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
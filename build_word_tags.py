@@ -0,0 +1,121 @@
+"""
+Build the transliteration tags behind display-translations' word links.
+- Materializes yy_translation_word: (yy_translation_key, match_start,
+  match_end, word_id) for every yy_word spelling found in a translation's
+  <i> / <span class="word"> fragments (word_tagger), so reading a verse needs
+  no word-lookup round trip
+- Offsets are UTF-16 positions in yy_translation_copy; every row carries the
+  md5 of the copy it was computed from, and readers ignore rows whose hash no
+  longer matches (copies edited or re-imported since the last build), so stale
+  offsets are never spliced into changed HTML
+- Incremental by default: only translations revised since the last build
+  (per rev_yy_translation) are re-tagged
+
+Spelling edits do not show up in rev_yy_translation; run with --full after
+changing yy_word_spelling.
+
+    python build_word_tags.py
+    python build_word_tags.py --full
+"""
+import argparse
+import hashlib
+import time
+
+import psycopg2
+
+import db
+import index_state
+from pg_copy import copy_rows
+from word_tagger import WordTagger
+
+INDEX_NAME = 'translation_word'
+COLUMNS = ['yy_translation_key', 'match_start', 'match_end', 'word_id', 'copy_md5']
+
+
+def ensure_index_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_translation_word (
+            yy_translation_key INT NOT NULL REFERENCES yy_translation(yy_translation_key) ON DELETE CASCADE,
+            match_start INT NOT NULL,
+            match_end INT NOT NULL,
+            word_id INT NOT NULL,
+            copy_md5 CHAR(32),
+            PRIMARY KEY (yy_translation_key, match_start)
+        )
+    """)
+    # Tables built before copy_md5 existed: their rows match nothing until the next --full build
+    cur.execute("ALTER TABLE yy_translation_word ADD COLUMN IF NOT EXISTS copy_md5 CHAR(32)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_translation_word_word ON yy_translation_word(word_id)")
+
+
+def tag_rows(conn, tagger: WordTagger, keys=None) -> list:
+    """(translation_key, start, end, word_id, copy md5) rows for all translations, or only keys."""
+    cur = conn.cursor(name='word_tag_scan')
+    sql = "SELECT yy_translation_key, yy_translation_copy FROM yy_translation WHERE yy_translation_copy IS NOT NULL"
+    if keys is None:
+        cur.execute(sql)
+    else:
+        cur.execute(sql + " AND yy_translation_key = ANY(%s)", (list(keys),))
+    rows = []
+    for key, html in cur:
+        # Same digest as PostgreSQL's md5(yy_translation_copy) in a UTF8 database
+        digest = hashlib.md5(html.encode('utf-8')).hexdigest()
+        rows.extend((key, start, end, word_id, digest) for start, end, word_id in tagger.tag(html))
+    cur.close()
+    return rows
+
+
+def build(conn, full: bool = False) -> dict:
+    """
+    Build or refresh yy_translation_word in one transaction.
+
+    Returns:
+        Dict with mode, spellings, translations_tagged, rows_written
+    """
+    cur = conn.cursor()
+    ensure_index_table(cur)
+    watermark = index_state.start_build(cur)
+    keys = index_state.translations_since(cur, INDEX_NAME, full)
+    tagger = WordTagger.load(cur)
+    stats = {'mode': 'full' if keys is None else 'incremental', 'spellings': len(tagger)}
+
+    if keys is None:
+        cur.execute("TRUNCATE yy_translation_word")
+        rows = tag_rows(conn, tagger)
+    else:
+        rows = []
+        if keys:
+            cur.execute("DELETE FROM yy_translation_word WHERE yy_translation_key = ANY(%s)", (keys,))
+            rows = tag_rows(conn, tagger, keys)
+    stats['translations_tagged'] = len({r[0] for r in rows})
+    stats['rows_written'] = copy_rows(cur, 'yy_translation_word', COLUMNS, rows)
+    index_state.set_last_build(cur, INDEX_NAME, watermark)
+    conn.commit()
+    cur.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the yy_translation_word transliteration tags")
+    parser.add_argument('--full', action='store_true', help="Re-tag every translation instead of only revised ones")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    t0 = time.perf_counter()
+    try:
+        stats = build(conn, full=args.full)
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Mode:                  {stats['mode']}")
+    print(f"Spellings compiled:    {stats['spellings']}")
+    print(f"Translations tagged:   {stats['translations_tagged']}")
+    print(f"Tag rows:              {stats['rows_written']}")
+    print(f"Elapsed:               {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+Shared PostgreSQL access for the import, index and migration scripts.
+- Settings come from the environment or a .env file (see .env.example)
+- connect() opens one connection straight to the yada database
+- get_pool() / pooled() share a ThreadedConnectionPool between worker threads
+- Every connection carries app.current_user_key, which the revision triggers
+  record as the author of each change
+- prepare() / execute_prepared() use server-side prepared statements for
+  statements run once per row
+
+    conn = db.connect()
+    with db.pooled() as conn:
+        ...
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # .env support is optional; plain environment variables still work
+    load_dotenv = None
+
+# Defaults match docker-compose.yml (postgres published on 5433)
+DEFAULTS = {
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5433',
+    'POSTGRES_USER': 'postgres',
+    'POSTGRES_PASSWORD': 'yada_password',
+    'POSTGRES_DB': 'yada',
+    'YY_USER_KEY': '0',
+    'YY_POOL_SIZE': '8',
+}
+
+_env_loaded = False
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def setting(name: str) -> str:
+    """Value of a setting from the environment / .env, falling back to DEFAULTS."""
+    global _env_loaded
+    if not _env_loaded:
+        if load_dotenv:
+            load_dotenv()
+        _env_loaded = True
+    return os.getenv(name, DEFAULTS.get(name))
+
+
+def config(dbname: Optional[str] = None) -> dict:
+    """psycopg2.connect() keyword arguments."""
+    return {
+        'host': setting('POSTGRES_HOST'),
+        'port': int(setting('POSTGRES_PORT')),
+        'user': setting('POSTGRES_USER'),
+        'password': setting('POSTGRES_PASSWORD'),
+        'dbname': dbname or setting('POSTGRES_DB'),
+    }
+
+
+def describe() -> str:
+    cfg = config()
+    return f"{cfg['user']}@{cfg['host']}:{cfg['port']}/{cfg['dbname']}"
+
+
+class Connection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+def set_user_key(conn, user_key=None) -> None:
+    """Set app.current_user_key for the session (YY_USER_KEY when user_key is None)."""
+    key = int(setting('YY_USER_KEY') if user_key is None else user_key)
+    cur = conn.cursor()
+    cur.execute("SELECT set_config('app.current_user_key', %s, false)", (str(key),))
+    cur.close()
+
+
+def connect(dbname: Optional[str] = None, user_key=None, autocommit: bool = False):
+    """
+    Open a connection to the yada database (or dbname) with app.current_user_key set.
+
+    Raises:
+        psycopg2.Error if the server is unreachable or the database is missing
+    """
+    conn = psycopg2.connect(connection_factory=Connection, **config(dbname))
+    conn.autocommit = autocommit
+    set_user_key(conn, user_key)
+    if not autocommit:
+        conn.commit()
+    return conn
+
+
+def ensure_database(user_key=None):
+    """
+    Connect to the configured database, creating it first if it does not exist.
+
+    Only a missing database costs the extra round trip through the 'postgres' maintenance database.
+    """
+    try:
+        return connect(user_key=user_key)
+    except psycopg2.OperationalError as e:
+        if 'does not exist' not in str(e):
+            raise
+    admin = connect(dbname='postgres', autocommit=True)
+    cur = admin.cursor()
+    cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(setting('POSTGRES_DB'))))
+    cur.close()
+    admin.close()
+    return connect(user_key=user_key)
+
+
+def get_pool(maxconn: Optional[int] = None) -> ThreadedConnectionPool:
+    """Process-wide pool of connections to the configured database (created on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            size = maxconn or int(setting('YY_POOL_SIZE'))
+            _pool = ThreadedConnectionPool(1, size, connection_factory=Connection, **config())
+        return _pool
+
+
+@contextmanager
+def pooled(user_key=None):
+    """
+    Borrow a pooled connection for one unit of work.
+
+    The caller commits; an exception rolls back. The session's app.current_user_key
+    is reset on every checkout so one worker's user never leaks into another's.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        set_user_key(conn, user_key)
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if conn.closed:
+            pool.putconn(conn, close=True)
+        else:
+            if conn.status != psycopg2.extensions.STATUS_READY:
+                conn.rollback()
+            pool.putconn(conn)
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def prepare(conn, name: str, statement: str) -> None:
+    """
+    PREPARE statement (using $1, $2, ... placeholders) once per connection.
+
+    Names are cached on Connection objects; after a failure, discard the name from
+    conn.prepared and the next call re-checks pg_prepared_statements.
+    """
+    prepared = getattr(conn, 'prepared', None)
+    if prepared is not None and name in prepared:
+        return
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+    if not cur.fetchone():
+        cur.execute(f"PREPARE {name} AS {statement}")
+    cur.close()
+    if prepared is not None:
+        prepared.add(name)
+
+
+def execute_prepared(cur, name: str, params=()) -> None:
+    """EXECUTE a statement made with prepare()."""
+    if params:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", tuple(params))
+    else:
+        cur.execute(f"EXECUTE {name}")
@@ -18,6 +18,9 @@ cp docker-compose.prod.yml docker-compose.yml
 # Create certbot directories
 mkdir -p certbot/conf certbot/www
 
+# Chapter bundles (python build_bundles.py) are served by nginx from here
+mkdir -p public/bundles
+
 # --- Phase 1: Start with HTTP-only nginx to get SSL cert ---
 # Temporary nginx config (HTTP only, for certbot challenge)
 cat > nginx/default.conf <<'NGINX'
@@ -57,6 +60,14 @@ done
 echo "=== Importing database ==="
 docker compose exec -T postgres psql -U postgres -d yada < sql/yada_full_dump.sql
 
+# Render the chapter bundles once (a failure stops the deploy), then keep them current
+echo "=== Building chapter bundles ==="
+docker compose run --rm bundles sh -c \
+    "pip install --quiet --no-cache-dir psycopg2-binary==2.9.9 && python build_bundles.py --full"
+test -f public/bundles/manifest.json
+echo "=== Starting bundle builder ==="
+docker compose up -d bundles
+
 echo "=== Phase 1 complete: site available on HTTP ==="
 echo "=== Now requesting SSL certificate ==="
 
@@ -70,6 +81,11 @@ docker compose run --rm certbot certonly \
 
 # --- Phase 2: Switch to SSL nginx config ---
 cat > nginx/default.conf <<'NGINX'
+map $arg_v $bundle_cache_control {
+    ""      "no-cache";
+    default "public, max-age=31536000, immutable";
+}
+
 server {
     listen 80;
     server_name t.yadayah.com;
@@ -90,6 +106,15 @@ server {
     ssl_certificate /etc/letsencrypt/live/t.yadayah.com/fullchain.pem;
     ssl_certificate_key /etc/letsencrypt/live/t.yadayah.com/privkey.pem;
 
+    # Chapter bundles from build_bundles.py, served from disk with their precompressed .gz;
+    # versioned URLs (?v=<etag> from manifest.json) never change, anything else is revalidated
+    location /bundles/ {
+        root /var/www;
+        gzip_static on;
+        add_header Cache-Control $bundle_cache_control;
+        try_files $uri =404;
+    }
+
     location / {
         proxy_pass http://web:80;
         proxy_set_header Host $host;
@@ -0,0 +1,86 @@
+"""
+Paragraph-indexed structure of one Word volume: chapters, sections and pages.
+- Boundaries are sorted parallel arrays of 0-based python-docx paragraph indices
+- Lookups are bisect-based, O(log n) per paragraph
+- chapter_key_at() maps a paragraph straight to a yy_chapter key
+
+    structure = DocumentStructure()
+    structure.add_chapter(120, 1)
+    structure.add_chapter(910, 2)
+    structure.finalize()
+    structure.chapter_at(500)          # -> 1
+    structure.chapter_key_at(500, {1: 4711, 2: 4712})   # -> 4711
+"""
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+
+class DocumentStructure:
+    """Chapter, section and page boundaries of a document, keyed by paragraph index."""
+
+    __slots__ = ('chapter_paras', 'chapter_numbers', 'section_paras', 'page_paras', 'page_numbers')
+
+    def __init__(self):
+        self.chapter_paras: List[int] = []
+        self.chapter_numbers: List[int] = []
+        self.section_paras: List[int] = [0]  # a document always opens a section
+        self.page_paras: List[int] = []
+        self.page_numbers: List[int] = []
+
+    def add_chapter(self, para_idx: int, number: int) -> None:
+        self.chapter_paras.append(para_idx)
+        self.chapter_numbers.append(number)
+
+    def add_section(self, para_idx: int) -> None:
+        """Record the first paragraph of a new section."""
+        if para_idx != self.section_paras[-1]:
+            self.section_paras.append(para_idx)
+
+    def set_page_map(self, page_map: Dict[int, int]) -> None:
+        """Compress a {para_idx: page} map into boundaries where the page number changes."""
+        self.page_paras, self.page_numbers = [], []
+        for para_idx in sorted(page_map):
+            page = page_map[para_idx]
+            if not self.page_numbers or self.page_numbers[-1] != page:
+                self.page_paras.append(para_idx)
+                self.page_numbers.append(page)
+
+    def finalize(self) -> 'DocumentStructure':
+        """Sort boundaries added out of order; returns self."""
+        if any(a > b for a, b in zip(self.chapter_paras, self.chapter_paras[1:])):
+            pairs = sorted(zip(self.chapter_paras, self.chapter_numbers), key=lambda x: x[0])
+            self.chapter_paras = [p for p, _ in pairs]
+            self.chapter_numbers = [n for _, n in pairs]
+        self.section_paras = sorted(set(self.section_paras))
+        return self
+
+    @staticmethod
+    def _at(paras: List[int], values: List, para_idx: int):
+        i = bisect_right(paras, para_idx) - 1
+        return values[i] if i >= 0 else None
+
+    def chapter_at(self, para_idx: int) -> Optional[int]:
+        """Chapter number containing para_idx (None before the first chapter heading)."""
+        return self._at(self.chapter_paras, self.chapter_numbers, para_idx)
+
+    def chapter_key_at(self, para_idx: int, chapter_keys: Dict[int, int]) -> Optional[int]:
+        """yy_chapter key for para_idx, given {chapter_number: yy_chapter_key} for this volume."""
+        number = self.chapter_at(para_idx)
+        return chapter_keys.get(number) if number is not None else None
+
+    def section_at(self, para_idx: int) -> int:
+        """0-based section ordinal containing para_idx."""
+        return bisect_right(self.section_paras, para_idx) - 1
+
+    def page_at(self, para_idx: int) -> Optional[int]:
+        """Page number of para_idx (None when no page map was set)."""
+        return self._at(self.page_paras, self.page_numbers, para_idx)
+
+    @property
+    def chapters(self) -> List[Tuple[int, int]]:
+        """(para_idx, chapter_number) pairs in document order."""
+        return list(zip(self.chapter_paras, self.chapter_numbers))
+
+    def __repr__(self):
+        return (f"DocumentStructure({len(self.chapter_paras)} chapters, "
+                f"{len(self.section_paras)} sections, {len(self.page_paras)} page runs)")
@@ -0,0 +1,106 @@
+"""
+Materialized paragraph / run view of one python-docx Document.
+- python-docx builds a fresh list of proxy objects on every doc.paragraphs and
+  paragraph.runs access and re-reads the XML on every .text access, so indexing
+  them inside a loop is quadratic
+- DocumentView lists the paragraphs once and materializes each paragraph's runs
+  at most once, on first use, into one flat array of runs with each run's text
+  and its character offset within its paragraph
+- has_bold() answers from the raw lxml element without building runs, so the
+  extractor can skip paragraphs that cannot hold a translation
+- Extraction, chapter detection and page lookup all index into the view
+
+    view = DocumentView(Document(path))
+    for para_idx, paragraph in enumerate(view.paragraphs):
+        for j in view.run_range(para_idx):
+            run, text, offset = view.runs[j], view.run_texts[j], view.run_offsets[j]
+"""
+from typing import Dict, List, Optional
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+HYPERLINK_TAG = qn('w:hyperlink')
+BOLD_TAG = qn('w:b')
+VAL_ATTR = qn('w:val')
+OFF_VALUES = ('0', 'false', 'off')
+
+
+class DocumentView:
+    """Paragraphs of a Document with their runs, run texts and offsets materialized once, on demand."""
+
+    __slots__ = ('document', 'paragraphs', 'runs', 'run_texts', 'run_offsets', '_spans', '_texts', '_style_names')
+
+    def __init__(self, doc):
+        self.document = doc
+        self.paragraphs: List[Paragraph] = doc.paragraphs
+        self.runs: List[Run] = []
+        self.run_texts: List[str] = []
+        self.run_offsets: List[int] = []     # character offset of each run within its paragraph
+        self._spans: List[Optional[range]] = [None] * len(self.paragraphs)  # flat run indices per paragraph
+        self._texts: List[Optional[str]] = [None] * len(self.paragraphs)
+        self._style_names: Dict[Optional[str], str] = {}  # pStyle id -> style name
+
+    @classmethod
+    def of(cls, doc) -> 'DocumentView':
+        """doc itself if it is already a view, else a new view of it."""
+        return doc if isinstance(doc, cls) else cls(doc)
+
+    def __len__(self) -> int:
+        return len(self.paragraphs)
+
+    def _load(self, para_idx: int) -> range:
+        start = len(self.runs)
+        offset = 0
+        for run in self.paragraphs[para_idx].runs:
+            text = run.text
+            self.runs.append(run)
+            self.run_texts.append(text)
+            self.run_offsets.append(offset)
+            offset += len(text)
+        span = self._spans[para_idx] = range(start, len(self.runs))
+        return span
+
+    def run_range(self, para_idx: int) -> range:
+        """Flat run indices of paragraph para_idx."""
+        span = self._spans[para_idx]
+        return span if span is not None else self._load(para_idx)
+
+    def run_count(self, para_idx: int) -> int:
+        span = self._spans[para_idx]
+        return len(span) if span is not None else len(self.paragraphs[para_idx]._p.r_lst)
+
+    def paragraph_runs(self, para_idx: int) -> List[Run]:
+        span = self.run_range(para_idx)
+        return self.runs[span.start:span.stop]
+
+    def text(self, para_idx: int) -> str:
+        """Paragraph.text, read once."""
+        text = self._texts[para_idx]
+        if text is None:
+            span = self.run_range(para_idx)
+            # Paragraph.text is its runs' text plus any hyperlink text; reuse the runs' unless a hyperlink is present
+            if self.paragraphs[para_idx]._p.find(HYPERLINK_TAG) is None:
+                text = "".join(self.run_texts[span.start:span.stop])
+            else:
+                text = self.paragraphs[para_idx].text
+            self._texts[para_idx] = text
+        return text
+
+    def style_name(self, para_idx: int) -> str:
+        """Paragraph.style.name, resolved once per style id rather than once per paragraph."""
+        paragraph = self.paragraphs[para_idx]
+        style_id = paragraph._p.style
+        name = self._style_names.get(style_id)
+        if name is None:
+            style = paragraph.style
+            name = self._style_names[style_id] = style.name if style else ''
+        return name
+
+    def has_bold(self, para_idx: int) -> bool:
+        """False only if no run of the paragraph can have run.bold set (checks the raw XML)."""
+        for b in self.paragraphs[para_idx]._p.iter(BOLD_TAG):
+            if b.get(VAL_ATTR) not in OFF_VALUES:
+                return True
+        return False
@@ -0,0 +1,160 @@
+"""
+Paragraph-level incremental re-extraction for edited documents.
+- Each extraction stores, per document, a hash of every paragraph's XML, the
+  paragraph boundaries where no detector held pending state (checkpoints), the
+  translations with the paragraph that completed them, and the chapter /
+  section boundaries
+- At a checkpoint the detectors' state is the empty state, so the index is the
+  whole snapshot: extraction can restart there with fresh detectors
+- On re-import the hash sequences are diffed (common prefix and suffix). The
+  detectors resume at the last checkpoint at or before the first changed
+  paragraph and stop at the first checkpoint after the last changed paragraph
+  that was also a checkpoint in the previous run; everything before the resume
+  point and after the stop point is taken from the cache, shifted by the change
+  in paragraph count
+- Any change outside the paragraphs (styles) or to the cache format discards
+  the cache
+
+    cache = ExtractionCache('.extract_cache')
+    previous = cache.load(doc_path, styles_hash(doc), detect_chapters)
+"""
+import hashlib
+import logging
+import pickle
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from lxml import etree
+
+from translation_detectors import Detector
+
+CACHE_VERSION = 1
+
+
+def paragraph_hashes(view) -> List[bytes]:
+    """8-byte digest of each paragraph's XML (text, runs, formatting, paragraph properties)."""
+    return [hashlib.blake2b(etree.tostring(p._p), digest_size=8).digest() for p in view.paragraphs]
+
+
+def styles_hash(doc) -> bytes:
+    """Digest of the styles part; style names and definitions feed chapter detection."""
+    try:
+        return hashlib.blake2b(etree.tostring(doc.styles.element), digest_size=8).digest()
+    except Exception:
+        return b''
+
+
+class CachedExtraction:
+    """One document's extraction state as of its last import."""
+
+    __slots__ = ('version', 'styles', 'detect_chapters', 'hashes', 'checkpoints', 'translations',
+                 'chapters', 'sections', 'unclosed')
+
+    def __init__(self, styles: bytes, detect_chapters: bool):
+        self.version = CACHE_VERSION
+        self.styles = styles
+        self.detect_chapters = detect_chapters
+        self.hashes: List[bytes] = []
+        self.checkpoints: List[int] = [0]    # sorted boundaries where every detector was idle
+        self.translations = []               # (completed at paragraph, Translation) in document order
+        self.chapters: List[Tuple[int, int]] = []  # (para_idx, chapter number)
+        self.sections: List[int] = []        # DocumentStructure.add_section() arguments
+        self.unclosed = False                # document ended inside a quote
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
+
+class ResumePlan:
+    """Where to restart the detectors and when they may stop."""
+
+    __slots__ = ('start', 'changed_end', 'shift', 'old_checkpoints')
+
+    def __init__(self, start: int, changed_end: int, shift: int, old_checkpoints):
+        self.start = start                # boundary to resume from (a checkpoint of the old run)
+        self.changed_end = changed_end    # new paragraphs at or after this index are unchanged
+        self.shift = shift                # new index - old index for unchanged trailing paragraphs
+        self.old_checkpoints = old_checkpoints
+
+    def converged(self, boundary: int) -> bool:
+        """True once past the edit at a boundary that was idle before the edit (and is idle now)."""
+        return boundary >= self.changed_end and (boundary - self.shift) in self.old_checkpoints
+
+
+def plan_resume(previous: CachedExtraction, hashes: List[bytes]) -> ResumePlan:
+    old = previous.hashes
+    limit = min(len(old), len(hashes))
+    prefix = 0
+    while prefix < limit and old[prefix] == hashes[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == hashes[-1 - suffix]:
+        suffix += 1
+    checkpoints = previous.checkpoints
+    start = checkpoints[bisect_right(checkpoints, prefix) - 1]
+    return ResumePlan(start, len(hashes) - suffix, len(hashes) - len(old), set(checkpoints))
+
+
+class Boundaries(Detector):
+    """Tracks the current paragraph and records checkpoints between paragraphs."""
+
+    def __init__(self, detectors, plan: Optional[ResumePlan] = None):
+        self.detectors = detectors
+        self.plan = plan
+        self.index = 0
+        self.checkpoints: List[int] = []
+        self.stopped_at: Optional[int] = None
+
+    def begin(self, ctx):
+        self.index = ctx.index
+        return False
+
+    def idle(self) -> bool:
+        return True
+
+    def boundary(self, boundary: int) -> bool:
+        """run_detectors on_boundary hook: record a checkpoint; True stops the walk."""
+        if all(d.idle() for d in self.detectors):
+            self.checkpoints.append(boundary)
+            if self.plan is not None and self.plan.converged(boundary):
+                self.stopped_at = boundary
+                return True
+        return False
+
+
+class ExtractionCache:
+    """Pickled CachedExtraction per document in one directory."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, doc_path: Path) -> Path:
+        return self.directory / f"{Path(doc_path).stem}.extract.pkl"
+
+    def load(self, doc_path: Path, styles: bytes, detect_chapters: bool) -> Optional[CachedExtraction]:
+        path = self.path(doc_path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            logging.warning("Ignoring unreadable extraction cache %s: %s", path, e)
+            return None
+        if (not isinstance(cached, CachedExtraction) or cached.version != CACHE_VERSION
+                or cached.styles != styles or cached.detect_chapters != detect_chapters):
+            return None
+        return cached
+
+    def save(self, doc_path: Path, cached: CachedExtraction) -> None:
+        path = self.path(doc_path)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
@@ -0,0 +1,164 @@
+"""
+Shared loader for the Yada Yahowah Hebrew Glossary CSV exports.
+- Parses the words export and the spellings export into typed column arrays
+- Validates them before anything touches the database: duplicate keys abort
+  the import, words without a Strong's number or Hebrew are only reported
+  (link_words_to_strongs.py fills in Strong's numbers later)
+- Bulk-loads them with COPY into yy_word / yy_word_spelling with upsert semantics,
+  so re-running an updated export is a single idempotent transaction
+"""
+import csv
+from typing import Dict, List
+
+from pg_copy import copy_into_temp, upsert_rows
+
+WORD_FLAG_COLUMNS = [
+    'word_flag_gender_m', 'word_flag_gender_f', 'word_flag_plural',
+    'word_flag_noun', 'word_flag_verb', 'word_flag_adjective',
+    'word_flag_adverb', 'word_flag_preposition', 'word_flag_conjunction',
+    'word_flag_subst',
+]
+WORD_COLUMNS = ['word_id', 'word_strongs', 'word_hebrew', 'word_yt'] + WORD_FLAG_COLUMNS + ['word_definition']
+SPELLING_COLUMNS = ['word_id', 'word_spelling_text', 'word_spelling_sort']
+
+
+def to_bool(val):
+    """Glossary flags are '1' when set; anything else is left NULL."""
+    if val and val.strip() == '1':
+        return True
+    return None
+
+
+def read_words(csv_path: str) -> Dict[str, list]:
+    """
+    Parse the glossary words export.
+
+    Returns:
+        Dict mapping each WORD_COLUMNS name -> list of typed values (one per row)
+    """
+    cols = {c: [] for c in WORD_COLUMNS}
+    with open(csv_path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # Strip trailing empty key from trailing comma
+            row = {k.strip(): v.strip() if v else None for k, v in row.items() if k and k.strip()}
+            if not row.get('word_id'):
+                continue
+            cols['word_id'].append(int(row['word_id']))
+            cols['word_strongs'].append(row.get('word_strongs'))
+            cols['word_hebrew'].append(row.get('word_hebrew'))
+            cols['word_yt'].append(row.get('word_yt') or None)
+            for flag in WORD_FLAG_COLUMNS:
+                cols[flag].append(to_bool(row.get(flag)))
+            cols['word_definition'].append(row.get('word_definition') or None)
+    return cols
+
+
+def read_spellings(csv_path: str) -> Dict[str, list]:
+    """
+    Parse the glossary spellings export (word_id, newline-separated spellings).
+
+    Returns:
+        Dict mapping each SPELLING_COLUMNS name -> list of typed values (one per spelling)
+    """
+    cols = {c: [] for c in SPELLING_COLUMNS}
+    with open(csv_path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # skip header row
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            word_id = int(row[0].strip())
+            spellings_raw = row[1] if len(row) > 1 else ''
+            # Split on newlines to get individual spellings
+            spellings = [s.strip() for s in spellings_raw.split('\n') if s.strip()]
+            for sort_idx, spelling in enumerate(spellings):
+                cols['word_id'].append(word_id)
+                cols['word_spelling_text'].append(spelling)
+                cols['word_spelling_sort'].append(sort_idx)
+    return cols
+
+
+def validate_words(cols: Dict[str, list]) -> List[str]:
+    """Return a list of problems with parsed word columns (empty when valid)."""
+    errors = []
+    seen = set()
+    for word_id in cols['word_id']:
+        if word_id in seen:
+            errors.append(f"Duplicate word_id {word_id}.")
+        seen.add(word_id)
+    return errors
+
+
+def word_warnings(cols: Dict[str, list]) -> List[str]:
+    """Incomplete words that are still imported (no Strong's number or no Hebrew)."""
+    warnings = []
+    for word_id, strongs, hebrew in zip(cols['word_id'], cols['word_strongs'], cols['word_hebrew']):
+        if not strongs:
+            warnings.append(f"word_id {word_id}: no Strong's number.")
+        if not hebrew:
+            warnings.append(f"word_id {word_id}: no Hebrew text.")
+    return warnings
+
+
+def validate_spellings(cols: Dict[str, list]) -> List[str]:
+    """Return a list of problems with parsed spelling columns (empty when valid)."""
+    errors = []
+    seen = set()
+    for word_id, text in zip(cols['word_id'], cols['word_spelling_text']):
+        if (word_id, text) in seen:
+            errors.append(f"word_id {word_id}: duplicate spelling '{text}'.")
+        seen.add((word_id, text))
+    return errors
+
+
+def load_words(conn, cols: Dict[str, list]) -> int:
+    """
+    Upsert parsed words into yy_word by word_id and reset the word_id sequence.
+
+    Returns:
+        Number of rows inserted or changed
+    """
+    cur = conn.cursor()
+    count = upsert_rows(cur, 'yy_word', ['word_id'], WORD_COLUMNS,
+                        zip(*(cols[c] for c in WORD_COLUMNS)))
+    cur.execute("SELECT setval('yy_word_word_id_seq', (SELECT MAX(word_id) FROM yy_word))")
+    cur.close()
+    return count
+
+
+def load_spellings(conn, cols: Dict[str, list]) -> tuple:
+    """
+    Upsert parsed spellings into yy_word_spelling.
+
+    A spelling is identified by (word_id, word_spelling_text): existing rows get
+    their sort order updated, new ones are inserted. Spellings already in the
+    table but absent from the export are left alone.
+
+    Returns:
+        Tuple of (inserted, updated)
+    """
+    cur = conn.cursor()
+    copy_into_temp(cur, 'tmp_glossary_spelling', 'yy_word_spelling', SPELLING_COLUMNS,
+                   zip(*(cols[c] for c in SPELLING_COLUMNS)))
+    cur.execute("""
+        UPDATE yy_word_spelling s
+        SET word_spelling_sort = t.word_spelling_sort
+        FROM tmp_glossary_spelling t
+        WHERE s.word_id = t.word_id
+          AND s.word_spelling_text = t.word_spelling_text
+          AND s.word_spelling_sort IS DISTINCT FROM t.word_spelling_sort
+    """)
+    updated = cur.rowcount
+    cur.execute("""
+        INSERT INTO yy_word_spelling (word_id, word_spelling_text, word_spelling_sort)
+        SELECT t.word_id, t.word_spelling_text, t.word_spelling_sort
+        FROM tmp_glossary_spelling t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM yy_word_spelling s
+            WHERE s.word_id = t.word_id AND s.word_spelling_text = t.word_spelling_text
+        )
+    """)
+    inserted = cur.rowcount
+    cur.close()
+    return inserted, updated
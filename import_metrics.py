@@ -0,0 +1,212 @@
+"""
+Lightweight timers, counters and histograms for the import pipeline.
+
+    metrics = Metrics()
+    with metrics.timer('extract', document='YY-v01.docx', histogram='document_parse_seconds'):
+        ...
+    metrics.count('translations', 12)
+    metrics.observe('runs_per_paragraph', 7)
+    metrics.write_json('run.json')
+
+NULL_METRICS has the same interface and does nothing; hot loops check
+metrics.enabled before computing a value to observe, so a disabled run pays
+one attribute test per paragraph. Recording is locked, so pipeline writer
+threads can share one Metrics.
+"""
+import json
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+PROMETHEUS_PREFIX = 'yy_import'
+
+# Bucket upper bounds per histogram (a +Inf bucket is implied)
+HISTOGRAM_BUCKETS = {
+    'document_parse_seconds': [0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300],
+    'runs_per_paragraph': [1, 2, 4, 8, 16, 32, 64, 128, 256],
+    'translation_html_bytes': [64, 256, 1024, 4096, 16384, 65536],
+}
+DEFAULT_BUCKETS = [0.001, 0.01, 0.1, 1, 10, 100]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value) -> None:
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def to_dict(self) -> Dict:
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self.bounds + ['+Inf'], self.counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        return {'count': self.count, 'sum': round(self.total, 6), 'buckets': buckets}
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'document', 'histogram', 'start', 'elapsed')
+
+    def __init__(self, metrics, name, document, histogram):
+        self.metrics = metrics
+        self.name = name
+        self.document = document
+        self.histogram = histogram
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        self.metrics._record_time(self.name, self.elapsed, self.document)
+        if self.histogram:
+            self.metrics.observe(self.histogram, self.elapsed)
+        return False
+
+
+class Metrics:
+    """Collects phase timings, counters and histograms for one import run."""
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {}      # name -> [calls, seconds]
+        self.documents = {}   # document -> {name: seconds}
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other: 'Metrics') -> None:
+        """Add another run's timings, counters and histograms (e.g. from a worker process) into this one."""
+        with self._lock:
+            for name, (calls, seconds) in other.phases.items():
+                phase = self.phases.setdefault(name, [0, 0.0])
+                phase[0] += calls
+                phase[1] += seconds
+            for document, names in other.documents.items():
+                doc = self.documents.setdefault(document, {})
+                for name, seconds in names.items():
+                    doc[name] = doc.get(name, 0.0) + seconds
+            for name, n in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            for name, hist in other.histograms.items():
+                mine = self.histograms.get(name)
+                if mine is None:
+                    mine = self.histograms[name] = Histogram(hist.bounds)
+                mine.counts = [a + b for a, b in zip(mine.counts, hist.counts)]
+                mine.total += hist.total
+                mine.count += hist.count
+
+    def timer(self, name: str, document: Optional[str] = None, histogram: Optional[str] = None):
+        """Context manager timing a block into phase name (and into document's breakdown)."""
+        return _Timer(self, name, document, histogram)
+
+    def _record_time(self, name, seconds, document=None) -> None:
+        with self._lock:
+            phase = self.phases.setdefault(name, [0, 0.0])
+            phase[0] += 1
+            phase[1] += seconds
+            if document is not None:
+                doc = self.documents.setdefault(document, {})
+                doc[name] = doc.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value) -> None:
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram(HISTOGRAM_BUCKETS.get(name, DEFAULT_BUCKETS))
+            hist.observe(value)
+
+    def report(self) -> Dict:
+        """JSON-serializable run report."""
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'wall_seconds': round(time.time() - self.started, 3),
+            'phases': {k: {'calls': v[0], 'seconds': round(v[1], 6)} for k, v in self.phases.items()},
+            'counters': dict(self.counters),
+            'histograms': {k: h.to_dict() for k, h in self.histograms.items()},
+            'documents': {d: {k: round(v, 6) for k, v in phases.items()} for d, phases in self.documents.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        """Report in Prometheus text exposition format."""
+        p = PROMETHEUS_PREFIX
+        lines = [f"# TYPE {p}_phase_seconds_total counter"]
+        for name, (_, seconds) in sorted(self.phases.items()):
+            lines.append(f'{p}_phase_seconds_total{{phase="{name}"}} {seconds:.6f}')
+        lines.append(f"# TYPE {p}_phase_calls_total counter")
+        for name, (calls, _) in sorted(self.phases.items()):
+            lines.append(f'{p}_phase_calls_total{{phase="{name}"}} {calls}')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            lines.append(f"{p}_{name}_total {value}")
+        for name, hist in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {p}_{name} histogram")
+            for bound, cumulative in hist.to_dict()['buckets'].items():
+                lines.append(f'{p}_{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{p}_{name}_sum {hist.total:.6f}")
+            lines.append(f"{p}_{name}_count {hist.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+
+
+class _NullMetrics(Metrics):
+    """Disabled metrics: every call is a no-op."""
+
+    enabled = False
+    _NULL_TIMER = nullcontext()
+
+    def __init__(self):
+        super().__init__()
+
+    def timer(self, name, document=None, histogram=None):
+        return self._NULL_TIMER
+
+    def count(self, name, n=1):
+        pass
+
+    def merge(self, other):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
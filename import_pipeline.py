@@ -0,0 +1,166 @@
+"""
+Overlapped extract -> paginate -> persist pipeline for parse_word_translations.py --pipeline.
+- Documents are parsed in worker processes (python-docx parsing is CPU bound)
+- Pages found in a volume's published PDF are assigned by the parser process;
+  the rest are looked up one document at a time on a single paging thread, so
+  Word COM is never driven concurrently
+- Paged documents go through a bounded asyncio.Queue to the writer tasks; each
+  writer runs the blocking psycopg2 save in a thread on its own pooled
+  connection (db.pooled()), so several documents are written at once while
+  later ones are still being parsed
+- At most workers + queue size documents are between submission to a parser
+  and pickup by a writer: further parses start only as writers take documents
+  off the queue, so memory stays bounded by those sizes rather than the number
+  of documents
+
+    stats = asyncio.run(import_pipeline.run(docx_files, output='yy_translation', workers=4, writers=4))
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import db
+import parse_word_translations as pwt
+import pdf_pages
+from extraction_cache import ExtractionCache
+from import_metrics import Metrics, NULL_METRICS
+from translation_loader import YyTranslationLoader
+
+DEFAULT_WRITERS = 4
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _extract(path: str, detect_chapters: bool, collect_metrics: bool, cache_dir: Optional[str] = None,
+             pdf: Optional[Path] = None):
+    """
+    Worker process: parse one document (resuming from its extraction cache when cache_dir is set)
+    and look up its translations' pages in its published PDF, if it has one.
+
+    Returns:
+        (translations, structure or None, worker Metrics or None)
+    """
+    doc_path = Path(path)
+    metrics = Metrics() if collect_metrics else NULL_METRICS
+    with metrics.timer('extract', document=doc_path.name, histogram='document_parse_seconds'):
+        result = pwt.extract_translations_from_doc(doc_path, detect_chapters=detect_chapters, metrics=metrics,
+                                                   cache=ExtractionCache(cache_dir) if cache_dir else None)
+    translations, structure = result if detect_chapters else (result, None)
+    if pdf and translations:
+        with metrics.timer('page_pdf', document=doc_path.name):
+            try:
+                page_map = pdf_pages.page_numbers_from_pdf(path, str(pdf), {t.para_idx for t in translations})
+            except Exception as e:
+                logging.warning(f"PDF page lookup failed for {doc_path.name} ({Path(pdf).name}): {e}")
+                page_map = {}
+        for t in translations:
+            t.page = page_map.get(t.para_idx)
+    return translations, structure, metrics if collect_metrics else None
+
+
+def _write(doc_path: Path, translations, structure, loader: Optional[YyTranslationLoader],
+           diff: bool, metrics: Metrics) -> Dict[str, int]:
+    """Writer thread: save one document on a pooled connection."""
+    with db.pooled() as conn:
+        return pwt.persist_document(conn, doc_path, translations, structure,
+                                    loader=loader.bind(conn) if loader else None,
+                                    diff=diff, metrics=metrics, batch=True)
+
+
+async def run(docx_files: List[Path], output: str = pwt.OUTPUT_TRANSLATION, diff: bool = False,
+              workers: Optional[int] = None, writers: int = DEFAULT_WRITERS,
+              metrics: Metrics = NULL_METRICS, cache_dir: Optional[str] = None,
+              pdfs: Optional[Dict[str, Path]] = None) -> Dict[str, int]:
+    """
+    Import docx_files with parsing, paging and database writes overlapped.
+
+    Args:
+        docx_files: Documents to import
+        output: OUTPUT_TRANSLATION or OUTPUT_YY_TRANSLATION (see parse_directory)
+        diff: Write only changed translations (translation_sync)
+        workers: Parser processes (default: CPU count - 1)
+        writers: Concurrent database writers, each on its own pooled connection
+        metrics: Collects timings; worker process metrics are merged in
+        cache_dir: Extraction checkpoint directory (see extraction_cache)
+        pdfs: Absolute doc path -> published PDF; pages are looked up there by the parser
+            processes, and only translations not found go to the paging thread
+
+    Returns:
+        The same statistics dictionary as parse_directory()
+    """
+    stats = {
+        "files_processed": 0,
+        "translations_found": 0,
+        "translations_saved": 0,
+        "translations_unresolved": 0,
+        "translations_unchanged": 0,
+        "translations_deleted": 0
+    }
+    load_yy = output == pwt.OUTPUT_YY_TRANSLATION
+    workers = workers or default_workers()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=writers * 2)
+    # A slot per document from parser submission until a writer takes it off the queue
+    slots = asyncio.Semaphore(workers + queue.maxsize)
+
+    db.get_pool(writers + 1)
+    loader = None
+    if load_yy:
+        with db.pooled() as conn:
+            loader = YyTranslationLoader(conn)
+            conn.commit()
+
+    logging.info(f"Pipeline: {len(docx_files)} document(s), {workers} parser process(es), {writers} writer(s)")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=pwt.setup_logging,
+                             initargs=(logging.getLogger().isEnabledFor(logging.DEBUG),)) as processes, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='paginate') as pager, \
+            ThreadPoolExecutor(max_workers=writers, thread_name_prefix='writer') as threads:
+
+        async def extract(doc_path: Path):
+            await slots.acquire()
+            try:
+                translations, structure, worker_metrics = await loop.run_in_executor(
+                    processes, _extract, str(doc_path), load_yy, metrics.enabled, cache_dir,
+                    (pdfs or {}).get(str(doc_path.absolute())))
+            except BaseException:
+                slots.release()
+                raise
+            if worker_metrics:
+                metrics.merge(worker_metrics)
+            return doc_path, translations, structure
+
+        async def produce():
+            for extracted in asyncio.as_completed([extract(p) for p in docx_files]):
+                doc_path, translations, structure = await extracted
+                metrics.count('documents')
+                stats["files_processed"] += 1
+                stats["translations_found"] += len(translations)
+                unpaged = [t for t in translations if t.page is None]
+                if unpaged:
+                    with metrics.timer('paginate', document=doc_path.name):
+                        await loop.run_in_executor(pager, pwt.assign_page_numbers, doc_path, unpaged, metrics)
+                await queue.put((doc_path, translations, structure))
+            for _ in range(writers):
+                await queue.put(None)
+
+        async def write():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                slots.release()
+                doc_path, translations, structure = item
+                counts = await loop.run_in_executor(threads, _write, doc_path, translations, structure,
+                                                    loader, diff, metrics)
+                for key, n in counts.items():
+                    stats[f"translations_{key}"] += n
+
+        await asyncio.gather(produce(), *(write() for _ in range(writers)))
+
+    return stats
@@ -0,0 +1,122 @@
+"""
+Opt-in per-document cProfile and tracemalloc hooks for the import pipeline.
+
+    profiler = DocumentProfiler('profiles', cpu=True, memory=True)
+    with profiler.phase('YY-v07.docx', 'extract'):
+        ...
+    profiler.print_summary()
+
+Each phase writes files named after the document into the output directory:
+- <doc>.<phase>.prof      cProfile stats (open with pstats or snakeviz)
+- <doc>.<phase>.mem.txt   top-N allocation sites still live at the end of the phase
+
+NULL_PROFILER has the same interface and does nothing.
+"""
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import List
+
+DEFAULT_TOP = 25
+
+
+class DocumentProfiler:
+    """Profiles named phases per document and ranks documents by time and peak memory."""
+
+    enabled = True
+
+    def __init__(self, out_dir, cpu: bool = True, memory: bool = False, top: int = DEFAULT_TOP):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.results = []  # (document, phase, seconds, peak_bytes)
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _path(self, document: str, phase: str, suffix: str) -> Path:
+        return self.out_dir / f"{Path(document).stem}.{phase}{suffix}"
+
+    @contextmanager
+    def phase(self, document: str, phase: str):
+        profile = cProfile.Profile() if self.cpu else None
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            seconds = time.perf_counter() - t0
+            peak = 0
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                self._write_snapshot(document, phase, peak)
+            if profile:
+                profile.dump_stats(str(self._path(document, phase, '.prof')))
+            self.results.append((document, phase, seconds, peak))
+
+    def _write_snapshot(self, document: str, phase: str, peak: int) -> None:
+        stats = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        )).statistics('lineno')
+        with open(self._path(document, phase, '.mem.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"{document} {phase}: peak {peak / 1024 / 1024:.1f} MiB above phase start\n")
+            f.write(f"Top {self.top} allocation sites live at end of phase:\n")
+            for stat in stats[:self.top]:
+                f.write(f"{stat}\n")
+
+    def ranking(self) -> List[dict]:
+        """Per-document totals across phases, slowest first."""
+        docs = {}
+        for document, phase, seconds, peak in self.results:
+            entry = docs.setdefault(document, {'document': document, 'seconds': 0.0, 'peak_bytes': 0, 'phases': {}})
+            entry['seconds'] += seconds
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+            entry['phases'][phase] = entry['phases'].get(phase, 0.0) + seconds
+        return sorted(docs.values(), key=lambda d: d['seconds'], reverse=True)
+
+    def print_summary(self, limit: int = 20) -> None:
+        ranking = self.ranking()
+        if not ranking:
+            return
+        print(f"\n{'='*60}")
+        print("PROFILE SUMMARY (slowest documents)")
+        print(f"{'='*60}")
+        for entry in ranking[:limit]:
+            phases = ", ".join(f"{k} {v:.2f}s" for k, v in entry['phases'].items())
+            mem = f"  peak {entry['peak_bytes'] / 1024 / 1024:7.1f} MiB" if self.memory else ""
+            print(f"{entry['seconds']:8.2f}s{mem}  {entry['document']}  ({phases})")
+        if self.memory:
+            print("\nBy peak memory:")
+            for entry in sorted(ranking, key=lambda d: d['peak_bytes'], reverse=True)[:limit]:
+                print(f"{entry['peak_bytes'] / 1024 / 1024:8.1f} MiB  {entry['document']}")
+        print(f"\nProfiles written to {self.out_dir}")
+
+
+class _NullProfiler(DocumentProfiler):
+    """Disabled profiler: phases run unwrapped."""
+
+    enabled = False
+    _NULL_PHASE = nullcontext()
+
+    def __init__(self):
+        self.results = []
+        self.memory = False
+
+    def phase(self, document, phase):
+        return self._NULL_PHASE
+
+    def print_summary(self, limit=20):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
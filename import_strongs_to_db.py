@@ -4,36 +4,18 @@ Import scraped Strong's Hebrew data into yy_word and yy_word_spelling tables.
 - Creates new yy_word entries for Strong's numbers not yet in the table
 - Adds new yy_word_spelling entries for spellings not yet in the table
 - Links existing unlinked yy_word_spelling entries to the correct yy_word
+- Reads the scrape through the compiled Strong's index (strongs_index), whose
+  normalized spelling keys replace re-indexing every entry on each run
 """
-import json
-import psycopg2
-import unicodedata
-
-SCRAPED_FILE = r"C:\Users\Joe\Work\dev\yada\translations\strongs_scraped.json"
-
-DB_CONFIG = {
-    'host': 'localhost',
-    'port': 5433,
-    'dbname': 'yada',
-    'user': 'postgres',
-    'password': 'yada_password',
-}
-
-def normalize_for_match(text):
-    """Normalize spelling for matching against yy_word_spelling."""
-    text = unicodedata.normalize('NFD', text)
-    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
-    text = text.lower()
-    text = text.replace('\u2019', "'").replace('\u2018', "'").replace('\u02bc', "'")
-    text = text.replace('\u02be', "'").replace('\u02bf', "'")
-    text = text.replace('@', '')  # lexiconcordance uses @ for sheva
-    return text
+import db
+import strongs_index
+from strongs_index import normalize_spelling as normalize_for_match
 
 def main():
-    with open(SCRAPED_FILE, 'r', encoding='utf-8') as f:
-        entries = json.load(f)
+    index = strongs_index.open_index()
+    entries = list(index.entries(strongs_index.SCRAPED))
 
-    conn = psycopg2.connect(**DB_CONFIG)
+    conn = db.connect()
     cur = conn.cursor()
 
     # Get existing yy_word entries by strongs number
@@ -143,40 +125,25 @@ def main():
                 existing_spellings[clean_spelling] = {'id': None, 'word_id': word_id}
                 existing_spellings_lower[clean_spelling.lower()] = {'id': None, 'word_id': word_id, 'text': clean_spelling}
 
-        # Also try to link existing unlinked spellings by matching against scraped spellings
-        # Use normalized comparison
-        norm_spellings = set()
-        for sp in spellings:
-            norm_spellings.add(normalize_for_match(sp))
-            norm_spellings.add(normalize_for_match(sp.replace('@', "'")))
-
     # Second pass: try to link remaining unlinked spellings
     cur.execute("SELECT word_spelling_id, word_spelling_text FROM yy_word_spelling WHERE word_id IS NULL")
     unlinked = cur.fetchall()
 
-    # Build normalized lookup from all scraped data
-    norm_to_strongs = {}
-    for entry in entries:
-        strongs = entry['strongs']
-        for sp in entry['spellings']:
-            norm = normalize_for_match(sp)
-            if norm not in norm_to_strongs:
-                norm_to_strongs[norm] = strongs
-            # Also without @
-            norm2 = normalize_for_match(sp.replace('@', "'"))
-            if norm2 not in norm_to_strongs:
-                norm_to_strongs[norm2] = strongs
+    # Normalized scraped spelling -> first Strong's number (in scrape order) with that spelling
+    def strongs_for(norm):
+        keys = index.keys(strongs_index.SPELLING, norm)
+        return keys[0] if keys else None
 
     for sp_id, sp_text in unlinked:
         norm_text = normalize_for_match(sp_text)
 
-        matched_strongs = norm_to_strongs.get(norm_text)
+        matched_strongs = strongs_for(norm_text)
         if not matched_strongs:
             # Try without leading apostrophe
             if norm_text.startswith("'"):
-                matched_strongs = norm_to_strongs.get(norm_text[1:])
+                matched_strongs = strongs_for(norm_text[1:])
             if not matched_strongs:
-                matched_strongs = norm_to_strongs.get("'" + norm_text)
+                matched_strongs = strongs_for("'" + norm_text)
 
         if matched_strongs:
             wid = existing_words.get(matched_strongs)
@@ -200,6 +167,7 @@ def main():
 
     cur.close()
     conn.close()
+    index.close()
 
     print(f"Words created:    {words_created}")
     print(f"Words updated:    {words_updated}")
@@ -0,0 +1,273 @@
+"""
+Continuous import of edited volumes for parse_word_translations.py --watch.
+- Directory events come from watchdog (inotify on Linux, ReadDirectoryChangesW on
+  Windows) when it is installed; without it the YY*.docx files are polled for
+  size / mtime changes
+- Word saves through temporary files and renames and holds a ~$ lock file while a
+  document is open, so only YY*.docx volumes are considered (is_volume_document)
+  and a document is imported once it has been quiet for the debounce interval
+  with an unchanged size and mtime
+- Each settled document goes through extract -> paginate -> persist on its own,
+  on one long-lived connection; the YyTranslationLoader lookups (scrolls, cite
+  books, verses, volumes) and the memoized cite parser stay warm between events
+- Extraction resumes from the extraction cache, so only the paragraphs around an
+  edit are walked, and saves always go through the diff path so only the
+  translations that changed are written
+
+    watch(Path('docs'), conn, output='yy_translation', cache_dir='.extract_cache')
+"""
+import logging
+import queue
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import psycopg2
+
+import db
+import parse_word_translations as pwt
+import pdf_pages
+from extraction_cache import ExtractionCache
+from import_metrics import Metrics, NULL_METRICS
+from import_profiler import DocumentProfiler, NULL_PROFILER
+from translation_loader import YyTranslationLoader
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watching is optional; polling works everywhere
+    FileSystemEventHandler = object
+    Observer = None
+
+DEFAULT_DEBOUNCE = 2.0       # seconds a document must stay unchanged before it is imported
+DEFAULT_POLL_INTERVAL = 1.0  # seconds between directory scans without watchdog
+DEFAULT_CACHE_DIR = '.extract_cache'
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns), or None if the file is gone."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards created / modified / moved-to volume paths to a queue."""
+
+    def __init__(self, changes: 'queue.Queue[Path]'):
+        self.changes = changes
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        # Word's final save step is often a rename of a temp file onto the volume
+        for name in (getattr(event, 'dest_path', None), event.src_path):
+            if name:
+                path = Path(name)
+                if pwt.is_volume_document(path):
+                    self.changes.put(path)
+
+
+class DirectoryWatcher:
+    """Paths of volumes changed under a directory, from watchdog events or by polling."""
+
+    def __init__(self, directory: Path, poll_interval: float = DEFAULT_POLL_INTERVAL, polling: bool = False):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.changes: 'queue.Queue[Path]' = queue.Queue()
+        self.observer = None
+        self.snapshot: Dict[Path, Tuple[int, int]] = {}
+        self.next_scan = 0.0
+        if Observer is not None and not polling:
+            self.observer = Observer()
+            self.observer.schedule(_EventHandler(self.changes), str(directory), recursive=False)
+            self.observer.start()
+        else:
+            self.snapshot = self._scan()
+
+    @property
+    def mode(self) -> str:
+        return 'watchdog' if self.observer else f'polling every {self.poll_interval:g}s'
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.directory.glob("YY*.docx"):
+            if pwt.is_volume_document(path):
+                sig = _signature(path)
+                if sig:
+                    snapshot[path] = sig
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[Path]:
+        """Changed volume paths seen within timeout seconds (possibly none)."""
+        changed = set()
+        if self.observer:
+            try:
+                changed.add(self.changes.get(timeout=timeout))
+                while True:
+                    changed.add(self.changes.get_nowait())
+            except queue.Empty:
+                pass
+            return changed
+        delay = self.next_scan - time.monotonic()
+        if delay > 0:
+            time.sleep(min(delay, timeout))
+            if delay > timeout:
+                return changed
+        snapshot = self._scan()
+        changed = {path for path, sig in snapshot.items() if self.snapshot.get(path) != sig}
+        self.snapshot = snapshot
+        self.next_scan = time.monotonic() + self.poll_interval
+        return changed
+
+    def stop(self) -> None:
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+
+
+class Debouncer:
+    """Holds changed paths until they have been quiet for `delay` seconds with a stable size / mtime."""
+
+    def __init__(self, delay: float = DEFAULT_DEBOUNCE):
+        self.delay = delay
+        self.pending: Dict[Path, Tuple[float, Optional[Tuple[int, int]]]] = {}  # path -> (deadline, signature)
+
+    def touch(self, paths: Iterable[Path], now: float) -> None:
+        for path in paths:
+            self.pending[path] = (now + self.delay, _signature(path))
+
+    def next_deadline(self) -> Optional[float]:
+        return min((deadline for deadline, _ in self.pending.values()), default=None)
+
+    def due(self, now: float) -> Set[Path]:
+        """Settled paths, removed from pending; a file still being written restarts its wait."""
+        settled = set()
+        for path, (deadline, sig) in list(self.pending.items()):
+            if deadline > now:
+                continue
+            current = _signature(path)
+            if current is None:
+                del self.pending[path]          # deleted or renamed away
+            elif current != sig:
+                self.pending[path] = (now + self.delay, current)
+            else:
+                del self.pending[path]
+                settled.add(path)
+        return settled
+
+
+class DocumentImporter:
+    """Extract, paginate and persist single documents on one warm connection."""
+
+    def __init__(self, conn, output: str = pwt.OUTPUT_TRANSLATION, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 dry_run: bool = False, pdf_dir: Optional[Path] = None, metrics: Metrics = NULL_METRICS,
+                 profiler: DocumentProfiler = NULL_PROFILER):
+        self.conn = conn
+        self.pdf_dir = pdf_dir
+        self.output = output
+        self.cache = ExtractionCache(cache_dir) if cache_dir else None
+        self.dry_run = dry_run
+        self.metrics = metrics
+        self.profiler = profiler
+        self.loader = None
+        if output == pwt.OUTPUT_YY_TRANSLATION and not dry_run:
+            self.loader = YyTranslationLoader(conn)
+            conn.commit()
+
+    def reconnect(self) -> None:
+        """Replace a dropped connection; the loader's lookups are kept and rebound."""
+        try:
+            self.conn.close()
+        except psycopg2.Error:
+            pass
+        self.conn = db.connect()
+        if self.loader:
+            self.loader = self.loader.bind(self.conn)
+        logging.info(f"Reconnected to PostgreSQL at {db.describe()}")
+
+    def import_document(self, doc_path: Path) -> Dict[str, int]:
+        """Run one document through the import; returns persist_document() counts plus 'found'."""
+        metrics = self.metrics
+        structure = None
+        with metrics.timer('extract', document=doc_path.name, histogram='document_parse_seconds'), \
+                self.profiler.phase(doc_path.name, 'extract'):
+            if self.output == pwt.OUTPUT_YY_TRANSLATION:
+                translations, structure = pwt.extract_translations_from_doc(
+                    doc_path, detect_chapters=True, metrics=metrics, cache=self.cache)
+            else:
+                translations = pwt.extract_translations_from_doc(doc_path, metrics=metrics, cache=self.cache)
+        metrics.count('documents')
+        if self.dry_run:
+            return {"found": len(translations)}
+
+        if self.conn.closed:
+            self.reconnect()
+        if translations:
+            with metrics.timer('paginate', document=doc_path.name):
+                pdfs = pdf_pages.volume_pdfs(self.conn, [doc_path], self.pdf_dir)
+                pwt.assign_page_numbers(doc_path, translations, metrics, pdfs=pdfs, profiler=self.profiler)
+        counts = pwt.persist_document(self.conn, doc_path, translations, structure,
+                                      loader=self.loader, diff=True, metrics=metrics)
+        if self.output == pwt.OUTPUT_TRANSLATION and counts["saved"]:
+            pwt.populate_cite_table(self.conn)
+            pwt.normalize_unicode_text(self.conn)
+            pwt.update_cite_book_ids(self.conn)
+        if self.output == pwt.OUTPUT_YY_TRANSLATION and (counts["saved"] or counts["deleted"]):
+            pwt.refresh_derived(self.conn)
+        counts["found"] = len(translations)
+        return counts
+
+
+def watch(directory: Path, conn, output: str = pwt.OUTPUT_TRANSLATION,
+          cache_dir: Optional[str] = DEFAULT_CACHE_DIR, dry_run: bool = False, pdf_dir: Optional[Path] = None,
+          debounce: float = DEFAULT_DEBOUNCE, poll_interval: float = DEFAULT_POLL_INTERVAL,
+          polling: bool = False, metrics: Metrics = NULL_METRICS,
+          profiler: DocumentProfiler = NULL_PROFILER) -> None:
+    """
+    Import volumes under directory as they are saved, until interrupted (Ctrl+C).
+
+    Args:
+        directory: Directory containing the YY*.docx volumes
+        conn: PostgreSQL connection, kept open between imports (None with dry_run)
+        output: OUTPUT_TRANSLATION or OUTPUT_YY_TRANSLATION (see parse_directory)
+        cache_dir: Extraction checkpoint directory (see extraction_cache); None re-extracts whole documents
+        dry_run: Extract and log counts without paging or saving
+        pdf_dir: Directory of published volume PDFs for page lookup (see pdf_pages)
+        debounce: Seconds a document must stay unchanged before it is imported
+        poll_interval: Seconds between directory scans when polling
+        polling: Poll even if watchdog is installed (e.g. network shares without change events)
+        metrics: Collects per-document timings across the session
+        profiler: Profiles extraction and XML page mapping of each import (--profile / --trace-memory)
+    """
+    importer = DocumentImporter(conn, output=output, cache_dir=cache_dir, dry_run=dry_run, pdf_dir=pdf_dir,
+                                metrics=metrics, profiler=profiler)
+    watcher = DirectoryWatcher(directory, poll_interval=poll_interval, polling=polling)
+    debouncer = Debouncer(debounce)
+    logging.info(f"Watching {directory} for saved volumes ({watcher.mode}, {debounce:g}s debounce); Ctrl+C to stop")
+    try:
+        while True:
+            deadline = debouncer.next_deadline()
+            timeout = 1.0 if deadline is None else max(0.05, min(1.0, deadline - time.monotonic()))
+            debouncer.touch(watcher.poll(timeout), time.monotonic())
+            for doc_path in sorted(debouncer.due(time.monotonic())):
+                started = time.perf_counter()
+                try:
+                    counts = importer.import_document(doc_path)
+                except psycopg2.OperationalError as e:
+                    logging.error(f"{doc_path.name}: database connection lost ({e}); retrying after next save")
+                    importer.conn.close()
+                    continue
+                except Exception as e:
+                    # A half-saved or corrupt document fails to open; the next save brings it back
+                    logging.error(f"{doc_path.name}: import failed: {e}")
+                    continue
+                summary = ", ".join(f"{n} {key}" for key, n in counts.items() if n)
+                logging.info(f"{doc_path.name}: {'extracted' if dry_run else 'imported'} in "
+                             f"{time.perf_counter() - started:.1f}s ({summary or 'no translations'})")
+    except KeyboardInterrupt:
+        logging.info("Watch stopped")
+    finally:
+        watcher.stop()
@@ -0,0 +1,111 @@
+"""
+Build watermarks for the offline index builders.
+
+Each builder records when it last ran in yy_index_state. On the next run it
+asks rev_yy_translation which translations were inserted, updated or deleted
+since then, so only those rows need re-indexing.
+
+The revision triggers stamp _revision_dtime with NOW(), the start of the
+writing transaction, not its commit. The watermark is therefore pulled back to
+the start of the oldest transaction still open when the build begins: a write
+that commits after the build has read its rows is stamped no earlier than that,
+so the next build still sees it. Rows revised in that window may be indexed
+twice, which the builders tolerate.
+"""
+from typing import List, Optional
+
+
+def ensure_state_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_index_state (
+            yy_index_name VARCHAR(100) PRIMARY KEY,
+            yy_index_build_dtime TIMESTAMP NOT NULL
+        )
+    """)
+
+
+def get_last_build(cur, index_name: str):
+    """Timestamp of the last successful build, or None if never built."""
+    ensure_state_table(cur)
+    cur.execute("SELECT yy_index_build_dtime FROM yy_index_state WHERE yy_index_name = %s", (index_name,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def start_build(cur):
+    """
+    Watermark to record once the build commits (taken before reading any rows).
+
+    The current time, or the start of the oldest other open transaction in this
+    database if that is earlier (its revisions are stamped with that start time).
+    """
+    cur.execute("""
+        SELECT LEAST(clock_timestamp(), MIN(xact_start))::timestamp
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND pid <> pg_backend_pid() AND xact_start IS NOT NULL
+    """)
+    return cur.fetchone()[0]
+
+
+def set_last_build(cur, index_name: str, build_dtime) -> None:
+    ensure_state_table(cur)
+    cur.execute("""
+        INSERT INTO yy_index_state (yy_index_name, yy_index_build_dtime) VALUES (%s, %s)
+        ON CONFLICT (yy_index_name) DO UPDATE SET yy_index_build_dtime = EXCLUDED.yy_index_build_dtime
+    """, (index_name, build_dtime))
+
+
+def changed_translation_keys(cur, since) -> List[int]:
+    """yy_translation keys with any revision (insert, update or delete) at or after since."""
+    cur.execute("""
+        SELECT DISTINCT yy_translation_key FROM rev_yy_translation
+        WHERE _revision_dtime >= %s AND yy_translation_key IS NOT NULL
+    """, (since,))
+    return [row[0] for row in cur.fetchall()]
+
+
+def _changed_placement_keys(cur, since, column: str) -> List[int]:
+    """
+    column values (yah_verse_key, yah_chapter_key) of translations revised at or after since.
+
+    Revisions record new values only, so a translation moved elsewhere also
+    contributes the value of its last revision before since.
+    """
+    cur.execute(f"""
+        WITH changed AS (
+            SELECT yy_translation_key, {column} FROM rev_yy_translation
+            WHERE _revision_dtime >= %(since)s AND yy_translation_key IS NOT NULL
+        ), previous AS (
+            SELECT DISTINCT ON (r.yy_translation_key) r.{column} FROM rev_yy_translation r
+            WHERE r._revision_dtime < %(since)s
+              AND r.yy_translation_key IN (SELECT yy_translation_key FROM changed)
+            ORDER BY r.yy_translation_key, r._revision_dtime DESC, r._revision_count DESC
+        )
+        SELECT {column} FROM changed WHERE {column} IS NOT NULL
+        UNION
+        SELECT {column} FROM previous WHERE {column} IS NOT NULL
+    """, {'since': since})
+    return [row[0] for row in cur.fetchall()]
+
+
+def changed_verse_keys(cur, since) -> List[int]:
+    """yah_verse keys a translation was added to, edited in or removed from since (old and new values)."""
+    return _changed_placement_keys(cur, since, 'yah_verse_key')
+
+
+def changed_chapter_keys(cur, since) -> List[int]:
+    """yah_chapter keys whose translations changed since (old and new values)."""
+    return _changed_placement_keys(cur, since, 'yah_chapter_key')
+
+
+def translations_since(cur, index_name: str, full: bool = False) -> Optional[List[int]]:
+    """
+    Keys to re-index for index_name.
+
+    Returns:
+        None when a full rebuild is needed (forced, or never built), else the changed keys
+    """
+    last = None if full else get_last_build(cur, index_name)
+    if last is None:
+        return None
+    return changed_translation_keys(cur, last)
@@ -0,0 +1,150 @@
+"""
+Link yy_word rows that have Hebrew but no Strong's number, in one pass.
+- Every word without word_strongs is read once; its word_hebrew is probed
+  against the compiled Strong's index (strongs_index) in memory: first the
+  exact pointed lemma, then the consonantal skeleton (niqqud, cantillation and
+  final forms folded), then, with --strip-prefixes, the skeleton without
+  prefixed particles (ve-, ha-, be-, ...)
+- A word is linked only when its probe lands on exactly one Strong's number
+  that no other yy_word already holds; ambiguous and taken matches are
+  reported, not guessed
+- Links are written with one COPY + UPDATE (translation_sync.update_rows)
+
+    python link_words_to_strongs.py --dry-run
+    python link_words_to_strongs.py --strip-prefixes
+"""
+import argparse
+import time
+import unicodedata
+from typing import Dict, List, Optional, Set, Tuple
+
+import psycopg2
+
+import db
+import strongs_index
+from strongs_index import hebrew_skeleton, prefix_variants
+from translation_sync import update_rows
+
+
+def strongs_number(key: str) -> str:
+    """yy_word.word_strongs form of an index key: 'H430' -> '0430'."""
+    return key.strip().lstrip('Hh').zfill(4)
+
+
+def _numbers(matches: List[Tuple[str, str]]) -> List[str]:
+    """Distinct Strong's numbers of (source, key) matches, in index order."""
+    return list(dict.fromkeys(strongs_number(key) for _, key in matches))
+
+
+class StrongsMatcher:
+    """Lemma and skeleton terms of the index loaded into dicts, so each word costs a hash probe or two."""
+
+    def __init__(self, index: strongs_index.StrongsIndex, strip_prefixes: bool = False):
+        self.lemmas = index.term_map(strongs_index.LEMMA)
+        self.skeletons = index.term_map(strongs_index.SKELETON)
+        self.strip_prefixes = strip_prefixes
+
+    def candidates(self, hebrew: str) -> Tuple[Optional[str], List[str]]:
+        """(how it matched, Strong's numbers) for a Hebrew word; (None, []) when nothing matched."""
+        exact = self.lemmas.get(unicodedata.normalize('NFC', hebrew.strip()))
+        if exact and len(_numbers(exact)) == 1:
+            return 'lemma', _numbers(exact)
+        skeleton = hebrew_skeleton(hebrew)
+        if not skeleton:
+            return None, []
+        found = self.skeletons.get(skeleton)
+        if found:
+            return 'skeleton', _numbers(found)
+        if self.strip_prefixes:
+            for stem in prefix_variants(skeleton):
+                found = self.skeletons.get(stem)
+                if found:
+                    return 'prefix', _numbers(found)
+        return None, []
+
+
+def link(conn, matcher: StrongsMatcher, dry_run: bool = False) -> Dict[str, object]:
+    """
+    Match every unlinked word and write the unique links.
+
+    Returns:
+        Dict with counts (words, lemma, skeleton, prefix, ambiguous, taken,
+        unmatched, updated) and the ambiguous list of (word_id, hebrew, numbers)
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT word_strongs FROM yy_word WHERE word_strongs IS NOT NULL AND word_strongs <> ''")
+    held: Set[str] = {row[0].strip() for row in cur.fetchall()}
+    cur.execute("""
+        SELECT word_id, word_hebrew FROM yy_word
+        WHERE (word_strongs IS NULL OR word_strongs = '')
+          AND word_hebrew IS NOT NULL AND word_hebrew <> ''
+        ORDER BY word_id
+    """)
+    words = cur.fetchall()
+
+    stats: Dict[str, object] = {'words': len(words), 'lemma': 0, 'skeleton': 0, 'prefix': 0,
+                                'ambiguous': 0, 'taken': 0, 'unmatched': 0}
+    ambiguous = []
+    rows = []
+    for word_id, hebrew in words:
+        how, numbers = matcher.candidates(hebrew)
+        if how is None:
+            stats['unmatched'] += 1
+        elif len(numbers) > 1:
+            stats['ambiguous'] += 1
+            ambiguous.append((word_id, hebrew, numbers))
+        elif numbers[0] in held:
+            stats['taken'] += 1
+        else:
+            stats[how] += 1
+            held.add(numbers[0])
+            rows.append((word_id, numbers[0]))
+
+    stats['updated'] = 0 if dry_run else update_rows(cur, 'yy_word', 'word_id', ['word_strongs'], rows)
+    if dry_run:
+        conn.rollback()
+    else:
+        conn.commit()
+    cur.close()
+    stats['ambiguous_words'] = ambiguous
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link yy_word Hebrew to Strong's numbers by consonantal skeleton")
+    parser.add_argument('--strip-prefixes', action='store_true',
+                        help="Also try the skeleton without prefixed particles (ve-, ha-, be-, ke-, le-, mi-, she-)")
+    parser.add_argument('--dry-run', action='store_true', help="Match and report without updating yy_word")
+    parser.add_argument('--show-ambiguous', type=int, default=20, metavar='N',
+                        help="Ambiguous words to list (default: 20)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    index = strongs_index.open_index()
+    matcher = StrongsMatcher(index, strip_prefixes=args.strip_prefixes)
+    index.close()
+
+    conn = db.connect()
+    try:
+        stats = link(conn, matcher, dry_run=args.dry_run)
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Unlinked words:        {stats['words']}")
+    print(f"Matched by lemma:      {stats['lemma']}")
+    print(f"Matched by skeleton:   {stats['skeleton']}")
+    print(f"Matched w/o prefix:    {stats['prefix']}")
+    print(f"Ambiguous:             {stats['ambiguous']}")
+    print(f"Number already held:   {stats['taken']}")
+    print(f"Unmatched:             {stats['unmatched']}")
+    print(f"Updated:               {stats['updated']}{' (dry run)' if args.dry_run else ''}")
+    print(f"Elapsed:               {time.perf_counter() - t0:.2f}s")
+    for word_id, hebrew, numbers in stats['ambiguous_words'][:args.show_ambiguous]:
+        print(f"  ambiguous: word {word_id} {hebrew} -> {', '.join(numbers)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,59 +1,24 @@
 """
 Match unlinked yy_word_spelling entries to Strong's Hebrew numbers.
-Reads the OpenScriptures Strong's Hebrew dictionary JSON and attempts to match
-transliterated Hebrew words from the yy_word_spelling table.
+Looks transliterated Hebrew words from the yy_word_spelling table up in the
+compiled Strong's index (strongs_index, built from the OpenScriptures Strong's
+Hebrew dictionary and rebuilt automatically when it changes).
+yy_word rows that carry Hebrew are linked by consonantal skeleton instead,
+see link_words_to_strongs.py.
 """
-import json
 import re
-import unicodedata
 
-# Load Strong's dictionary
-with open(r"C:\Users\Joe\Work\dev\yada\translations\strongs-hebrew.json", "r", encoding="utf-8") as f:
-    content = f.read()
-    # Strip the JS variable assignment prefix
-    json_start = content.index("{", content.index("="))
-    json_end = content.rindex("}") + 1
-    data = json.loads(content[json_start:json_end])
+import strongs_index
+from strongs_index import normalize_xlit as normalize
+
+# Compiled Strong's dictionary: normalized transliteration (xlit or pron) -> list of (strongs_num, entry)
+index = strongs_index.open_index()
+strongs_lookup = index.terms(strongs_index.TRANSLIT)
 
 # Load unlinked words
 with open(r"C:\Users\Joe\Work\dev\yada\translations\unlinked_words.txt", "r", encoding="utf-8") as f:
     unlinked = [line.strip() for line in f if line.strip()]
 
-def normalize(text):
-    """Normalize transliteration for matching."""
-    # Remove diacritics
-    text = unicodedata.normalize('NFD', text)
-    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
-    # Lowercase
-    text = text.lower()
-    # Normalize apostrophes and special chars
-    text = text.replace('\u2019', "'").replace('\u2018', "'").replace('\u02bc', "'")
-    text = text.replace('\u02be', "'").replace('\u02bf', "'")
-    # Remove hyphens
-    text = text.replace('-', '')
-    return text
-
-# Build lookup from Strong's: normalized transliteration -> list of (strongs_num, entry)
-strongs_lookup = {}
-strongs_by_lemma = {}
-for key, entry in data.items():
-    num = key  # e.g. "H1"
-    xlit = entry.get("xlit", "")
-    lemma = entry.get("lemma", "")
-    pron = entry.get("pron", "")
-
-    for variant in [xlit, pron]:
-        if variant:
-            norm = normalize(variant)
-            if norm not in strongs_lookup:
-                strongs_lookup[norm] = []
-            strongs_lookup[norm].append((key, entry))
-
-    if lemma:
-        if lemma not in strongs_by_lemma:
-            strongs_by_lemma[lemma] = []
-        strongs_by_lemma[lemma].append((key, entry))
-
 # YY-specific transliteration mappings
 # The YY books use a specific transliteration scheme that differs from Strong's xlit
 # Common patterns: 'ow' for long-o, 'uw' for long-u, 'yah' suffix, etc.
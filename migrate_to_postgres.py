@@ -1,16 +1,19 @@
 """
 Migrate Yada Translations app from MySQL to PostgreSQL.
 - Alters existing PG tables (yy_series, yy_volume, translation) to use _key naming
-- Creates new PG tables (yah_scroll, yah_chapter, yah_verse, yy_chapter, yy_user, yy_user_preference, yy_translation)
+- Creates new PG tables (yah_scroll, yah_chapter, yah_verse, yy_chapter, yy_user, yy_user_preference, yy_translation,
+  yy_translation_verse)
 - Creates revision tables and trigger functions
 - Exports MySQL data and imports into PostgreSQL
 """
 
 import pymysql
-import psycopg2
+
+import db
+import translation_loader
+import verify_migration
 
 MYSQL_CONFIG = dict(host='localhost', port=3307, user='yada', password='yada_pass', database='yada_translations')
-PG_CONFIG = dict(host='localhost', port=5433, user='postgres', password='yada_password', database='yada')
 
 
 def get_mysql():
@@ -18,9 +21,7 @@ def get_mysql():
 
 
 def get_pg():
-    conn = psycopg2.connect(**PG_CONFIG)
-    conn.autocommit = False
-    return conn
+    return db.connect()
 
 
 def step_alter_existing_pg_tables(pg):
@@ -184,6 +185,8 @@ def step_create_new_tables(pg):
     cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_translation_series ON yy_translation(yy_series_key)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_translation_volume ON yy_translation(yy_volume_key)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_translation_yy_chapter ON yy_translation(yy_chapter_key)")
+    # Verse coverage of cite ranges, read by display-translations.php and build_bundles.py
+    translation_loader.ensure_coverage_table(cur)
 
     pg.commit()
     print("  New tables created.")
@@ -536,25 +539,22 @@ $$ LANGUAGE plpgsql;
 
 
 def step_verify(pg):
-    """Verify row counts after migration."""
+    """Verify migrated content against MySQL by parallel key-range hashes, and the merged tables by key set."""
     cur = pg.cursor()
     print("\nVerification:")
-    checks = [
-        ('yah_scroll', 26), ('yah_chapter', 567), ('yah_verse', 15147),
-        ('yy_series', 8), ('yy_volume', 34), ('yy_chapter', 371),
-        ('yy_user', 2), ('yy_translation', 4),
-    ]
-    all_ok = True
-    for table, expected_min in checks:
-        cur.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cur.fetchone()[0]
-        status = 'OK' if count >= expected_min else 'MISMATCH'
-        if status == 'MISMATCH':
-            all_ok = False
-        print(f"  {table}: {count} rows (expected >={expected_min}) [{status}]")
+    results = verify_migration.verify(
+        verify_migration.Side('mysql', get_mysql, '%s'),
+        verify_migration.Side('postgres', get_pg, '%s'),
+    )
+    all_ok = verify_migration.print_report(results, 'mysql', 'postgres')
+    key_results = verify_migration.verify_keys(
+        verify_migration.Side('mysql', get_mysql, '%s'),
+        verify_migration.Side('postgres', get_pg, '%s'),
+    )
+    all_ok = verify_migration.print_key_report(key_results, 'mysql', 'postgres') and all_ok
 
     # Verify trigger works
-    cur.execute("SET app.current_user_key = '0'")
+    db.set_user_key(pg, 0)
     cur.execute("UPDATE yah_scroll SET yah_scroll_sort = yah_scroll_sort WHERE yah_scroll_key = 1")
     cur.execute("SELECT COUNT(*) FROM rev_yah_scroll WHERE yah_scroll_key = 1")
     rev_count = cur.fetchone()[0]
@@ -9,17 +9,20 @@ Usage:
     python parse_word_translations.py
     python parse_word_translations.py --directory "C:\\path\\to\\docs"
     python parse_word_translations.py --dry-run --verbose
+    python parse_word_translations.py --pipeline --workers 4 --writers 4
+    python parse_word_translations.py --watch --output yy_translation
 """
 
+import asyncio
 import os
 import re
 import sys
 import argparse
 import logging
 import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
-from enum import Enum
+from typing import Callable, List, Dict, Optional, Sequence, Tuple, Union
 
 try:
     from docx import Document
@@ -31,17 +34,24 @@ except ImportError:
 
 try:
     import psycopg2
-    from psycopg2 import sql
-    from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 except ImportError:
     print("ERROR: psycopg2 not installed. Run: pip install -r requirements.txt")
     sys.exit(1)
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    print("ERROR: python-dotenv not installed. Run: pip install -r requirements.txt")
-    sys.exit(1)
+import db
+import pdf_pages
+from document_structure import DocumentStructure
+from document_view import DocumentView
+from extraction_cache import Boundaries, CachedExtraction, ExtractionCache, paragraph_hashes, plan_resume, styles_hash
+from translation_detectors import (
+    QUOTE, CITE_TERMINATED, BOLD_CITE, ExtractionState, Detector, QuoteDetector, CiteTerminatedDetector,
+    BoldCiteDetector, ChapterDetector, run_detectors, replace_unicode_chars, wrap_html, run_format,
+)
+from import_metrics import Metrics, NULL_METRICS
+from import_profiler import DocumentProfiler, NULL_PROFILER
+import translation_sync
+from pg_copy import copy_rows
+from translation_loader import YyTranslationLoader
 
 try:
     import win32com.client  # noqa: F401 - verified available for subprocess COM
@@ -50,17 +60,71 @@ except ImportError:
     HAS_WIN32COM = False
 
 # Constants
-LEFT_QUOTE = "\u201C"  # "
-RIGHT_QUOTE = "\u201D"  # "
 DEFAULT_DIRECTORY = r"C:\users\joe\work\dev\yada\docs"
+OUTPUT_TRANSLATION = 'translation'        # legacy flat table with text cite columns
+OUTPUT_YY_TRANSLATION = 'yy_translation'  # keyed app table, cites resolved in memory
+
+# translation columns in Translation.FIELDS order
+TRANSLATION_COLUMNS = ['translation_book', 'translation_page', 'translation_text_word',
+                       'translation_cite', 'translation_cite_hebrew', 'translation_cite_common',
+                       'translation_cite_chapter', 'translation_cite_verse',
+                       'translation_cite_verse_end', 'translation_cite_note']
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
 
 
-class ExtractionState(Enum):
-    """State machine states for translation extraction."""
-    SEARCHING = 1
-    EXTRACTING = 2
-    FOUND_QUOTE = 3
-    COMPLETE = 4
+class Translation:
+    """
+    One extracted translation.
+
+    Slotted to keep whole-series runs small; book and cite strings are interned
+    so every translation from a volume (or citing the same scroll) shares them.
+    para_idx is the 0-based paragraph the translation starts in, used to look up
+    its page and cleared once the page is known.
+    """
+
+    __slots__ = ('book', 'page', 'text_word', 'cite', 'cite_hebrew', 'cite_common',
+                 'cite_chapter', 'cite_verse', 'cite_verse_end', 'cite_note',
+                 'para_idx', 'chapter_num')
+
+    # Columns in the order save_translation inserts them
+    FIELDS = ('book', 'page', 'text_word', 'cite', 'cite_hebrew', 'cite_common',
+              'cite_chapter', 'cite_verse', 'cite_verse_end', 'cite_note')
+
+    def __init__(self, book, text_word, cite, cite_hebrew=None, cite_common=None,
+                 cite_chapter=None, cite_verse=None, cite_verse_end=None, cite_note=None,
+                 para_idx=None, page=None):
+        self.book = _intern(book)
+        self.page = page
+        self.text_word = text_word
+        self.cite = _intern(cite)
+        self.cite_hebrew = _intern(cite_hebrew)
+        self.cite_common = _intern(cite_common)
+        self.cite_chapter = cite_chapter
+        self.cite_verse = cite_verse
+        self.cite_verse_end = cite_verse_end
+        self.cite_note = cite_note
+        self.para_idx = para_idx
+        self.chapter_num = None
+
+    def as_row(self) -> tuple:
+        """Values in FIELDS order."""
+        return (self.book, self.page, self.text_word, self.cite, self.cite_hebrew, self.cite_common,
+                self.cite_chapter, self.cite_verse, self.cite_verse_end, self.cite_note)
+
+    def to_dict(self) -> Dict[str, any]:
+        """Dict form (dry-run output, JSON dumps); private keys only while set."""
+        d = dict(zip(self.FIELDS, self.as_row()))
+        if self.para_idx is not None:
+            d['_para_idx'] = self.para_idx
+        if self.chapter_num is not None:
+            d['_chapter_num'] = self.chapter_num
+        return d
+
+    def __repr__(self):
+        return f"Translation({self.book!r}, {self.cite!r} {self.cite_chapter}:{self.cite_verse}, page={self.page})"
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -75,93 +139,37 @@ def setup_logging(verbose: bool = False) -> None:
 
 def get_db_connection():
     """
-    Create PostgreSQL database connection using environment variables.
+    Connect to the yada database via the shared db module, creating the database if missing.
 
-    Environment Variables:
-        POSTGRES_HOST (default: localhost)
-        POSTGRES_PORT (default: 5432)
-        POSTGRES_USER (default: postgres)
-        POSTGRES_PASSWORD (required)
-        POSTGRES_DB (default: yada)
+    Environment Variables (or .env, see db.py for defaults):
+        POSTGRES_HOST, POSTGRES_PORT, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_DB, YY_USER_KEY
 
     Returns:
         psycopg2 connection object
 
     Raises:
-        SystemExit if POSTGRES_PASSWORD not set or connection fails
+        SystemExit if the connection fails
     """
-    load_dotenv()
-
-    host = os.getenv('POSTGRES_HOST', 'localhost')
-    port = os.getenv('POSTGRES_PORT', '5432')
-    user = os.getenv('POSTGRES_USER', 'postgres')
-    password = os.getenv('POSTGRES_PASSWORD')
-
-    if not password:
-        logging.error("POSTGRES_PASSWORD environment variable not set")
-        logging.error("Set it with: set POSTGRES_PASSWORD=your_password (Windows CMD)")
-        logging.error("            $env:POSTGRES_PASSWORD='your_password' (Windows PowerShell)")
-        sys.exit(1)
-
     try:
-        # First connect to postgres database to check if yada database exists
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database='postgres'
-        )
-        logging.info(f"Connected to PostgreSQL at {host}:{port}")
+        conn = db.ensure_database()
+        logging.info(f"Connected to PostgreSQL at {db.describe()}")
         return conn
     except psycopg2.Error as e:
         logging.error(f"Failed to connect to PostgreSQL: {e}")
         sys.exit(1)
 
 
-def init_database(conn) -> None:
+def init_database(conn):
     """
-    Create database 'yada' if it doesn't exist, then create translation table.
+    Create the translation, cite, yy_series and yy_volume tables if they don't exist.
 
     Args:
-        conn: PostgreSQL connection object (connected to postgres database)
-    """
-    db_name = os.getenv('POSTGRES_DB', 'yada')
+        conn: PostgreSQL connection object (connected to the yada database)
 
+    Returns:
+        The same connection
+    """
     try:
-        # Set connection to autocommit mode for database creation
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        cursor = conn.cursor()
-
-        # Check if database exists
-        cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
-        exists = cursor.fetchone()
-
-        if not exists:
-            cursor.execute(sql.SQL("CREATE DATABASE {}").format(
-                sql.Identifier(db_name)
-            ))
-            logging.info(f"Created database '{db_name}'")
-        else:
-            logging.info(f"Database '{db_name}' already exists")
-
-        cursor.close()
-        conn.close()
-
-        # Reconnect to the yada database
-        host = os.getenv('POSTGRES_HOST', 'localhost')
-        port = os.getenv('POSTGRES_PORT', '5432')
-        user = os.getenv('POSTGRES_USER', 'postgres')
-        password = os.getenv('POSTGRES_PASSWORD')
-
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database=db_name
-        )
-
         cursor = conn.cursor()
 
         # Create translation table if it doesn't exist
@@ -380,7 +388,7 @@ WScript.StdErr.WriteLine "Done"
 
 
 
-def build_page_map_from_xml(doc_path: Path) -> Dict[int, int]:
+def build_page_map_from_xml(doc_path: Path, doc=None) -> Dict[int, int]:
     """
     Build a paragraph-to-page map from XML page breaks and section restarts.
 
@@ -392,11 +400,13 @@ def build_page_map_from_xml(doc_path: Path) -> Dict[int, int]:
 
     Args:
         doc_path: Path to .docx file
+        doc: Optional pre-opened Document object (avoids re-opening the file)
 
     Returns:
         Dict mapping python-docx 0-based paragraph index -> estimated page number
     """
-    doc = Document(str(doc_path))
+    if doc is None:
+        doc = Document(str(doc_path))
     nsmap = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
 
     body = doc.element.body
@@ -405,6 +415,7 @@ def build_page_map_from_xml(doc_path: Path) -> Dict[int, int]:
     direct_paras = body.findall('w:p', nsmap)
     all_paras = body.findall('.//w:p', nsmap)
     top_level_ids = set(id(p) for p in direct_paras)
+    para_index = {id(p): i for i, p in enumerate(all_paras)}
 
     # Find section page number restarts (keyed by absolute para index)
     section_starts = {}
@@ -418,11 +429,9 @@ def build_page_map_from_xml(doc_path: Path) -> Dict[int, int]:
                     # Last sectPr in body - applies to last paragraph
                     pass
                 elif parent.tag == f'{{{nsmap["w"]}}}pPr':
-                    p_elem = parent.getparent()
-                    for pi, pe in enumerate(all_paras):
-                        if pe is p_elem:
-                            section_starts[pi] = int(start_val)
-                            break
+                    pi = para_index.get(id(parent.getparent()))
+                    if pi is not None:
+                        section_starts[pi] = int(start_val)
 
     # Build page map tracking ALL paragraphs but only recording top-level ones
     page = 1
@@ -448,15 +457,22 @@ def build_page_map_from_xml(doc_path: Path) -> Dict[int, int]:
     return para_to_page
 
 
-def get_all_page_numbers(doc_para_map: Dict[str, List[int]]) -> Dict[str, Dict[int, int]]:
+def get_all_page_numbers(doc_para_map: Dict[str, List[int]], metrics: Metrics = NULL_METRICS,
+                         profiler: DocumentProfiler = NULL_PROFILER,
+                         pdfs: Optional[Dict[str, Path]] = None) -> Dict[str, Dict[int, int]]:
     """
-    Get page numbers for all documents. Tries COM per document, falls back to XML.
+    Get page numbers for all documents. Tries the published PDF, then COM per document, falls back to XML.
 
-    Uses text-based Find in VBScript to locate paragraphs, avoiding mismatches
+    Documents with a PDF are matched against its text layer first, in parallel
+    (pdf_pages); only paragraphs not found there go to COM / XML. COM uses
+    text-based Find in VBScript to locate paragraphs, avoiding mismatches
     between python-docx and COM paragraph indexing.
 
     Args:
         doc_para_map: Dict mapping absolute doc path -> list of 0-based paragraph indices
+        metrics: Timings per document for PDF, COM and XML page lookups
+        profiler: Profiles build_page_map_from_xml per document when enabled
+        pdfs: Dict mapping absolute doc path -> published PDF (pdf_pages.volume_pdfs)
 
     Returns:
         Dict mapping doc path -> {para_index: page_number}
@@ -472,11 +488,23 @@ def get_all_page_numbers(doc_para_map: Dict[str, List[int]]) -> Dict[str, Dict[i
     com_success = 0
     xml_fallback = 0
 
+    pdf_page_numbers = {}
+    if pdfs:
+        jobs = {doc_path: (pdfs[doc_path], indices) for doc_path, indices in doc_para_map.items() if doc_path in pdfs}
+        with metrics.timer('page_pdf'):
+            pdf_page_numbers = pdf_pages.resolve_documents(jobs)
+
     # Sort by file size (smaller first - they work better with COM)
     sorted_docs = sorted(doc_para_map.items(), key=lambda x: Path(x[0]).stat().st_size)
 
     for doc_path, indices in sorted_docs:
         doc_name = Path(doc_path).name
+        pdf_map = pdf_page_numbers.get(doc_path)
+        if pdf_map:
+            all_page_numbers[doc_path] = pdf_map
+            indices = [idx for idx in indices if idx not in pdf_map]
+            if not indices:
+                continue
         file_size_mb = Path(doc_path).stat().st_size / (1024 * 1024)
 
         # Timeout based on file size: 60s base + 30s per MB
@@ -485,20 +513,21 @@ def get_all_page_numbers(doc_para_map: Dict[str, List[int]]) -> Dict[str, Dict[i
         logging.info(f"  {doc_name} ({file_size_mb:.1f}MB, {len(indices)} paras, timeout {timeout}s)")
 
         # Get paragraph text for text-based Find (avoids index mapping issues)
-        doc = Document(str(doc_path))
+        view = DocumentView(Document(str(doc_path)))
         para_texts = {}
         for idx in indices:
-            if idx < len(doc.paragraphs):
-                raw_text = doc.paragraphs[idx].text.strip()
+            if idx < len(view):
+                raw_text = view.text(idx).strip()
                 # Use first 150 chars as search text (enough for uniqueness)
                 snippet = raw_text[:150] if len(raw_text) > 150 else raw_text
                 if snippet:
                     para_texts[idx] = snippet
 
-        page_map = get_page_numbers_for_doc_com(doc_path, para_texts, timeout=timeout)
+        with metrics.timer('page_com', document=doc_name):
+            page_map = get_page_numbers_for_doc_com(doc_path, para_texts, timeout=timeout)
 
         if page_map:
-            all_page_numbers[doc_path] = page_map
+            all_page_numbers[doc_path] = {**page_map, **(pdf_map or {})}
             com_success += 1
             logging.info(f"    COM: {len(page_map)}/{len(indices)} page numbers")
         else:
@@ -509,7 +538,8 @@ def get_all_page_numbers(doc_para_map: Dict[str, List[int]]) -> Dict[str, Dict[i
                 clean_path = os.path.join(clean_dir, "clean_copy.docx")
                 clean_doc = Document(str(doc_path))
                 clean_doc.save(clean_path)
-                page_map = get_page_numbers_for_doc_com(clean_path, para_texts, timeout=timeout)
+                with metrics.timer('page_com', document=doc_name):
+                    page_map = get_page_numbers_for_doc_com(clean_path, para_texts, timeout=timeout)
                 try:
                     os.unlink(clean_path)
                     os.rmdir(clean_dir)
@@ -520,104 +550,59 @@ def get_all_page_numbers(doc_para_map: Dict[str, List[int]]) -> Dict[str, Dict[i
                 page_map = {}
 
             if page_map:
-                all_page_numbers[doc_path] = page_map
+                all_page_numbers[doc_path] = {**page_map, **(pdf_map or {})}
                 com_success += 1
                 logging.info(f"    COM (clean copy): {len(page_map)}/{len(indices)} page numbers")
             else:
                 # Fall back to XML-based page mapping using lastRenderedPageBreak + pgNumType restarts
                 logging.info(f"    COM failed on clean copy too, using XML fallback")
                 try:
-                    full_page_map = build_page_map_from_xml(Path(doc_path))
+                    with metrics.timer('page_xml', document=doc_name), profiler.phase(doc_name, 'page_xml'):
+                        full_page_map = build_page_map_from_xml(Path(doc_path))
                     page_map = {idx: full_page_map.get(idx, 1) for idx in indices}
-                    all_page_numbers[doc_path] = page_map
+                    all_page_numbers[doc_path] = {**page_map, **(pdf_map or {})}
                     xml_fallback += 1
                     logging.info(f"    XML: {len(page_map)} page numbers (from lastRenderedPageBreak + pgNumType)")
                 except Exception as e:
                     logging.warning(f"    XML fallback also failed: {e}")
 
-    logging.info(f"Page numbers: {com_success} docs via COM, {xml_fallback} docs via XML fallback")
+    metrics.count('documents_paged_pdf', len(pdf_page_numbers))
+    metrics.count('documents_paged_com', com_success)
+    metrics.count('documents_paged_xml', xml_fallback)
+    logging.info(f"Page numbers: {len(pdf_page_numbers)} docs via PDF, {com_success} docs via COM, "
+                 f"{xml_fallback} docs via XML fallback")
     return all_page_numbers
 
 
+def assign_page_numbers(doc_path: Path, translations: List[Translation], metrics: Metrics = NULL_METRICS,
+                        pdfs: Optional[Dict[str, Path]] = None,
+                        profiler: DocumentProfiler = NULL_PROFILER) -> None:
+    """Look up the pages of one document's translations (get_all_page_numbers) and set Translation.page."""
+    indices = list(set(t.para_idx for t in translations))
+    if not indices:
+        return
+    abs_path = str(doc_path.absolute())
+    page_map = get_all_page_numbers({abs_path: indices}, metrics, profiler, pdfs=pdfs).get(abs_path, {})
+    for t in translations:
+        t.page = page_map.get(t.para_idx)
 
-def replace_unicode_chars(text: str) -> str:
-    """
-    Replace private use area Unicode characters with their intended letters.
 
-    Args:
-        text: Input text
 
-    Returns:
-        Text with replacements
-    """
-    # Replace private use area characters
-    text = text.replace('\uf065', 'e')
-    text = text.replace('\uf066', 'f')
-    text = text.replace('\uf069', 'i')
-    return text
-
-
-def format_run_as_html(run: Run) -> str:
+def format_run_as_html(run: Run, text: Optional[str] = None) -> str:
     """
     Convert a python-docx Run object to HTML with formatting and font detection.
 
     Args:
         run: python-docx Run object
+        text: The run's text if already read (DocumentView.run_texts)
 
     Returns:
         HTML-formatted string with font spans and format tags
     """
-    text = run.text
-
-    # Replace special Unicode characters first
-    text = replace_unicode_chars(text)
-
-    # Check for non-default font
-    font_name = None
-    try:
-        if run.font and run.font.name and run.font.name != 'Times New Roman':
-            font_name = run.font.name
-    except:
-        pass
-
-    # Apply font span if non-default
-    if font_name:
-        text = f'<span class="{font_name}">{text}</span>'
-
-    # Apply formatting in order: underline -> italic -> bold (innermost to outermost)
-    if run.underline:
-        text = f"<u>{text}</u>"
-    if run.italic:
-        text = f"<i>{text}</i>"
-    if run.bold:
-        text = f"<b>{text}</b>"
-
-    return text
-
-
-def extract_cite(text_after_quote: str) -> Optional[str]:
-    """
-    Extract citation from text following the closing quote.
-
-    Args:
-        text_after_quote: Text immediately after the right quote (may span multiple runs)
-
-    Returns:
-        Citation text without parentheses, or None if no match
-    """
-    # Replace special Unicode characters
-    text_after_quote = replace_unicode_chars(text_after_quote)
-
-    # Pattern: optional whitespace/nbsp, then parentheses with content
-    # More flexible pattern to handle various spacing
-    match = re.match(r'^[\s\u00a0]*\(([^)]+)\)', text_after_quote)
-    if match:
-        cite = match.group(1).strip()
-        logging.debug(f"Extracted cite: {cite}")
-        return cite
-    return None
+    return wrap_html(replace_unicode_chars(run.text if text is None else text), run_format(run))
 
 
+@lru_cache(maxsize=65536)
 def parse_cite(cite_text: Optional[str]) -> tuple:
     """
     Split a citation into name, chapter, verse, verse_end, and note components.
@@ -630,6 +615,8 @@ def parse_cite(cite_text: Optional[str]) -> tuple:
 
     Also handles bare "6:18" -> (None, 6, 18, None, None)
 
+    Results are memoized: the same cite recurs across a volume and across --watch imports.
+
     Args:
         cite_text: Full citation text
 
@@ -735,519 +722,228 @@ def consolidate_html(html: str) -> str:
 
 
 
-def extract_translations_from_doc(doc_path: Path, doc=None, detect_chapters=False) -> List[Dict[str, any]]:
+class _RunsPerParagraph(Detector):
+    """Observes runs_per_paragraph from the XML, without building runs."""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    def begin(self, ctx):
+        self.metrics.observe('runs_per_paragraph', ctx.view.run_count(ctx.index))
+        return False
+
+    def idle(self):
+        return True
+
+
+def _extract_cached(cache: ExtractionCache, doc_path: Path, view: DocumentView, pipeline, boundaries: Boundaries,
+                    quote: QuoteDetector, translations: List[Translation], completed_at: List[int],
+                    structure: Optional[DocumentStructure], metrics: Metrics) -> Tuple[int, bool]:
+    """
+    Run the detectors over only the changed stretch of view and splice in the cached rest.
+
+    Fills translations / completed_at / structure for the whole document and saves the new cache.
+
+    Returns:
+        (skipped paragraphs, document ends inside a quote)
+    """
+    detect_chapters = structure is not None
+    hashes = paragraph_hashes(view)
+    styles = styles_hash(view.document)
+    previous = cache.load(doc_path, styles, detect_chapters)
+    plan = plan_resume(previous, hashes) if previous else None
+    start = plan.start if plan else 0
+
+    skipped = 0
+    boundaries.plan = plan
+    if plan and plan.converged(start):
+        boundaries.stopped_at = start
+    else:
+        skipped = run_detectors(view, pipeline, start=start, on_boundary=boundaries.boundary)
+    stop = boundaries.stopped_at
+    end = stop if stop is not None else len(view)
+    unclosed = quote.state == ExtractionState.EXTRACTING if stop is None else previous.unclosed
+
+    walked_chapters = structure.chapters if detect_chapters else []
+    walked_sections = structure.section_paras[1:] if detect_chapters else []
+    checkpoints = [0] + boundaries.checkpoints
+    entries = list(zip(completed_at, translations))
+    if previous:
+        shift = plan.shift
+        tail_from = stop - shift if stop is not None else len(previous.hashes) + 1
+        for at, t in previous.translations:
+            if at >= tail_from and t.para_idx is not None:
+                t.para_idx += shift
+        entries = ([e for e in previous.translations if e[0] < start] + entries
+                   + [(at + shift, t) for at, t in previous.translations if at >= tail_from])
+        walked_chapters = ([c for c in previous.chapters if c[0] < start] + walked_chapters
+                           + [(p + shift, n) for p, n in previous.chapters if p >= tail_from])
+        walked_sections = ([v for v in previous.sections if v <= start] + walked_sections
+                           + [v + shift for v in previous.sections if v > tail_from])
+        checkpoints = ([c for c in previous.checkpoints if c <= start] + boundaries.checkpoints
+                       + [c + shift for c in previous.checkpoints if c > tail_from])
+        if end > start:
+            logging.info("%s: re-extracted paragraphs %d-%d of %d (rest from cache)",
+                         doc_path.name, start, end, len(view))
+        else:
+            logging.info("%s: unchanged, %d paragraphs from cache", doc_path.name, len(view))
+    metrics.count('paragraphs_walked', end - start)
+
+    translations[:] = [t for _, t in entries]
+    completed_at[:] = [at for at, _ in entries]
+    if detect_chapters:
+        structure.__init__()
+        for para_idx, number in walked_chapters:
+            structure.add_chapter(para_idx, number)
+        for para_idx in walked_sections:
+            structure.add_section(para_idx)
+
+    current = CachedExtraction(styles, detect_chapters)
+    current.hashes = hashes
+    current.checkpoints = checkpoints
+    current.translations = entries
+    current.chapters = walked_chapters
+    current.sections = walked_sections
+    current.unclosed = unclosed
+    cache.save(doc_path, current)
+    return skipped, unclosed
+
+
+EXTRACTED_MESSAGES = {
+    QUOTE: "Extracted translation #%d from %s",
+    CITE_TERMINATED: "Extracted cite-terminated translation #%d from %s",
+    BOLD_CITE: "Extracted bold-cite translation #%d from %s",
+}
+
+
+def extract_translations_from_doc(doc_path: Path, doc=None, detect_chapters=False,
+                                  metrics: Metrics = NULL_METRICS, detectors: Sequence[Callable] = (),
+                                  cache: Optional[ExtractionCache] = None
+                                  ) -> Union[List[Translation], Tuple[List[Translation], DocumentStructure]]:
     """
     Extract all translations from a Word document.
 
+    The document is traversed once (translation_detectors.run_detectors); the
+    quote, cite-terminated and bold-cite detectors and, with detect_chapters, the
+    chapter detector all consume the same paragraph / run events.
+
     Args:
         doc_path: Path to .docx file
-        doc: Optional pre-opened Document object (avoids re-opening the file)
-        detect_chapters: If True, also detect yy_chapter_# boundaries; returned
-            translations get '_chapter_num' key, and result includes '_chapters'
-            metadata entry as last element.
+        doc: Optional pre-opened Document or DocumentView (avoids re-opening the file)
+        detect_chapters: If True, also build the document's DocumentStructure
+            (yy_chapter_# chapters, sections, XML page map) and set chapter_num
+            on each translation.
+        metrics: Receives runs-per-paragraph, HTML size and consolidate timings
+        detectors: Extra detector factories, each called with the emit callback
+            (kind, html_parts, raw_cite, para_idx) -> bool and run after the built-in ones
+        cache: Re-extract only the paragraphs around what changed since the document's
+            last extraction (see extraction_cache); ignored when extra detectors are given
 
     Returns:
-        List of dictionaries with keys: book, page, text_word, cite, cite_chapter, cite_verse.
-        If detect_chapters=True, the last element is a dict with key '_chapters'
-        containing a list of (para_idx, chapter_number) tuples.
+        List of Translation records (page unset, para_idx set).
+        If detect_chapters=True, a (translations, structure) tuple.
     """
     translations = []
-    chapter_boundaries = []  # populated when detect_chapters=True
+    structure = DocumentStructure() if detect_chapters else None
+
+    consolidate = consolidate_html
+    if metrics.enabled:
+        def consolidate(html):
+            with metrics.timer('consolidate'):
+                return consolidate_html(html)
 
     try:
         if doc is None:
             doc = Document(str(doc_path))
+        view = DocumentView.of(doc)
         book_name = doc_path.stem  # Filename without extension
 
-        logging.info(f"Processing document: {book_name}")
-
-        # State machine variables
-        state = ExtractionState.SEARCHING
-        accumulated_html = []
-        start_paragraph_index = 0
-        page_number = None
-        cite_search_text = ""  # Accumulate text after right quote for cite search
-
-        # Bold-cite path: captures bold paragraphs ending with citation (no curly quotes)
-        bold_cite_html = []
-        bold_cite_start_para = None
-
-        for para_idx, paragraph in enumerate(doc.paragraphs):
-            logging.debug(f"Paragraph {para_idx}: {paragraph.text[:50]}...")
-            para_extracted = False  # Track if this paragraph was already handled
-
-            # Detect chapter boundaries during the same iteration
-            if detect_chapters:
-                style = paragraph.style.name if paragraph.style else ''
-                if style in ('yy_chapter_#', 'Heading 1'):
-                    text = paragraph.text.strip()
-                    if text:
-                        first_line = text.split('\n')[0].strip()
-                        if first_line.isdigit():
-                            chapter_boundaries.append((para_idx, int(first_line)))
-
-            # Track where this paragraph's HTML contributions start
-            para_html_start = len(accumulated_html) if state == ExtractionState.EXTRACTING else None
-            # Character position where extraction starts in this paragraph (0 for continuation paras)
-            para_extract_start = 0 if state == ExtractionState.EXTRACTING else None
-
-            for run_idx, run in enumerate(paragraph.runs):
-                text = run.text
-
-                # If we found the right quote, accumulate remaining text for cite search
-                if state == ExtractionState.FOUND_QUOTE:
-                    cite_search_text += text
-
-                if state == ExtractionState.SEARCHING:
-                    # Look for bold left quote
-                    if LEFT_QUOTE in text and run.bold:
-                        logging.debug(f"Found LEFT_QUOTE at paragraph {para_idx}")
-                        state = ExtractionState.EXTRACTING
-                        para_html_start = len(accumulated_html)
-                        # Calculate where extraction starts in paragraph text (after LEFT_QUOTE)
-                        char_offset = sum(len(paragraph.runs[i].text) for i in range(run_idx))
-                        para_extract_start = char_offset + text.index(LEFT_QUOTE) + 1
-                        start_paragraph_index = para_idx
-
-                        # Clear bold-cite buffer when entering quote-delimited extraction
-                        bold_cite_html = []
-                        bold_cite_start_para = None
-
-                        # Page number will be filled in by COM automation after extraction
-                        page_number = None
-
-                        # Split text at left quote and start accumulating
-                        split_idx = text.index(LEFT_QUOTE)
-                        text_after_quote = text[split_idx + 1:]
-
-                        # Check if right quote is in the same run
-                        if RIGHT_QUOTE in text_after_quote and run.bold:
-                            # Complete translation in single run
-                            end_idx = text_after_quote.index(RIGHT_QUOTE)
-                            translation_text = text_after_quote[:end_idx]
-                            cite_search_text = text_after_quote[end_idx + 1:]
-
-                            # Format the extracted text with font awareness
-                            formatted = replace_unicode_chars(translation_text)
-
-                            # Check font
-                            font_name = None
-                            try:
-                                if run.font and run.font.name and run.font.name != 'Times New Roman':
-                                    font_name = run.font.name
-                            except:
-                                pass
-
-                            if font_name:
-                                formatted = f'<span class="{font_name}">{formatted}</span>'
-
-                            if run.underline:
-                                formatted = f"<u>{formatted}</u>"
-                            if run.italic:
-                                formatted = f"<i>{formatted}</i>"
-                            if run.bold:
-                                formatted = f"<b>{formatted}</b>"
-
-                            accumulated_html.append(formatted)
-                            state = ExtractionState.FOUND_QUOTE
-                        else:
-                            # Start accumulating
-                            formatted = replace_unicode_chars(text_after_quote)
-
-                            # Check font
-                            font_name = None
-                            try:
-                                if run.font and run.font.name and run.font.name != 'Times New Roman':
-                                    font_name = run.font.name
-                            except:
-                                pass
-
-                            if font_name:
-                                formatted = f'<span class="{font_name}">{formatted}</span>'
-
-                            if run.underline:
-                                formatted = f"<u>{formatted}</u>"
-                            if run.italic:
-                                formatted = f"<i>{formatted}</i>"
-                            if run.bold:
-                                formatted = f"<b>{formatted}</b>"
-
-                            accumulated_html.append(formatted)
-
-                elif state == ExtractionState.EXTRACTING:
-                    # Continue accumulating until we find bold right quote
-                    if RIGHT_QUOTE in text and run.bold:
-                        logging.debug(f"Found RIGHT_QUOTE at paragraph {para_idx}")
-
-                        # Split at right quote
-                        split_idx = text.index(RIGHT_QUOTE)
-                        text_before_quote = text[:split_idx]
-                        cite_search_text = text[split_idx + 1:]
-
-                        # Format the text before the quote
-                        if text_before_quote:
-                            formatted = replace_unicode_chars(text_before_quote)
-
-                            # Check font
-                            font_name = None
-                            try:
-                                if run.font and run.font.name and run.font.name != 'Times New Roman':
-                                    font_name = run.font.name
-                            except:
-                                pass
-
-                            if font_name:
-                                formatted = f'<span class="{font_name}">{formatted}</span>'
-
-                            if run.underline:
-                                formatted = f"<u>{formatted}</u>"
-                            if run.italic:
-                                formatted = f"<i>{formatted}</i>"
-                            if run.bold:
-                                formatted = f"<b>{formatted}</b>"
-
-                            accumulated_html.append(formatted)
-
-                        state = ExtractionState.FOUND_QUOTE
-                    else:
-                        # Keep accumulating
-                        formatted = format_run_as_html(run)
-                        accumulated_html.append(formatted)
-
-            # If still extracting at end of paragraph, check for cite-terminated translation
-            if state == ExtractionState.EXTRACTING:
-                para_text = replace_unicode_chars(paragraph.text)
-                # Check if paragraph ends with balanced (...chapter:verse...) using paren matching
-                cite_found = False
-                stripped_pt = para_text.rstrip()
-                if stripped_pt.endswith(')'):
-                    depth = 0
-                    paren_start = None
-                    for i in range(len(stripped_pt) - 1, -1, -1):
-                        if stripped_pt[i] == ')':
-                            depth += 1
-                        elif stripped_pt[i] == '(':
-                            depth -= 1
-                            if depth == 0:
-                                paren_start = i
-                                break
-                    if paren_start is not None:
-                        cite_content = stripped_pt[paren_start + 1:-1].strip()
-                        if re.search(r'\d+:\d+', cite_content):
-                            cite_found = True
-                            raw_cite = cite_content
-                            cite_start_pos = paren_start
-
-                if cite_found:
-                    extract_from = para_extract_start if para_extract_start is not None else 0
-
-                    # Truncate accumulated_html back to before this paragraph's runs
-                    if para_html_start is not None:
-                        accumulated_html = accumulated_html[:para_html_start]
-
-                    # Re-walk this paragraph's runs, building HTML for only the non-cite portion
-                    char_pos = 0
-                    for r in paragraph.runs:
-                        r_text = replace_unicode_chars(r.text)
-                        r_end = char_pos + len(r_text)
-
-                        if r_end <= extract_from or char_pos >= cite_start_pos:
-                            char_pos = r_end
-                            continue
-
-                        eff_start = max(0, extract_from - char_pos)
-                        eff_end = min(len(r_text), cite_start_pos - char_pos)
-
-                        if eff_end > eff_start:
-                            keep = r_text[eff_start:eff_end]
-                            if keep:
-                                fmt = keep
-                                fn = None
-                                try:
-                                    if r.font and r.font.name and r.font.name != 'Times New Roman':
-                                        fn = r.font.name
-                                except:
-                                    pass
-                                if fn:
-                                    fmt = f'<span class="{fn}">{fmt}</span>'
-                                if r.underline:
-                                    fmt = f"<u>{fmt}</u>"
-                                if r.italic:
-                                    fmt = f"<i>{fmt}</i>"
-                                if r.bold:
-                                    fmt = f"<b>{fmt}</b>"
-                                accumulated_html.append(fmt)
-
-                        char_pos = r_end
-
-                    cite_name, cite_chapter, cite_verse, cite_verse_end, cite_note = parse_cite(raw_cite)
-                    cite_hebrew, cite_common = split_cite_name(cite_name)
-                    full_text = consolidate_html("".join(accumulated_html))
-
-                    if cite_name or cite_chapter:
-                        translation = {
-                            "book": book_name,
-                            "page": None,
-                            "text_word": full_text,
-                            "cite": cite_name,
-                            "cite_hebrew": cite_hebrew,
-                            "cite_common": cite_common,
-                            "cite_chapter": cite_chapter,
-                            "cite_verse": cite_verse,
-                            "cite_verse_end": cite_verse_end,
-                            "cite_note": cite_note,
-                            "_para_idx": start_paragraph_index
-                        }
-                        translations.append(translation)
-                        logging.info(f"Extracted cite-terminated translation #{len(translations)} from {book_name}")
-                        para_extracted = True
-
-                    state = ExtractionState.SEARCHING
-                    accumulated_html = []
-                    cite_search_text = ""
-                    page_number = None
-                else:
-                    accumulated_html.append("<br>")
-
-            # Process completed extraction at end of paragraph
-            if state == ExtractionState.FOUND_QUOTE:
-                # Extract cite from accumulated cite search text
-                raw_cite = extract_cite(cite_search_text)
-
-                # Only save translations that have a cite reference
-                if raw_cite:
-                    cite_name, cite_chapter, cite_verse, cite_verse_end, cite_note = parse_cite(raw_cite)
-                    cite_hebrew, cite_common = split_cite_name(cite_name)
-
-                    # Combine accumulated HTML and consolidate adjacent tags
-                    full_text = consolidate_html("".join(accumulated_html))
-
-                    translation = {
-                        "book": book_name,
-                        "page": None,
-                        "text_word": full_text,
-                        "cite": cite_name,
-                        "cite_hebrew": cite_hebrew,
-                        "cite_common": cite_common,
-                        "cite_chapter": cite_chapter,
-                        "cite_verse": cite_verse,
-                        "cite_verse_end": cite_verse_end,
-                        "cite_note": cite_note,
-                        "_para_idx": start_paragraph_index
-                    }
-
-                    translations.append(translation)
-                    logging.info(f"Extracted translation #{len(translations)} from {book_name}")
-                    logging.debug(f"  Cite: {cite_name} {cite_chapter}:{cite_verse}")
-                    logging.debug(f"  Text preview: {full_text[:100]}...")
-                    para_extracted = True
-                else:
-                    logging.debug(f"Skipped translation without cite at paragraph {start_paragraph_index}")
-
-                # Reset state machine
-                state = ExtractionState.SEARCHING
-                accumulated_html = []
-                cite_search_text = ""
-                page_number = None
-
-            # Bold-cite detection: bold paragraphs ending with citation, no curly quotes
-            if state == ExtractionState.SEARCHING and not para_extracted and LEFT_QUOTE not in paragraph.text:
-                para_text = replace_unicode_chars(paragraph.text)
-                stripped_pt = para_text.rstrip()
-
-                # Check if first non-empty run is bold
-                first_run_bold = False
-                for r in paragraph.runs:
-                    if r.text.strip():
-                        first_run_bold = bool(r.bold)
-                        break
-
-                if first_run_bold and stripped_pt:
-                    # Check if paragraph ends with a citation
-                    cite_found_bc = False
-                    raw_cite_bc = None
-                    cite_start_pos_bc = None
-
-                    if stripped_pt.endswith(')'):
-                        depth = 0
-                        paren_start = None
-                        for i in range(len(stripped_pt) - 1, -1, -1):
-                            if stripped_pt[i] == ')':
-                                depth += 1
-                            elif stripped_pt[i] == '(':
-                                depth -= 1
-                                if depth == 0:
-                                    paren_start = i
-                                    break
-                        if paren_start is not None:
-                            cite_content = stripped_pt[paren_start + 1:-1].strip()
-                            if re.search(r'\d+:\d+', cite_content):
-                                cite_found_bc = True
-                                raw_cite_bc = cite_content
-                                cite_start_pos_bc = paren_start
-
-                    if cite_found_bc:
-                        # Build HTML for this paragraph (excluding the trailing cite)
-                        current_html = []
-                        char_pos = 0
-                        for r in paragraph.runs:
-                            r_text = replace_unicode_chars(r.text)
-                            r_end = char_pos + len(r_text)
-
-                            if char_pos >= cite_start_pos_bc:
-                                break
-
-                            eff_end = min(len(r_text), cite_start_pos_bc - char_pos)
-                            keep = r_text[:eff_end]
-                            if keep:
-                                fmt = keep
-                                fn = None
-                                try:
-                                    if r.font and r.font.name and r.font.name != 'Times New Roman':
-                                        fn = r.font.name
-                                except:
-                                    pass
-                                if fn:
-                                    fmt = f'<span class="{fn}">{fmt}</span>'
-                                if r.underline:
-                                    fmt = f"<u>{fmt}</u>"
-                                if r.italic:
-                                    fmt = f"<i>{fmt}</i>"
-                                if r.bold:
-                                    fmt = f"<b>{fmt}</b>"
-                                current_html.append(fmt)
-
-                            char_pos = r_end
-
-                        # Combine with accumulated bold buffer (for multi-paragraph translations)
-                        if bold_cite_html:
-                            bold_cite_html.append('<br>')
-                        bold_cite_html.extend(current_html)
-
-                        # Parse citation and save
-                        cite_name, cite_chapter, cite_verse, cite_verse_end, cite_note = parse_cite(raw_cite_bc)
-                        cite_hebrew, cite_common = split_cite_name(cite_name)
-                        full_text = consolidate_html("".join(bold_cite_html))
-
-                        if (cite_name or cite_chapter) and full_text.strip():
-                            start_para = bold_cite_start_para if bold_cite_start_para is not None else para_idx
-                            translation = {
-                                "book": book_name,
-                                "page": None,
-                                "text_word": full_text,
-                                "cite": cite_name,
-                                "cite_hebrew": cite_hebrew,
-                                "cite_common": cite_common,
-                                "cite_chapter": cite_chapter,
-                                "cite_verse": cite_verse,
-                                "cite_verse_end": cite_verse_end,
-                                "cite_note": cite_note,
-                                "_para_idx": start_para
-                            }
-                            translations.append(translation)
-                            logging.info(f"Extracted bold-cite translation #{len(translations)} from {book_name}")
-
-                        # Reset bold-cite buffer
-                        bold_cite_html = []
-                        bold_cite_start_para = None
-                    else:
-                        # Bold paragraph without cite - accumulate for potential multi-paragraph
-                        if not bold_cite_html:
-                            bold_cite_start_para = para_idx
-                        else:
-                            bold_cite_html.append('<br>')
-                        for r in paragraph.runs:
-                            bold_cite_html.append(format_run_as_html(r))
-                elif not first_run_bold:
-                    # Non-bold paragraph - clear bold-cite buffer
-                    bold_cite_html = []
-                    bold_cite_start_para = None
-            elif state != ExtractionState.SEARCHING:
-                # Clear bold-cite buffer when in extracting/found_quote state
-                bold_cite_html = []
-                bold_cite_start_para = None
-
-        # Handle case where we finished the document while still searching for cite
-        if state == ExtractionState.FOUND_QUOTE and len(accumulated_html) > 0:
-            raw_cite = extract_cite(cite_search_text)
-            if raw_cite:
-                cite_name, cite_chapter, cite_verse, cite_verse_end, cite_note = parse_cite(raw_cite)
-                cite_hebrew, cite_common = split_cite_name(cite_name)
-                full_text = consolidate_html("".join(accumulated_html))
-
-                translation = {
-                    "book": book_name,
-                    "page": None,
-                    "text_word": full_text,
-                    "cite": cite_name,
-                    "cite_hebrew": cite_hebrew,
-                    "cite_common": cite_common,
-                    "cite_chapter": cite_chapter,
-                    "cite_verse": cite_verse,
-                    "cite_verse_end": cite_verse_end,
-                    "cite_note": cite_note,
-                    "_para_idx": start_paragraph_index
-                }
-                translations.append(translation)
-
-        if state == ExtractionState.EXTRACTING:
-            logging.warning(f"Document {book_name} has unclosed translation (missing right quote)")
+        logging.info("Processing document: %s", book_name)
+
+        def emit(kind: str, html_parts: List[str], raw_cite: str, para_idx: int) -> bool:
+            cite_name, cite_chapter, cite_verse, cite_verse_end, cite_note = parse_cite(raw_cite)
+            cite_hebrew, cite_common = split_cite_name(cite_name)
+            # Combine accumulated HTML and consolidate adjacent tags
+            full_text = consolidate("".join(html_parts))
+            # Quote-delimited translations only need a cite; the other kinds need a parsed one
+            if kind != QUOTE and not (cite_name or cite_chapter):
+                return False
+            if kind == BOLD_CITE and not full_text.strip():
+                return False
+            translations.append(Translation(
+                book_name, full_text, cite_name, cite_hebrew, cite_common,
+                cite_chapter, cite_verse, cite_verse_end, cite_note,
+                para_idx=para_idx
+            ))
+            completed_at.append(boundaries.index)
+            logging.info(EXTRACTED_MESSAGES.get(kind, "Extracted translation #%d from %s"), len(translations), book_name)
+            logging.debug("  Cite: %s %s:%s", cite_name, cite_chapter, cite_verse)
+            logging.debug("  Text preview: %.100s...", full_text)
+            return True
+
+        quote = QuoteDetector(emit)
+        pipeline = [quote, CiteTerminatedDetector(quote, emit), BoldCiteDetector(emit)]
+        if detect_chapters:
+            pipeline.append(ChapterDetector(structure))
+        if metrics.enabled:
+            pipeline.append(_RunsPerParagraph(metrics))
+        pipeline.extend(factory(emit) for factory in detectors)
+        boundaries = Boundaries(pipeline)
+        completed_at = []  # paragraph that completed each translation
+        pipeline.insert(0, boundaries)
+
+        if cache is not None and not detectors:
+            skipped, unclosed = _extract_cached(cache, doc_path, view, pipeline, boundaries, quote,
+                                                translations, completed_at, structure, metrics)
+        else:
+            skipped = run_detectors(view, pipeline)
+            unclosed = quote.state == ExtractionState.EXTRACTING
 
-        # Assign chapter numbers to translations if chapter detection was enabled
-        if detect_chapters and chapter_boundaries:
-            chapter_boundaries.sort(key=lambda x: x[0])
+        if unclosed:
+            logging.warning("Document %s has unclosed translation (missing right quote)", book_name)
+
+        if metrics.enabled:
+            metrics.count('paragraphs', len(view))
+            metrics.count('paragraphs_skipped', skipped)
+            metrics.count('translations', len(translations))
             for t in translations:
-                pidx = t.get('_para_idx')
-                if pidx is not None:
-                    ch_num = None
-                    for bound_idx, c_num in chapter_boundaries:
-                        if pidx >= bound_idx:
-                            ch_num = c_num
-                        else:
-                            break
-                    t['_chapter_num'] = ch_num
-            # Append chapter metadata as a special entry
-            translations.append({'_chapters': chapter_boundaries})
+                metrics.observe('translation_html_bytes', len(t.text_word.encode('utf-8')))
+
+        # Assign chapter numbers to translations if chapter detection was enabled
+        if detect_chapters:
+            structure.finalize()
+            structure.set_page_map(build_page_map_from_xml(doc_path, view.document))
+            if structure.chapter_paras:
+                for t in translations:
+                    if t.para_idx is not None:
+                        t.chapter_num = structure.chapter_at(t.para_idx)
+            return translations, structure
 
         return translations
 
     except Exception as e:
-        logging.error(f"Error processing document {doc_path}: {e}")
-        return []
+        logging.error("Error processing document %s: %s", doc_path, e)
+        return ([], DocumentStructure()) if detect_chapters else []
 
 
-def save_translation(conn, translation_data: Dict[str, any]) -> bool:
+def save_translation(conn, translation: Translation) -> bool:
     """
     Insert translation record into database.
 
     Args:
         conn: PostgreSQL connection object
-        translation_data: Dictionary with keys: book, page, text_word, cite, cite_chapter, cite_verse
+        translation: Extracted Translation (page already resolved)
 
     Returns:
         True if successful, False otherwise
     """
     try:
+        db.prepare(conn, 'save_translation', f"""
+            INSERT INTO translation ({', '.join(TRANSLATION_COLUMNS)})
+            VALUES ({', '.join(f'${i}' for i in range(1, len(TRANSLATION_COLUMNS) + 1))})
+        """)
         cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO translation (translation_book, translation_page, translation_text_word,
-                                     translation_cite, translation_cite_hebrew, translation_cite_common,
-                                     translation_cite_chapter, translation_cite_verse,
-                                     translation_cite_verse_end, translation_cite_note)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            translation_data['book'],
-            translation_data['page'],
-            translation_data['text_word'],
-            translation_data['cite'],
-            translation_data.get('cite_hebrew'),
-            translation_data.get('cite_common'),
-            translation_data.get('cite_chapter'),
-            translation_data.get('cite_verse'),
-            translation_data.get('cite_verse_end'),
-            translation_data.get('cite_note')
-        ))
+        db.execute_prepared(cursor, 'save_translation', translation.as_row())
 
         conn.commit()
         cursor.close()
@@ -1256,9 +952,77 @@ def save_translation(conn, translation_data: Dict[str, any]) -> bool:
     except psycopg2.Error as e:
         logging.error(f"Database insertion failed: {e}")
         conn.rollback()
+        getattr(conn, 'prepared', set()).discard('save_translation')
         return False
 
 
+def save_translations(conn, translations: List[Translation]) -> int:
+    """
+    Insert a document's translations with one COPY in one transaction.
+
+    Returns:
+        Number of rows inserted (0 if the batch was rolled back)
+    """
+    try:
+        cursor = conn.cursor()
+        count = copy_rows(cursor, 'translation', TRANSLATION_COLUMNS, [t.as_row() for t in translations])
+        conn.commit()
+        cursor.close()
+        return count
+
+    except psycopg2.Error as e:
+        logging.error(f"Batch insertion failed: {e}")
+        conn.rollback()
+        return 0
+
+
+def sync_translations(conn, book: str, translations: List[Translation]) -> Optional[translation_sync.SyncPlan]:
+    """
+    Diff-mode save: bring one book's translation rows in line with a fresh extraction.
+
+    Only translations whose fingerprint changed since the book was last synced are
+    inserted, updated or deleted, all in one transaction. A book with no fingerprints
+    yet has its existing rows replaced once.
+
+    Returns:
+        The applied SyncPlan, or None if the transaction failed
+    """
+    try:
+        cursor = conn.cursor()
+        stored = translation_sync.load_stored(cursor, OUTPUT_TRANSLATION, book)
+        if not stored:
+            cursor.execute("DELETE FROM translation WHERE translation_book = %s", (book,))
+            if cursor.rowcount:
+                logging.info(f"  {book}: no fingerprints yet, replacing {cursor.rowcount} existing row(s)")
+
+        extracted = [(identity, translation_sync.content_hash(t.as_row()), t)
+                     for identity, t in zip(translation_sync.identities(translations), translations)]
+        plan = translation_sync.plan(stored, extracted)
+
+        if plan.deletes:
+            cursor.execute("DELETE FROM translation WHERE translation_id = ANY(%s)",
+                           ([key for _, key in plan.deletes],))
+        if plan.updates:
+            translation_sync.update_rows(cursor, 'translation', 'translation_id', TRANSLATION_COLUMNS,
+                                         [(key, *t.as_row()) for _, _, t, key in plan.updates])
+            # Cite may have changed; update_cite_book_ids re-resolves NULLs
+            cursor.execute("UPDATE translation SET translation_cite_book_id = NULL WHERE translation_id = ANY(%s)",
+                           ([key for _, _, _, key in plan.updates],))
+        keys = translation_sync.reserve_keys(cursor, 'translation', 'translation_id', len(plan.inserts))
+        copy_rows(cursor, 'translation', ['translation_id'] + TRANSLATION_COLUMNS,
+                  [(key, *t.as_row()) for key, (_, _, t) in zip(keys, plan.inserts)])
+        translation_sync.record(cursor, OUTPUT_TRANSLATION, book, plan, keys)
+
+        conn.commit()
+        cursor.close()
+        return plan
+
+    except psycopg2.Error as e:
+        logging.error(f"Diff save failed for {book}: {e}")
+        conn.rollback()
+        return None
+
+
 def populate_cite_table(conn) -> int:
     """
     Populate the cite table with distinct cite values from the translation table.
@@ -1369,7 +1133,112 @@ def update_cite_book_ids(conn) -> int:
         return 0
 
 
-def parse_directory(directory_path: Path, conn, dry_run: bool = False) -> Dict[str, int]:
+def refresh_derived(conn) -> None:
+    """
+    Bring what is derived from yy_translation up to date after an import: the search
+    index (build_search_index) and the reader's chapter bundles (build_bundles),
+    each only where it has been built.
+    """
+    import build_bundles
+    import build_search_index
+    for name, update in (('search index', build_search_index.update), ('chapter bundles', build_bundles.refresh)):
+        try:
+            update(conn)
+        except (psycopg2.Error, OSError) as e:
+            logging.error(f"Failed to refresh the {name}: {e}")
+            if not conn.closed:
+                conn.rollback()
+
+
+def persist_document(conn, doc_path: Path, translations: List[Translation], structure=None,
+                     loader: Optional[YyTranslationLoader] = None, diff: bool = False,
+                     metrics: Metrics = NULL_METRICS, batch: bool = False) -> Dict[str, int]:
+    """
+    Save one document's translations in the configured output mode.
+
+    Args:
+        conn: PostgreSQL connection object
+        doc_path: Source document (its stem is the book / volume file name)
+        translations: Extracted translations with pages assigned
+        structure: DocumentStructure (yy_translation output)
+        loader: YyTranslationLoader bound to conn for yy_translation output, else legacy table
+        diff: Sync against the document's fingerprints instead of appending / replacing
+        metrics: Times the persist phase per document
+        batch: Legacy append in one COPY transaction instead of one commit per row
+
+    Returns:
+        Dict with saved, unresolved, unchanged, deleted counts
+    """
+    counts = {"saved": 0, "unresolved": 0, "unchanged": 0, "deleted": 0}
+    if loader:
+        with metrics.timer('persist', document=doc_path.name):
+            try:
+                if diff:
+                    result, plan = loader.sync_volume(doc_path.stem, translations, structure)
+                    if plan:
+                        counts["unchanged"] = plan.unchanged
+                        counts["deleted"] = len(plan.deletes)
+                        logging.info(f"{doc_path.name}: {len(plan.inserts)} inserted, {len(plan.updates)} updated, "
+                                     f"{len(plan.deletes)} deleted, {plan.unchanged} unchanged")
+                else:
+                    result = loader.load_volume(doc_path.stem, translations, structure)
+                conn.commit()
+            except psycopg2.Error as e:
+                logging.error(f"Loading {doc_path.name} into yy_translation failed: {e}")
+                conn.rollback()
+                metrics.count('translations_failed', len(translations))
+                return counts
+        counts["saved"] = result.loaded
+        counts["unresolved"] = len(result.unresolved)
+        metrics.count('translations_unresolved', len(result.unresolved))
+        logging.info(f"{doc_path.name}: {result.loaded} loaded into yy_translation "
+                     f"({result.replaced} replaced, {result.verses_linked} verse links, "
+                     f"{len(result.unresolved)} unresolved)")
+        for t, reason in result.unresolved[:20]:
+            logging.warning(f"  Unresolved {t.cite} {t.cite_chapter}:{t.cite_verse} (page {t.page}): {reason}")
+    elif diff:
+        with metrics.timer('persist', document=doc_path.name):
+            plan = sync_translations(conn, doc_path.stem, translations)
+        if plan is None:
+            metrics.count('translations_failed', len(translations))
+            return counts
+        counts["saved"] = len(plan.inserts) + len(plan.updates)
+        counts["unchanged"] = plan.unchanged
+        counts["deleted"] = len(plan.deletes)
+        logging.info(f"{doc_path.name}: {len(plan.inserts)} inserted, {len(plan.updates)} updated, "
+                     f"{len(plan.deletes)} deleted, {plan.unchanged} unchanged")
+    elif batch:
+        with metrics.timer('persist', document=doc_path.name):
+            counts["saved"] = save_translations(conn, translations)
+        if len(translations) and not counts["saved"]:
+            metrics.count('translations_failed', len(translations))
+    else:
+        with metrics.timer('persist', document=doc_path.name):
+            for translation in translations:
+                if save_translation(conn, translation):
+                    counts["saved"] += 1
+                else:
+                    metrics.count('translations_failed')
+    return counts
+
+
+def is_volume_document(path: Path) -> bool:
+    """YY*.docx volumes to import; skips Word's ~$ lock files and the YY-s07 series."""
+    name = path.name
+    return (name.startswith("YY") and name.endswith(".docx")
+            and not name.startswith("~$") and not name.startswith("YY-s07"))
+
+
+def parse_directory(directory_path: Path, conn, dry_run: bool = False,
+                    metrics: Metrics = NULL_METRICS,
+                    profiler: DocumentProfiler = NULL_PROFILER,
+                    output: str = OUTPUT_TRANSLATION,
+                    diff: bool = False,
+                    pipeline: bool = False,
+                    workers: Optional[int] = None,
+                    writers: int = 4,
+                    cache_dir: Optional[str] = None,
+                    pdf_dir: Optional[Path] = None) -> Dict[str, int]:
     """
     Parse all Word documents in a directory.
 
@@ -1377,23 +1246,41 @@ def parse_directory(directory_path: Path, conn, dry_run: bool = False) -> Dict[s
         directory_path: Path to directory containing .docx files
         conn: PostgreSQL connection object
         dry_run: If True, extract but don't save to database
+        metrics: Collects per-phase and per-document timings
+        profiler: Profiles extraction and XML page mapping per document when enabled
+        output: OUTPUT_TRANSLATION (legacy translation table) or OUTPUT_YY_TRANSLATION
+            (replace each volume's yy_translation rows via YyTranslationLoader)
+        diff: Write only translations whose fingerprint changed since the last import
+            (translation_sync) instead of appending / replacing everything
+        pipeline: Overlap parsing (worker processes), paging and saving (pooled writer
+            connections) via import_pipeline instead of running the phases in turn
+        workers: Parser processes for the pipeline (default: CPU count - 1)
+        writers: Concurrent database writers for the pipeline
+        cache_dir: Keep per-paragraph extraction checkpoints here and re-extract only
+            the edited part of a document (extraction_cache)
+        pdf_dir: Where published volume PDFs live (yy_volume_pdf or <volume>.pdf) for
+            PDF page lookup ahead of COM (default: directory_path)
 
     Returns:
-        Dictionary with statistics: files_processed, translations_found, translations_saved
+        Dictionary with statistics: files_processed, translations_found, translations_saved,
+        translations_unresolved, translations_unchanged, translations_deleted
     """
     stats = {
         "files_processed": 0,
         "translations_found": 0,
-        "translations_saved": 0
+        "translations_saved": 0,
+        "translations_unresolved": 0,
+        "translations_unchanged": 0,
+        "translations_deleted": 0
     }
+    load_yy = output == OUTPUT_YY_TRANSLATION
 
     if not directory_path.exists():
         logging.error(f"Directory does not exist: {directory_path}")
         return stats
 
     # Find all .docx files starting with "YY" (excluding temporary files starting with ~$)
-    docx_files = [f for f in directory_path.glob("YY*.docx")
-                  if not f.name.startswith("~$") and not f.name.startswith("YY-s07")]
+    docx_files = [f for f in directory_path.glob("YY*.docx") if is_volume_document(f)]
 
     if not docx_files:
         logging.warning(f"No .docx files found in {directory_path}")
@@ -1401,12 +1288,30 @@ def parse_directory(directory_path: Path, conn, dry_run: bool = False) -> Dict[s
 
     logging.info(f"Found {len(docx_files)} document(s) to process")
 
+    if pipeline and not dry_run:
+        import import_pipeline
+        try:
+            return asyncio.run(import_pipeline.run(docx_files, output=output, diff=diff, workers=workers,
+                                                   writers=writers, metrics=metrics, cache_dir=cache_dir,
+                                                   pdfs=pdf_pages.volume_pdfs(conn, docx_files, pdf_dir or directory_path)))
+        finally:
+            db.close_pool()
+
     # Phase 1: Extract all translations using python-docx (fast)
+    cache = ExtractionCache(cache_dir) if cache_dir else None
     all_translations = {}  # doc_path -> list of translations
+    structures = {}  # doc_path -> DocumentStructure (yy_translation output only)
     for doc_path in docx_files:
         logging.info(f"\n{'='*60}")
-        translations = extract_translations_from_doc(doc_path)
+        with metrics.timer('extract', document=doc_path.name, histogram='document_parse_seconds'), \
+                profiler.phase(doc_path.name, 'extract'):
+            if load_yy:
+                translations, structures[doc_path] = extract_translations_from_doc(
+                    doc_path, detect_chapters=True, metrics=metrics, cache=cache)
+            else:
+                translations = extract_translations_from_doc(doc_path, metrics=metrics, cache=cache)
         all_translations[doc_path] = translations
+        metrics.count('documents')
         stats["files_processed"] += 1
         stats["translations_found"] += len(translations)
 
@@ -1414,39 +1319,38 @@ def parse_directory(directory_path: Path, conn, dry_run: bool = False) -> Dict[s
     doc_para_map = {}
     for doc_path, translations in all_translations.items():
         if translations:
-            para_indices = list(set(t["_para_idx"] for t in translations))
+            para_indices = list(set(t.para_idx for t in translations))
             doc_para_map[str(doc_path.absolute())] = para_indices
 
     if doc_para_map and not dry_run:
-        all_page_numbers = get_all_page_numbers(doc_para_map)
+        pdfs = pdf_pages.volume_pdfs(conn, docx_files, pdf_dir or directory_path)
+        with metrics.timer('paginate'):
+            all_page_numbers = get_all_page_numbers(doc_para_map, metrics, profiler, pdfs=pdfs)
 
         # Apply page numbers to translations
         for doc_path, translations in all_translations.items():
             abs_path = str(doc_path.absolute())
             page_map = all_page_numbers.get(abs_path, {})
             for t in translations:
-                pidx = t.pop("_para_idx")
-                t["page"] = page_map.get(pidx)
-    else:
-        # Remove _para_idx from translations even if not using COM
-        for doc_path, translations in all_translations.items():
-            for t in translations:
-                t.pop("_para_idx", None)
+                t.page = page_map.get(t.para_idx)
 
     # Phase 3: Save to database
+    loader = YyTranslationLoader(conn) if load_yy and not dry_run else None
     for doc_path, translations in all_translations.items():
         if dry_run:
             logging.info(f"[DRY RUN] Would save {len(translations)} translation(s) from {doc_path.name}")
             for i, trans in enumerate(translations, 1):
+                d = trans.to_dict()
                 logging.info(f"  Translation {i}:")
-                logging.info(f"    Book: {trans['book']}")
-                logging.info(f"    Page: {trans.get('page')}")
-                logging.info(f"    Cite: {trans['cite']}")
-                logging.info(f"    Text: {trans['text_word'][:100]}...")
+                logging.info(f"    Book: {d['book']}")
+                logging.info(f"    Page: {d['page']}")
+                logging.info(f"    Cite: {d['cite']}")
+                logging.info(f"    Text: {d['text_word'][:100]}...")
         else:
-            for translation in translations:
-                if save_translation(conn, translation):
-                    stats["translations_saved"] += 1
+            counts = persist_document(conn, doc_path, translations, structures.get(doc_path),
+                                      loader=loader, diff=diff, metrics=metrics)
+            for key, n in counts.items():
+                stats[f"translations_{key}"] += n
 
     return stats
 
@@ -1472,8 +1376,100 @@ def main():
         action="store_true",
         help="Enable verbose logging"
     )
+    parser.add_argument(
+        "--output",
+        choices=[OUTPUT_TRANSLATION, OUTPUT_YY_TRANSLATION],
+        default=OUTPUT_TRANSLATION,
+        help="Target table: legacy 'translation' (default) or 'yy_translation' with scroll/chapter/verse "
+             "keys resolved at import (replaces each imported volume's rows)"
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Only insert/update/delete translations that changed since each document was last imported"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Parse in worker processes and save on several pooled connections concurrently"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parser processes for --pipeline (default: CPU count - 1)"
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=4,
+        help="Concurrent database writers for --pipeline (default: 4)"
+    )
+    parser.add_argument(
+        "--pdf-dir",
+        type=str,
+        help="Directory of the published volume PDFs (yy_volume_pdf, or <volume>.pdf) used for page "
+             "numbers ahead of Word COM (default: --directory)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and import each volume as soon as it is saved (always diff mode; "
+             "uses watchdog if installed, else polls)"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="--watch: seconds a saved document must stay unchanged before it is imported (default: 2)"
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="--watch: poll the directory even if watchdog is installed"
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        help="Write a JSON run report with per-phase and per-document timings to this file"
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=str,
+        help="Write the run metrics in Prometheus text format to this file"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="cProfile extraction and XML page mapping per document (<doc>.<phase>.prof)"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Trace allocations per document with tracemalloc (<doc>.<phase>.mem.txt, peak memory ranking)"
+    )
+    parser.add_argument(
+        "--extract-cache",
+        type=str,
+        help="Directory for per-paragraph extraction checkpoints; edited documents are only "
+             "re-extracted around the changed paragraphs (e.g. .extract_cache)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default="profiles",
+        help="Directory for profile and memory snapshot files (default: profiles)"
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        help="Allocation sites to keep per memory snapshot (default: 25)"
+    )
 
     args = parser.parse_args()
+    if args.pipeline and not args.dry_run and (args.profile or args.trace_memory):
+        # Pipeline extraction runs in worker processes the profiler cannot see into
+        parser.error("--profile/--trace-memory cannot be combined with --pipeline (profile a serial run instead)")
 
     setup_logging(args.verbose)
 
@@ -1497,34 +1493,75 @@ def main():
     else:
         logging.info("Skipping database connection (dry run mode)")
 
+    metrics = Metrics() if (args.metrics_json or args.metrics_prom) else NULL_METRICS
+    profiler = NULL_PROFILER
+    if args.profile or args.trace_memory:
+        profiler = DocumentProfiler(args.profile_dir, cpu=args.profile, memory=args.trace_memory, top=args.profile_top)
+
+    if args.watch:
+        import import_watch
+        try:
+            import_watch.watch(directory_path, conn, output=args.output, dry_run=args.dry_run,
+                               cache_dir=args.extract_cache or import_watch.DEFAULT_CACHE_DIR,
+                               pdf_dir=Path(args.pdf_dir) if args.pdf_dir else directory_path,
+                               debounce=args.debounce, polling=args.poll, metrics=metrics, profiler=profiler)
+        finally:
+            if conn and not conn.closed:
+                conn.close()
+            if args.metrics_json:
+                metrics.write_json(args.metrics_json)
+            if args.metrics_prom:
+                metrics.write_prometheus(args.metrics_prom)
+            profiler.print_summary()
+        return
+
     # Process documents
     try:
-        stats = parse_directory(directory_path, conn, dry_run=args.dry_run)
+        stats = parse_directory(directory_path, conn, dry_run=args.dry_run, metrics=metrics, profiler=profiler,
+                                output=args.output, diff=args.diff, pipeline=args.pipeline,
+                                workers=args.workers, writers=args.writers, cache_dir=args.extract_cache,
+                                pdf_dir=Path(args.pdf_dir) if args.pdf_dir else None)
 
         logging.info("\n" + "=" * 60)
         logging.info("SUMMARY")
         logging.info("=" * 60)
         # Populate cite table with distinct cite values
-        if not args.dry_run and conn:
+        if not args.dry_run and conn and args.output == OUTPUT_TRANSLATION:
             populate_cite_table(conn)
             normalize_unicode_text(conn)
             update_cite_book_ids(conn)
+        if not args.dry_run and conn and args.output == OUTPUT_YY_TRANSLATION:
+            refresh_derived(conn)
 
         logging.info(f"Files processed: {stats['files_processed']}")
         logging.info(f"Translations found: {stats['translations_found']}")
         if not args.dry_run:
             logging.info(f"Translations saved: {stats['translations_saved']}")
+        if args.diff:
+            logging.info(f"Translations unchanged: {stats['translations_unchanged']}")
+            logging.info(f"Translations deleted: {stats['translations_deleted']}")
+        if stats['translations_unresolved']:
+            logging.warning(f"Translations unresolved (not loaded): {stats['translations_unresolved']}")
 
         if stats['translations_found'] > 0 and not args.dry_run:
-            if stats['translations_saved'] == stats['translations_found']:
+            failed = (stats['translations_found'] - stats['translations_saved'] - stats['translations_unresolved']
+                      - stats['translations_unchanged'])
+            if failed == 0:
                 logging.info("✓ All translations saved successfully!")
             else:
-                logging.warning(f"⚠ {stats['translations_found'] - stats['translations_saved']} translation(s) failed to save")
+                logging.warning(f"⚠ {failed} translation(s) failed to save")
 
     finally:
         if conn:
             conn.close()
             logging.info("Database connection closed")
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
+            logging.info(f"Metrics report written to {args.metrics_json}")
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
+            logging.info(f"Prometheus metrics written to {args.metrics_prom}")
+        profiler.print_summary()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+"""
+Page numbers from a volume's published PDF, ahead of Word COM and the XML fallback.
+- The PDF's text layer is read page by page with pypdf when it is installed,
+  else with poppler's pdftotext (pages separated by form feeds)
+- Paragraph text and page text are normalized the same way: NFKC (folds
+  ligatures), case folded, letters and digits only, so line breaks, hyphenation
+  at line ends, curly quotes and spacing do not matter
+- The first KEY_LENGTH normalized characters of every requested paragraph go into
+  one Aho-Corasick automaton (aho_corasick) and the whole volume's text is
+  scanned once; the page a key starts on is the paragraph's page. Paragraphs
+  sharing a key take its occurrences in document order, and only when the
+  number of occurrences matches, so text quoted again elsewhere is not misplaced
+- Printed page labels are used when the PDF has numeric ones (pypdf), so
+  restarted numbering matches Word's adjusted page numbers; otherwise pages
+  count from 1
+- Paragraphs whose key is too short or not found are left out, for the caller to
+  resolve some other way; volumes are resolved in parallel worker processes
+
+    pdfs = volume_pdfs(conn, docx_files, pdf_dir)
+    page_maps = resolve_documents({doc: (pdfs[doc], indices)}, workers=4)
+"""
+import logging
+import os
+import shutil
+import subprocess
+import unicodedata
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import psycopg2
+from docx import Document
+
+from aho_corasick import Automaton
+from document_view import DocumentView
+from translation_loader import normalize_book
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional; pdftotext is used instead
+    PdfReader = None
+
+KEY_LENGTH = 64      # normalized characters of a paragraph searched for
+MIN_KEY_LENGTH = 16  # shorter paragraphs are too ambiguous to place by text
+
+
+def normalize(text: str) -> str:
+    """Letters and digits only, NFKC and case folded."""
+    return ''.join(ch for ch in unicodedata.normalize('NFKC', text).casefold() if ch.isalnum())
+
+
+def _numeric_labels(labels: Sequence[str]) -> List[Optional[int]]:
+    return [int(label) if label.isdigit() else None for label in labels]
+
+
+def read_pdf_pages(pdf_path: Path) -> Tuple[List[str], List[Optional[int]]]:
+    """
+    Text of every page and its page number.
+
+    Raises:
+        RuntimeError if neither pypdf nor pdftotext is available
+    """
+    if PdfReader is not None:
+        reader = PdfReader(str(pdf_path))
+        texts = [page.extract_text() or '' for page in reader.pages]
+        try:
+            labels = _numeric_labels(reader.page_labels)
+        except Exception:
+            labels = []
+        if len(labels) != len(texts) or all(n is None for n in labels):
+            labels = list(range(1, len(texts) + 1))
+        return texts, labels
+    if shutil.which('pdftotext'):
+        result = subprocess.run(['pdftotext', '-enc', 'UTF-8', str(pdf_path), '-'],
+                                capture_output=True, check=True)
+        texts = result.stdout.decode('utf-8', errors='replace').split('\f')
+        if texts and not texts[-1].strip():
+            texts.pop()
+        return texts, list(range(1, len(texts) + 1))
+    raise RuntimeError("reading PDFs needs pypdf (pip install pypdf) or poppler's pdftotext")
+
+
+def resolve_pages(pages: Sequence[str], labels: Sequence[Optional[int]],
+                  para_texts: Dict[int, str]) -> Dict[int, int]:
+    """
+    Page number of each paragraph in para_texts found in the page texts.
+
+    Args:
+        pages: Text of each PDF page, in order
+        labels: Page number of each page (None: unnumbered, paragraphs there are not resolved)
+        para_texts: para_index -> paragraph text
+
+    Returns:
+        Dict mapping para_index -> page number for the paragraphs found
+    """
+    waiting: Dict[str, List[int]] = {}  # key -> paragraphs with that key, in document order
+    automaton = Automaton()
+    for idx in sorted(para_texts):
+        key = normalize(para_texts[idx])[:KEY_LENGTH]
+        if len(key) < MIN_KEY_LENGTH:
+            continue
+        if key not in waiting:
+            waiting[key] = []
+            automaton.add(key, key)
+        waiting[key].append(idx)
+    if not waiting:
+        return {}
+
+    starts = []
+    parts = []
+    offset = 0
+    for text in pages:
+        starts.append(offset)
+        normalized = normalize(text)
+        parts.append(normalized)
+        offset += len(normalized)
+    volume = ''.join(parts)
+
+    found: Dict[str, List[int]] = {key: [] for key in waiting}  # key -> start offsets in the volume text
+    for start, _, key in automaton.iter_spans(volume):
+        found[key].append(start)
+
+    page_map = {}
+    for key, paragraphs in waiting.items():
+        occurrences = found[key]
+        # Repeated text is only placed when every copy is accounted for; otherwise leave it to COM / XML
+        if len(occurrences) != len(paragraphs):
+            continue
+        for idx, start in zip(paragraphs, occurrences):
+            page = labels[bisect_right(starts, start) - 1]
+            if page is not None:
+                page_map[idx] = page
+    return page_map
+
+
+def page_numbers_from_pdf(doc_path: str, pdf_path: str, indices: Iterable[int]) -> Dict[int, int]:
+    """Worker: page numbers of paragraphs (python-docx indices) of doc_path found in pdf_path."""
+    view = DocumentView(Document(doc_path))
+    para_texts = {idx: view.text(idx) for idx in indices if idx < len(view)}
+    pages, labels = read_pdf_pages(Path(pdf_path))
+    return resolve_pages(pages, labels, para_texts)
+
+
+def resolve_documents(jobs: Dict[str, Tuple[Path, List[int]]],
+                      workers: Optional[int] = None) -> Dict[str, Dict[int, int]]:
+    """
+    Resolve several documents against their PDFs in parallel.
+
+    Args:
+        jobs: doc path -> (PDF path, paragraph indices)
+        workers: Processes (default: CPU count, at most one per document)
+
+    Returns:
+        doc path -> {para_index: page number}; documents whose PDF failed are left out
+    """
+    results = {}
+    if not jobs:
+        return results
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        futures = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = {doc: pool.submit(page_numbers_from_pdf, doc, str(pdf), indices)
+                   for doc, (pdf, indices) in jobs.items()}
+    try:
+        for doc, (pdf, indices) in jobs.items():
+            try:
+                if futures is None:
+                    results[doc] = page_numbers_from_pdf(doc, str(pdf), indices)
+                else:
+                    results[doc] = futures[doc].result()
+            except Exception as e:
+                logging.warning(f"    PDF page lookup failed for {Path(doc).name} ({Path(pdf).name}): {e}")
+                continue
+            logging.info(f"    PDF: {Path(doc).name}: {len(results[doc])}/{len(indices)} page numbers "
+                         f"from {Path(pdf).name}")
+    finally:
+        if futures is not None:
+            pool.shutdown()
+    return results
+
+
+def volume_pdfs(conn, docx_files: Iterable[Path], pdf_dir: Optional[Path] = None) -> Dict[str, Path]:
+    """
+    The published PDF of each document that has one.
+
+    yy_volume_pdf (matched to the document like YyTranslationLoader.volume_for) is
+    used as is when absolute, else relative to pdf_dir; a <document stem>.pdf in
+    pdf_dir is used for volumes without one.
+
+    Returns:
+        Absolute document path -> existing PDF path
+    """
+    configured = {}
+    if conn is not None and not conn.closed:
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT yy_volume_file, yy_volume_name, yy_volume_pdf FROM yy_volume "
+                        "WHERE yy_volume_pdf IS NOT NULL AND yy_volume_pdf <> ''")
+            for file_name, name, pdf in cur.fetchall():
+                for label in (name, file_name):
+                    if label:
+                        configured[normalize_book(label.rsplit('.docx', 1)[0])] = pdf
+            cur.close()
+            conn.commit()
+        except psycopg2.Error as e:
+            if not conn.closed:
+                conn.rollback()
+            logging.debug(f"yy_volume_pdf not available: {e}")
+
+    pdfs = {}
+    for doc_path in docx_files:
+        candidates = []
+        pdf = configured.get(normalize_book(doc_path.stem))
+        if pdf:
+            candidates.append(Path(pdf) if Path(pdf).is_absolute() or pdf_dir is None else pdf_dir / pdf)
+        if pdf_dir is not None:
+            candidates.append(pdf_dir / f"{doc_path.stem}.pdf")
+        for candidate in candidates:
+            if candidate.is_file():
+                pdfs[str(doc_path.absolute())] = candidate
+                break
+    return pdfs
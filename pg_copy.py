@@ -0,0 +1,79 @@
+"""
+Bulk-load helpers built on PostgreSQL COPY.
+- copy_rows streams rows into a table in COPY text format
+- copy_into_temp stages rows in a temp table shaped like a real table
+- upsert_rows stages rows and merges them with INSERT ... ON CONFLICT DO UPDATE
+"""
+import io
+
+
+def copy_text_value(value) -> str:
+    """Render one value for COPY text format (NULL as \\N, tabs/newlines escaped)."""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    text = str(value)
+    if '\\' in text or '\t' in text or '\n' in text or '\r' in text:
+        text = (text.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+    return text
+
+
+def copy_rows(cur, table: str, columns, rows) -> int:
+    """
+    COPY rows (sequences in column order) into table.
+
+    Returns:
+        Number of rows sent
+    """
+    buf = io.StringIO()
+    count = 0
+    for row in rows:
+        buf.write('\t'.join(copy_text_value(v) for v in row))
+        buf.write('\n')
+        count += 1
+    if not count:
+        return 0
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+    return count
+
+
+def copy_into_temp(cur, temp_table: str, source_table: str, columns, rows) -> int:
+    """Create temp_table with the types of source_table's columns (dropped on commit) and COPY rows into it."""
+    cur.execute(f"DROP TABLE IF EXISTS {temp_table}")
+    cur.execute(f"""
+        CREATE TEMP TABLE {temp_table} ON COMMIT DROP AS
+        SELECT {', '.join(columns)} FROM {source_table} WITH NO DATA
+    """)
+    return copy_rows(cur, temp_table, columns, rows)
+
+
+def upsert_rows(cur, table: str, key_columns, columns, rows) -> int:
+    """
+    Insert rows into table, updating non-key columns where the key already exists.
+
+    Requires a unique constraint on key_columns. Runs inside the caller's transaction.
+
+    Rows identical to the existing one are left alone (no dead tuple, no trigger).
+
+    Returns:
+        Number of rows inserted or changed
+    """
+    temp_table = f"tmp_upsert_{table}"
+    copy_into_temp(cur, temp_table, table, columns, rows)
+    col_list = ', '.join(columns)
+    values = [c for c in columns if c not in key_columns]
+    updates = ', '.join(f"{c} = EXCLUDED.{c}" for c in values)
+    changed = (f"({', '.join(f'{table}.{c}' for c in values)}) IS DISTINCT FROM "
+               f"({', '.join(f'EXCLUDED.{c}' for c in values)})")
+    conflict = f"DO UPDATE SET {updates} WHERE {changed}" if values else "DO NOTHING"
+    cur.execute(f"""
+        INSERT INTO {table} ({col_list})
+        SELECT {col_list} FROM {temp_table}
+        ON CONFLICT ({', '.join(key_columns)}) {conflict}
+    """)
+    return cur.rowcount
@@ -408,13 +408,44 @@ $(function () {
         }
     }
 
-    function loadImportedTranslations(chapterNum, verseNum) {
-        if (!currentScrollKey) return;
+    // Chapter bundles pre-rendered by build_bundles.py; the manifest maps "scroll/chapter" to its etag
+    var bundleManifest = null;
+
+    function loadBundleManifest() {
+        if (!bundleManifest) {
+            bundleManifest = $.ajax({ url: '/bundles/manifest.json', dataType: 'json' });
+        }
+        return bundleManifest;
+    }
+
+    // The verse's published translations from its chapter bundle, or from display-translations.php
+    // when the chapter has no bundle (not built yet, or no manifest at all)
+    function fetchImportedTranslations(chapterNum, verseNum) {
+        var result = $.Deferred();
         var url = 'display-translations.php?scroll_key=' + currentScrollKey +
             '&chapter=' + encodeURIComponent(chapterNum) +
             '&verse=' + encodeURIComponent(verseNum);
+        var fromApi = function () {
+            $.ajax({ url: '/api/' + url, dataType: 'json' }).done(result.resolve).fail(result.reject);
+        };
+        var name = currentScrollKey + '/' + parseInt(chapterNum, 10);
+        var verse = parseInt(verseNum, 10);
+        loadBundleManifest().done(function (manifest) {
+            var entry = manifest && manifest.bundles ? manifest.bundles[name] : null;
+            if (!entry) { fromApi(); return; }
+            $.ajax({ url: '/bundles/' + name + '.json?v=' + entry.etag, dataType: 'json' }).done(function (bundle) {
+                result.resolve($.grep(bundle.translations, function (t) {
+                    return t.translation_verses.indexOf(verse) !== -1;
+                }));
+            }).fail(fromApi);
+        }).fail(fromApi);
+        return result.promise();
+    }
+
+    function loadImportedTranslations(chapterNum, verseNum) {
+        if (!currentScrollKey) return;
         console.log('[WordPopup] loadImportedTranslations: scroll=' + currentScrollKey + ' ch=' + chapterNum + ' v=' + verseNum);
-        $.ajax({ url: '/api/' + url, dataType: 'json' }).done(function (data) {
+        fetchImportedTranslations(chapterNum, verseNum).done(function (data) {
             console.log('[WordPopup] display-translations returned ' + (data ? data.length : 0) + ' translations');
             if (!data || data.length === 0) {
                 $('#imported-translations-section').hide();
@@ -422,9 +453,11 @@ $(function () {
             }
             $('#imported-translations-title').text('Published Translations (' + data.length + ')');
 
-            // Collect all italic words from all translations (via regex on the HTML)
+            // Collect all italic words from the translations without build-time word links
+            // (build_word_tags.py; rows edited or imported since have none and are looked up live)
             var wordsMap = {};
             $.each(data, function (_, t) {
+                if (t.translation_words && t.translation_words.length) return;
                 var html = t.translation_text_word || '';
                 var re = /<i[^>]*>([^<]+)<\/i>/gi;
                 var m;
@@ -473,8 +506,20 @@ $(function () {
             if (t.translation_book) meta += '<span><strong>Source:</strong> ' + escHtml(t.translation_book) + '</span>';
             if (t.translation_page) meta += '<span><strong>Pg:</strong> ' + escHtml(t.translation_page) + '</span>';
             var html = t.translation_text_word || '';
-            // Embed word links directly in the HTML before inserting into DOM
-            if (wordLookup && !$.isEmptyObject(wordLookup)) {
+            if (t.translation_words && t.translation_words.length) {
+                // [start, end, word_id] offsets into the copy; splice from the end so earlier offsets stay valid
+                for (var k = t.translation_words.length - 1; k >= 0; k--) {
+                    var tag = t.translation_words[k];
+                    var tagged = t.words[tag[2]];
+                    if (!tagged) continue;
+                    var tid = 'w' + (++wordInfoCounter);
+                    wordInfoStore[tid] = tagged;
+                    linked++;
+                    html = html.slice(0, tag[0]) + '<span class="word-link" data-wid="' + tid + '">' +
+                        html.slice(tag[0], tag[1]) + '</span>' + html.slice(tag[1]);
+                }
+            } else if (wordLookup && !$.isEmptyObject(wordLookup)) {
+                // Embed word links directly in the HTML before inserting into DOM
                 html = html.replace(/<i([^>]*)>([^<]+)<\/i>/gi, function (full, attrs, text) {
                     var raw = text.trim();
                     if (!raw) return full;
@@ -506,6 +551,11 @@ $(function () {
             $list.append(card);
         });
         var matchCount = wordLookup ? Object.keys(wordLookup).length : 0;
+        if (!wordLookup) {
+            var tagged = {};
+            $.each(translations, function (_, t) { $.extend(tagged, t.words || {}); });
+            matchCount = Object.keys(tagged).length;
+        }
         console.log('[WordPopup] renderImportedCards: ' + matchCount + ' definitions, ' + linked + ' linked words, wordInfoStore keys:', Object.keys(wordInfoStore).length);
         if (linked > 0) {
             $status.html(matchCount + ' word definitions found, ' + linked + ' clickable words <span style="color:#3498db;">(click any dotted-underlined word)</span>');
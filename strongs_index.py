@@ -0,0 +1,310 @@
+"""
+Compiled Strong's Hebrew lexicon index shared by the Strong's tools.
+- Compiles the OpenScriptures dictionary (strongs-hebrew.js/json, a JS
+  assignment around one JSON object) and the lexiconcordance scrape
+  (strongs_scraped.json) into one SQLite file
+- entry holds every source entry as JSON under its Strong's key; term holds
+  the normalized lookup keys (xlit, pron, lemma, scraped spellings) with the
+  entry they lead to, in a clustered (kind, term) primary key
+- Hebrew is also keyed by consonantal skeleton: niqqud and cantillation
+  (U+0591-U+05C7) stripped, final letter forms folded, letters only, so a
+  pointed or unpointed word with any vowel marks finds its lemma in one probe;
+  prefix_variants() adds the skeleton without prefixed particles
+- Tools open the file read-only and memory-mapped and look keys up with one
+  indexed query instead of parsing and re-indexing the sources every run
+- The index records the size and mtime of the sources it was built from;
+  open_index() rebuilds it when a source has changed
+
+    python strongs_index.py
+    index = open_index()
+    index.lookup(TRANSLIT, normalize_xlit("'elohiym"))   # [('H430', {...})]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+SOURCE_DIR = r"C:\Users\Joe\Work\dev\yada\translations"
+OPENSCRIPTURES_FILE = os.path.join(SOURCE_DIR, "strongs-hebrew.json")
+SCRAPED_FILE = os.path.join(SOURCE_DIR, "strongs_scraped.json")
+INDEX_FILE = os.path.join(SOURCE_DIR, "strongs_index.sqlite")
+
+INDEX_VERSION = 2
+OPENSCRIPTURES = 'openscriptures'
+SCRAPED = 'scraped'
+
+# term kinds
+XLIT = 'xlit'
+PRON = 'pron'
+LEMMA = 'lemma'
+SPELLING = 'spelling'
+SKELETON = 'skeleton'
+TRANSLIT = (XLIT, PRON)
+
+MMAP_SIZE = 256 * 1024 * 1024
+
+APOSTROPHES = str.maketrans({'\u2019': "'", '\u2018': "'", '\u02bc': "'", '\u02be': "'", '\u02bf': "'"})
+
+# Hebrew: points and accents U+0591-U+05C7 removed, final forms (kaf, mem, nun, pe, tsadi) folded
+HEBREW_MARKS = {cp: None for cp in range(0x0591, 0x05C8)}
+HEBREW_FINALS = {0x05DA: 0x05DB, 0x05DD: 0x05DE, 0x05DF: 0x05E0, 0x05E3: 0x05E4, 0x05E5: 0x05E6}
+SKELETON_TABLE = {**HEBREW_MARKS, **HEBREW_FINALS}
+ALEF, TAV = '\u05d0', '\u05ea'
+# Prefixed particles: ve- (and), ha- (the), be-/ke-/le- (in, as, to), mi- (from), she- (that)
+PREFIXES = ('\u05d5', '\u05d4', '\u05d1', '\u05db', '\u05dc', '\u05de', '\u05e9')
+MIN_STEM = 2
+
+
+def _strip_marks(text: str) -> str:
+    text = unicodedata.normalize('NFD', text)
+    return ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+
+
+def normalize_xlit(text: str) -> str:
+    """OpenScriptures xlit / pron key: no diacritics, lowercase, apostrophes unified, no hyphens."""
+    return _strip_marks(text).lower().translate(APOSTROPHES).replace('-', '')
+
+
+def normalize_spelling(text: str) -> str:
+    """Scraped spelling key as matched against yy_word_spelling (lexiconcordance's @ sheva dropped)."""
+    return _strip_marks(text).lower().translate(APOSTROPHES).replace('@', '')
+
+
+def hebrew_skeleton(text: str) -> str:
+    """Consonants only: niqqud and cantillation dropped, final forms folded, anything but Hebrew letters removed."""
+    text = unicodedata.normalize('NFC', text or '').translate(SKELETON_TABLE)
+    return ''.join(ch for ch in text if ALEF <= ch <= TAV)
+
+
+def prefix_variants(skeleton: str, depth: int = 2) -> List[str]:
+    """skeleton with up to depth leading particle letters removed (ve-ha-, be-, ...), longest first, itself excluded."""
+    variants = []
+    stem = skeleton
+    for _ in range(depth):
+        if len(stem) - 1 < MIN_STEM or stem[0] not in PREFIXES:
+            break
+        stem = stem[1:]
+        variants.append(stem)
+    return variants
+
+
+def load_openscriptures(path: str) -> Dict[str, dict]:
+    """The JSON object of the OpenScriptures file, whose JS wrapper ('var strongsHebrewDictionary = {...};') is cut off."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    json_start = content.index("{", content.index("=")) if "=" in content else content.index("{")
+    json_end = content.rindex("}") + 1
+    return json.loads(content[json_start:json_end])
+
+
+def load_scraped(path: str) -> List[dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _source_stamps(paths: Sequence[str]) -> Dict[str, List[int]]:
+    stamps = {}
+    for path in paths:
+        if path and os.path.exists(path):
+            st = os.stat(path)
+            stamps[os.path.abspath(path)] = [st.st_size, st.st_mtime_ns]
+    return stamps
+
+
+def build(output: str = INDEX_FILE, openscriptures: Optional[str] = OPENSCRIPTURES_FILE,
+          scraped: Optional[str] = SCRAPED_FILE) -> Dict[str, int]:
+    """
+    Compile the available sources into output (written to a temp file, then swapped in).
+
+    Returns:
+        Dict with entries and terms counts
+    """
+    tmp = output + '.tmp'
+    if os.path.exists(tmp):
+        os.unlink(tmp)
+    conn = sqlite3.connect(tmp)
+    conn.executescript("""
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE entry (
+            source TEXT NOT NULL,
+            key TEXT NOT NULL,
+            sort INTEGER NOT NULL,
+            body TEXT NOT NULL,
+            PRIMARY KEY (source, key)
+        ) WITHOUT ROWID;
+        CREATE TABLE term (
+            kind TEXT NOT NULL,
+            term TEXT NOT NULL,
+            source TEXT NOT NULL,
+            key TEXT NOT NULL,
+            sort INTEGER NOT NULL,
+            PRIMARY KEY (kind, term, source, key)
+        ) WITHOUT ROWID;
+    """)
+    entries, terms = [], []
+
+    if openscriptures and os.path.exists(openscriptures):
+        for sort, (key, entry) in enumerate(load_openscriptures(openscriptures).items()):
+            entries.append((OPENSCRIPTURES, key, sort, json.dumps(entry, ensure_ascii=False)))
+            for kind in TRANSLIT:
+                if entry.get(kind):
+                    terms.append((kind, normalize_xlit(entry[kind]), OPENSCRIPTURES, key, sort))
+            if entry.get('lemma'):
+                terms.append((LEMMA, entry['lemma'], OPENSCRIPTURES, key, sort))
+                skeleton = hebrew_skeleton(entry['lemma'])
+                if skeleton:
+                    terms.append((SKELETON, skeleton, OPENSCRIPTURES, key, sort))
+
+    if scraped and os.path.exists(scraped):
+        for sort, entry in enumerate(load_scraped(scraped)):
+            key = entry['strongs']
+            entries.append((SCRAPED, key, sort, json.dumps(entry, ensure_ascii=False)))
+            for spelling in entry.get('spellings') or ():
+                for variant in (spelling, spelling.replace('@', "'")):
+                    terms.append((SPELLING, normalize_spelling(variant), SCRAPED, key, sort))
+            for hebrew in entry.get('hebrew') or ():
+                skeleton = hebrew_skeleton(hebrew)
+                if skeleton:
+                    terms.append((SKELETON, skeleton, SCRAPED, key, sort))
+
+    # INSERT OR IGNORE keeps the first (lowest sort) row per key, i.e. source file order
+    conn.executemany("INSERT OR IGNORE INTO entry VALUES (?, ?, ?, ?)", entries)
+    conn.executemany("INSERT OR IGNORE INTO term VALUES (?, ?, ?, ?, ?)", terms)
+    conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+        ('version', str(INDEX_VERSION)),
+        ('sources', json.dumps(_source_stamps([openscriptures, scraped]))),
+        ('built', time.strftime('%Y-%m-%d %H:%M:%S')),
+    ])
+    conn.commit()
+    counts = {
+        'entries': conn.execute("SELECT COUNT(*) FROM entry").fetchone()[0],
+        'terms': conn.execute("SELECT COUNT(*) FROM term").fetchone()[0],
+    }
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmp, output)
+    return counts
+
+
+class StrongsIndex:
+    """Read-only view of a compiled index file."""
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(Path(path).resolve().as_uri() + '?mode=ro', uri=True, check_same_thread=False)
+        self.conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        self.conn.execute("PRAGMA query_only = 1")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def meta(self, name: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def is_current(self, sources: Sequence[str]) -> bool:
+        """Built by this version from exactly these sources as they are now."""
+        return (self.meta('version') == str(INDEX_VERSION)
+                and json.loads(self.meta('sources') or '{}') == _source_stamps(sources))
+
+    def entry(self, key: str, source: str = OPENSCRIPTURES) -> Optional[dict]:
+        row = self.conn.execute("SELECT body FROM entry WHERE source = ? AND key = ?", (source, key)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def entries(self, source: str = SCRAPED) -> Iterator[dict]:
+        """Every entry of source in its original file order."""
+        for (body,) in self.conn.execute("SELECT body FROM entry WHERE source = ? ORDER BY sort", (source,)):
+            yield json.loads(body)
+
+    def keys(self, kinds, term: str) -> List[str]:
+        """Strong's keys reached by term under any of kinds, in source order."""
+        kinds = (kinds,) if isinstance(kinds, str) else tuple(kinds)
+        rows = self.conn.execute(
+            f"SELECT DISTINCT key, sort FROM term WHERE kind IN ({','.join('?' * len(kinds))}) AND term = ? "
+            f"ORDER BY sort", (*kinds, term)).fetchall()
+        return [key for key, _ in rows]
+
+    def lookup(self, kinds, term: str) -> List[Tuple[str, dict]]:
+        """(Strong's key, entry) pairs reached by term under any of kinds, in source order."""
+        kinds = (kinds,) if isinstance(kinds, str) else tuple(kinds)
+        rows = self.conn.execute(
+            f"SELECT DISTINCT e.key, e.body, e.sort FROM term t JOIN entry e ON e.source = t.source AND e.key = t.key "
+            f"WHERE t.kind IN ({','.join('?' * len(kinds))}) AND t.term = ? ORDER BY e.sort", (*kinds, term)).fetchall()
+        return [(key, json.loads(body)) for key, body, _ in rows]
+
+    def terms(self, kinds) -> 'TermView':
+        return TermView(self, kinds)
+
+    def term_map(self, kind: str) -> Dict[str, List[Tuple[str, str]]]:
+        """Every term of kind -> [(source, key)] in source order, in one query, for batch probing."""
+        mapping: Dict[str, List[Tuple[str, str]]] = {}
+        for term, source, key in self.conn.execute(
+                "SELECT term, source, key FROM term WHERE kind = ? ORDER BY term, sort", (kind,)):
+            mapping.setdefault(term, []).append((source, key))
+        return mapping
+
+
+class TermView:
+    """dict-style access (in, [], get) to the lookup of one or more term kinds."""
+
+    def __init__(self, index: StrongsIndex, kinds):
+        self.index = index
+        self.kinds = kinds
+
+    def __contains__(self, term: str) -> bool:
+        return bool(self.index.keys(self.kinds, term))
+
+    def __getitem__(self, term: str) -> List[Tuple[str, dict]]:
+        found = self.index.lookup(self.kinds, term)
+        if not found:
+            raise KeyError(term)
+        return found
+
+    def get(self, term: str, default=None):
+        found = self.index.lookup(self.kinds, term)
+        return found if found else default
+
+
+def open_index(path: str = INDEX_FILE, openscriptures: Optional[str] = OPENSCRIPTURES_FILE,
+               scraped: Optional[str] = SCRAPED_FILE, rebuild: bool = True) -> StrongsIndex:
+    """
+    Open the compiled index, (re)building it first if it is missing or older than its sources.
+
+    Raises:
+        FileNotFoundError if there is no index and no source to build it from
+    """
+    sources = [p for p in (openscriptures, scraped) if p]
+    if os.path.exists(path):
+        index = StrongsIndex(path)
+        if not rebuild or index.is_current(sources):
+            return index
+        index.close()
+    if not any(os.path.exists(p) for p in sources):
+        raise FileNotFoundError(f"No Strong's index at {path} and no source to build it from")
+    build(path, openscriptures, scraped)
+    return StrongsIndex(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the Strong's Hebrew sources into a SQLite lookup index")
+    parser.add_argument('--openscriptures', default=OPENSCRIPTURES_FILE, help="OpenScriptures strongs-hebrew JS/JSON file")
+    parser.add_argument('--scraped', default=SCRAPED_FILE, help="strongs_scraped.json from scrape_strongs.py")
+    parser.add_argument('--output', default=INDEX_FILE, help=f"Index file (default: {INDEX_FILE})")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    counts = build(args.output, args.openscriptures, args.scraped)
+    print(f"Entries:  {counts['entries']}")
+    print(f"Terms:    {counts['terms']}")
+    print(f"Index:    {args.output}")
+    print(f"Elapsed:  {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Shared fixtures for the test suite.
+- The modules are flat top-level scripts, so the repository root goes on sys.path
+- Documents are built with python-docx in tmp_path; nothing here needs
+  PostgreSQL, Word or the Strong's sources
+
+    pip install pytest
+    python -m pytest -q
+"""
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    """The extractor logs every translation at INFO; keep test output to failures."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def add_quote(doc, lead: str, text: str, cite: str, bold_text: bool = True):
+    """Paragraph 'lead \u201ctext\u201d (cite)' with bold curly quotes, as the volumes format translations."""
+    p = doc.add_paragraph()
+    if lead:
+        p.add_run(lead)
+    p.add_run('\u201c').bold = True
+    p.add_run(text).bold = bold_text
+    p.add_run('\u201d').bold = True
+    if cite:
+        p.add_run(f' ({cite})')
+    return p
@@ -0,0 +1,43 @@
+"""Automaton matches against a naive scan of every pattern."""
+import random
+
+import pytest
+
+from aho_corasick import Automaton
+
+
+def naive_spans(patterns, text):
+    return sorted((i, i + len(p), value) for p, value in patterns
+                  for i in range(len(text) - len(p) + 1) if text.startswith(p, i))
+
+
+def test_docstring_example():
+    automaton = Automaton()
+    automaton.add('he', 1)
+    automaton.add('she', 2)
+    automaton.build()
+    assert list(automaton.iter('ushers')) == [(3, 2), (3, 1)]
+    assert sorted(automaton.iter_spans('ushers')) == [(1, 4, 2), (2, 4, 1)]
+    assert len(automaton) == 2
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_naive_scan(seed):
+    rng = random.Random(seed)
+    patterns = [(''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))), n) for n in range(rng.randint(1, 12))]
+    text = ''.join(rng.choice('abcd') for _ in range(200))
+    automaton = Automaton()
+    for pattern, value in patterns:
+        automaton.add(pattern, value)
+    assert sorted(automaton.iter_spans(text)) == naive_spans(patterns, text)
+    assert sorted(automaton.iter(text)) == sorted((end - 1, value) for _, end, value in naive_spans(patterns, text))
+
+
+def test_rejects_empty_and_late_patterns():
+    automaton = Automaton()
+    with pytest.raises(ValueError):
+        automaton.add('')
+    automaton.add('a')
+    automaton.build()
+    with pytest.raises(RuntimeError):
+        automaton.add('b')
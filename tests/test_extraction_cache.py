@@ -0,0 +1,116 @@
+"""
+Resume planning and the differential check of cached against full extraction.
+
+The differential test is the mutation harness: random documents are edited
+step by step (paragraphs rewritten, inserted, deleted, appended) and after
+every save the cached, resumed extraction must equal a fresh one, with and
+without chapter detection.
+"""
+import random
+
+import pytest
+from docx import Document
+
+import parse_word_translations as pwt
+from extraction_cache import CachedExtraction, ExtractionCache, plan_resume
+
+
+def cached(hashes, checkpoints):
+    previous = CachedExtraction(b'', False)
+    previous.hashes = list(hashes)
+    previous.checkpoints = list(checkpoints)
+    return previous
+
+
+def test_plan_resume_unchanged():
+    plan = plan_resume(cached(b'abcdef', [0, 2, 4, 6]), list(b'abcdef'))
+    assert (plan.start, plan.changed_end, plan.shift) == (6, 6, 0)
+    assert plan.converged(plan.start)
+
+
+def test_plan_resume_edit_resumes_at_checkpoint_before_change():
+    plan = plan_resume(cached(b'abcdef', [0, 2, 4, 6]), list(b'abcXef'))
+    assert (plan.start, plan.changed_end, plan.shift) == (2, 4, 0)
+    assert not plan.converged(3)
+    assert plan.converged(4)
+
+
+def test_plan_resume_insert_shifts_tail():
+    plan = plan_resume(cached(b'abcdef', [0, 2, 4, 6]), list(b'abXYcdef'))
+    assert (plan.start, plan.changed_end, plan.shift) == (2, 4, 2)
+    # New boundary 6 is old boundary 4, a checkpoint; new 5 is old 3, which was not
+    assert not plan.converged(5)
+    assert plan.converged(6)
+
+
+def test_plan_resume_delete_and_append():
+    plan = plan_resume(cached(b'abcdef', [0, 3, 6]), list(b'abdef'))
+    assert (plan.start, plan.changed_end, plan.shift) == (0, 2, -1)
+    assert plan.converged(2)
+    plan = plan_resume(cached(b'abc', [0, 3]), list(b'abcd'))
+    assert (plan.start, plan.changed_end, plan.shift) == (3, 4, 1)
+    assert not plan.converged(3)
+    assert plan.converged(4)
+
+
+TOKENS = ['\u201c', '\u201d', ' (Psalm 3:4)', ' (6:18)', '(x (1:2))', 'word ', 'more text ', 'x', '  ', '',
+          ' (note)', '\u201c\u201d', ')', '(']
+
+
+def fill(paragraph, rng, doc):
+    """Random runs of quotes, cites and words, bold and italic at random; sometimes a chapter heading."""
+    if rng.random() < 0.1:
+        paragraph.style = doc.styles['Heading 1']
+        paragraph.add_run(str(rng.randint(1, 9)))
+        return
+    for _ in range(rng.randint(0, 6)):
+        run = paragraph.add_run(''.join(rng.choice(TOKENS) for _ in range(rng.randint(0, 3))))
+        b = rng.random()
+        if b < 0.4:
+            run.bold = True
+        elif b < 0.5:
+            run.bold = False
+        if rng.random() < 0.2:
+            run.italic = True
+
+
+def mutate(doc, rng):
+    paragraphs = doc.paragraphs
+    op = rng.random()
+    i = rng.randrange(len(paragraphs)) if paragraphs else 0
+    if op < 0.4 and paragraphs:
+        p = paragraphs[i]
+        for run in list(p._p.r_lst):
+            p._p.remove(run)
+        fill(p, rng, doc)
+    elif op < 0.7 and paragraphs:
+        fill(paragraphs[i].insert_paragraph_before(), rng, doc)
+    elif op < 0.9 and len(paragraphs) > 1:
+        paragraphs[i]._p.getparent().remove(paragraphs[i]._p)
+    else:
+        fill(doc.add_paragraph(), rng, doc)
+
+
+def structure_key(structure):
+    return structure.chapter_paras, structure.chapter_numbers, structure.section_paras, structure.page_paras
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_cached_extraction_matches_full(tmp_path, seed):
+    rng = random.Random(seed)
+    doc = Document()
+    for _ in range(rng.randint(5, 80)):
+        fill(doc.add_paragraph(), rng, doc)
+    path = tmp_path / f'YY-fuzz{seed}.docx'
+    caches = {detect: ExtractionCache(tmp_path / f'cache-{detect}') for detect in (False, True)}
+    for step in range(8):
+        doc.save(str(path))
+        for detect, cache in caches.items():
+            got = pwt.extract_translations_from_doc(path, detect_chapters=detect, cache=cache)
+            ref = pwt.extract_translations_from_doc(path, detect_chapters=detect)
+            if detect:
+                (got, got_structure), (ref, ref_structure) = got, ref
+                assert structure_key(got_structure) == structure_key(ref_structure), f"step {step}"
+            assert [t.to_dict() for t in got] == [t.to_dict() for t in ref], f"step {step}, chapters {detect}"
+        for _ in range(rng.randint(1, 3)):
+            mutate(doc, rng)
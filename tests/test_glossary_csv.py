@@ -0,0 +1,79 @@
+"""Glossary export parsing, validation and the COPY / upsert SQL it is loaded with."""
+import pg_copy
+from glossary_csv import read_spellings, read_words, validate_spellings, validate_words, word_warnings
+
+WORDS_CSV = (
+    'word_id,word_strongs,word_hebrew,word_yt,word_flag_gender_m,word_flag_gender_f,word_flag_plural,'
+    'word_flag_noun,word_flag_verb,word_flag_adjective,word_flag_adverb,word_flag_preposition,'
+    'word_flag_conjunction,word_flag_subst,word_definition,\n'
+    '1,0430,\u05d0\u05dc\u05d4\u05d9\u05dd,\'elohym,1,,1,1,,,,,,,God,\n'
+    '2,,\u05e9\u05de\u05e8,shamar,,,,,1,,,,,,to observe,\n'
+    '3,,,towrah,,1,,1,,,,,,,,\n'
+    ',,,,,,,,,,,,,,,\n'
+)
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.sql = []
+        self.copied = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.sql.append(' '.join(sql.split()))
+
+    def copy_expert(self, sql, buf):
+        self.sql.append(sql)
+        self.copied.append(buf.read())
+
+
+def test_read_words(tmp_path):
+    path = tmp_path / 'words.csv'
+    path.write_text(WORDS_CSV, encoding='utf-8-sig')
+    cols = read_words(str(path))
+    assert cols['word_id'] == [1, 2, 3]
+    assert cols['word_strongs'] == ['0430', None, None]
+    assert cols['word_flag_gender_m'] == [True, None, None]
+    assert cols['word_definition'] == ['God', 'to observe', None]
+
+
+def test_incomplete_words_are_warned_not_rejected(tmp_path):
+    path = tmp_path / 'words.csv'
+    path.write_text(WORDS_CSV, encoding='utf-8-sig')
+    cols = read_words(str(path))
+    assert validate_words(cols) == []
+    assert word_warnings(cols) == ["word_id 2: no Strong's number.", "word_id 3: no Strong's number.",
+                                   'word_id 3: no Hebrew text.']
+
+
+def test_duplicates_are_rejected(tmp_path):
+    assert validate_words({'word_id': [1, 2, 1], 'word_strongs': ['1', '2', '3'],
+                           'word_hebrew': ['a', 'b', 'c']}) == ['Duplicate word_id 1.']
+    path = tmp_path / 'spellings.csv'
+    path.write_text('word_id,spellings\n1,"towrah\ntorah\n\ntowrah"\n', encoding='utf-8-sig')
+    cols = read_spellings(str(path))
+    assert cols['word_spelling_sort'] == [0, 1, 2]
+    assert validate_spellings(cols) == ["word_id 1: duplicate spelling 'towrah'."]
+
+
+def test_copy_text_value_escapes():
+    assert pg_copy.copy_text_value(None) == '\\N'
+    assert pg_copy.copy_text_value(True) == 't'
+    assert pg_copy.copy_text_value('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
+
+
+def test_copy_rows_streams_text_format():
+    cur = RecordingCursor()
+    assert pg_copy.copy_rows(cur, 't', ['a', 'b'], [(1, None), ('x\ty', False)]) == 2
+    assert cur.copied == ['1\t\\N\nx\\ty\tf\n']
+    assert pg_copy.copy_rows(cur, 't', ['a'], []) == 0
+
+
+def test_upsert_skips_unchanged_rows():
+    cur = RecordingCursor()
+    pg_copy.upsert_rows(cur, 'yy_word', ['word_id'], ['word_id', 'word_yt', 'word_hebrew'], [(1, 'x', 'y')])
+    assert cur.sql[-1].endswith(
+        'ON CONFLICT (word_id) DO UPDATE SET word_yt = EXCLUDED.word_yt, word_hebrew = EXCLUDED.word_hebrew '
+        'WHERE (yy_word.word_yt, yy_word.word_hebrew) IS DISTINCT FROM (EXCLUDED.word_yt, EXCLUDED.word_hebrew)')
+    pg_copy.upsert_rows(cur, 't', ['k'], ['k'], [(1,)])
+    assert cur.sql[-1].endswith('ON CONFLICT (k) DO NOTHING')
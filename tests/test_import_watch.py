@@ -0,0 +1,64 @@
+"""Debouncer settling and polled change detection for --watch."""
+import os
+
+from import_watch import Debouncer, DirectoryWatcher
+
+
+def write(path, data, mtime_ns):
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_path_settles_after_quiet_delay(tmp_path):
+    doc = tmp_path / 'YY-a.docx'
+    write(doc, b'one', 10 ** 18)
+    debouncer = Debouncer(delay=2.0)
+    debouncer.touch([doc], now=100.0)
+    assert debouncer.next_deadline() == 102.0
+    assert debouncer.due(101.9) == set()
+    assert debouncer.due(102.0) == {doc}
+    assert debouncer.next_deadline() is None
+
+
+def test_touch_again_restarts_the_wait(tmp_path):
+    doc = tmp_path / 'YY-a.docx'
+    write(doc, b'one', 10 ** 18)
+    debouncer = Debouncer(delay=2.0)
+    debouncer.touch([doc], now=100.0)
+    debouncer.touch([doc], now=101.0)
+    assert debouncer.due(102.5) == set()
+    assert debouncer.due(103.0) == {doc}
+
+
+def test_file_still_being_written_waits_again(tmp_path):
+    doc = tmp_path / 'YY-a.docx'
+    write(doc, b'one', 10 ** 18)
+    debouncer = Debouncer(delay=2.0)
+    debouncer.touch([doc], now=100.0)
+    write(doc, b'one two', 10 ** 18 + 1)
+    assert debouncer.due(102.0) == set()
+    assert debouncer.next_deadline() == 104.0
+    assert debouncer.due(104.0) == {doc}
+
+
+def test_deleted_file_is_dropped(tmp_path):
+    doc = tmp_path / 'YY-a.docx'
+    write(doc, b'one', 10 ** 18)
+    debouncer = Debouncer(delay=2.0)
+    debouncer.touch([doc], now=100.0)
+    doc.unlink()
+    assert debouncer.due(102.0) == set()
+    assert debouncer.pending == {}
+
+
+def test_polling_sees_only_changed_volumes(tmp_path):
+    volume = tmp_path / 'YY-a.docx'
+    write(volume, b'one', 10 ** 18)
+    watcher = DirectoryWatcher(tmp_path, poll_interval=0.0, polling=True)
+    assert watcher.poll(0.0) == set()
+    write(volume, b'two', 10 ** 18 + 1)
+    write(tmp_path / '~$YY-a.docx', b'lock', 10 ** 18)
+    write(tmp_path / 'YY-s07-skip.docx', b'skip', 10 ** 18)
+    write(tmp_path / 'YY-b.docx', b'new', 10 ** 18)
+    assert watcher.poll(0.0) == {volume, tmp_path / 'YY-b.docx'}
+    assert watcher.poll(0.0) == set()
@@ -0,0 +1,73 @@
+"""StrongsMatcher probes and the unique-link rules of link()."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import strongs_index
+from link_words_to_strongs import StrongsMatcher, link, strongs_number
+
+ELOHIM = '\u05d0\u05b1\u05dc\u05b9\u05d4\u05b4\u05d9\u05dd'
+ELOHIM_BARE = '\u05d0\u05dc\u05d4\u05d9\u05dd'
+VE_HA_ELOHIM = '\u05d5\u05b0\u05d4\u05b8' + ELOHIM
+AV_A = '\u05d0\u05b8\u05d1'     # two homographs with the same consonants
+AV_B = '\u05d0\u05b5\u05d1'
+DICTIONARY = {
+    'H430': {'lemma': ELOHIM, 'xlit': 'elohim'},
+    'H1': {'lemma': AV_A, 'xlit': 'ab'},
+    'H3': {'lemma': AV_B, 'xlit': 'eb'},
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    source = tmp_path / 'strongs-hebrew.json'
+    source.write_text(json.dumps(DICTIONARY), encoding='utf-8')
+    path = str(tmp_path / 'strongs_index.sqlite')
+    strongs_index.build(path, str(source), None)
+    index = strongs_index.StrongsIndex(path)
+    yield index
+    index.close()
+
+
+def test_strongs_number():
+    assert strongs_number('H430') == '0430'
+    assert strongs_number(' h7225 ') == '7225'
+
+
+def test_candidates(index):
+    matcher = StrongsMatcher(index)
+    assert matcher.candidates(ELOHIM) == ('lemma', ['0430'])
+    assert matcher.candidates(ELOHIM_BARE) == ('skeleton', ['0430'])
+    assert matcher.candidates(AV_A) == ('lemma', ['0001'])
+    assert matcher.candidates('\u05d0\u05d1') == ('skeleton', ['0001', '0003'])
+    assert matcher.candidates(VE_HA_ELOHIM) == (None, [])
+    assert matcher.candidates('abc') == (None, [])
+    assert StrongsMatcher(index, strip_prefixes=True).candidates(VE_HA_ELOHIM) == ('prefix', ['0430'])
+
+
+class WordsCursor:
+    """Serves link()'s two SELECTs: held numbers, then unlinked words."""
+
+    def __init__(self, held, words):
+        self.results = [held, words]
+
+    def execute(self, sql, params=None):
+        self.rows = self.results.pop(0)
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def test_link_dry_run_counts(index):
+    words = [(1, ELOHIM), (2, ELOHIM_BARE), (3, '\u05d0\u05d1'), (4, AV_B), (5, 'x')]
+    cursor = WordsCursor([('0003',)], words)
+    conn = SimpleNamespace(cursor=lambda: cursor, rollback=lambda: None)
+    stats = link(conn, StrongsMatcher(index), dry_run=True)
+    # Word 2 reaches 0430 after word 1 took it; word 4 reaches 0003, already held
+    assert {k: stats[k] for k in ('words', 'lemma', 'skeleton', 'ambiguous', 'taken', 'unmatched', 'updated')} == \
+        {'words': 5, 'lemma': 1, 'skeleton': 0, 'ambiguous': 1, 'taken': 2, 'unmatched': 1, 'updated': 0}
+    assert stats['ambiguous_words'] == [(3, '\u05d0\u05d1', ['0001', '0003'])]
@@ -0,0 +1,34 @@
+"""resolve_pages: paragraphs placed on PDF pages by normalized text."""
+from pdf_pages import normalize, resolve_pages
+
+LONG = [
+    'In the beginning Yahowah created the heavens and the earth, long enough to place.',
+    'The second paragraph is also comfortably longer than the minimum key.',
+    'A third paragraph that starts on one page and runs over onto the next one.',
+]
+
+
+def test_normalize_folds_ligatures_case_and_punctuation():
+    assert normalize('\ufb01nd \u201cIt\u201d-\nOut 1:2') == 'finditout12'
+
+
+def test_paragraphs_land_on_their_pages():
+    pages = [LONG[0] + '\n' + LONG[1][:30], LONG[1][30:] + ' ' + LONG[2][:20], LONG[2][20:]]
+    assert resolve_pages(pages, [1, 2, 3], dict(enumerate(LONG))) == {0: 1, 1: 1, 2: 2}
+
+
+def test_labels_and_unnumbered_pages():
+    pages = ['front matter ' + LONG[0], LONG[1]]
+    assert resolve_pages(pages, [None, 7], dict(enumerate(LONG[:2]))) == {1: 7}
+
+
+def test_short_and_missing_paragraphs_are_left_out():
+    pages = [LONG[0]]
+    assert resolve_pages(pages, [1], {0: LONG[0], 1: 'Too short.', 2: LONG[2]}) == {0: 1}
+
+
+def test_repeated_text_placed_only_when_every_copy_is_found():
+    quote = LONG[1]
+    pages = [quote, 'filler text', quote]
+    assert resolve_pages(pages, [1, 2, 3], {4: quote, 9: quote}) == {4: 1, 9: 3}
+    assert resolve_pages(pages, [1, 2, 3], {4: quote}) == {}
@@ -0,0 +1,109 @@
+"""Compiling the Strong's sources into the SQLite index and looking terms up."""
+import json
+import os
+
+import pytest
+
+import strongs_index
+from strongs_index import LEMMA, SCRAPED, SPELLING, TRANSLIT, normalize_spelling, normalize_xlit, open_index
+
+ELOHIM_POINTED = '\u05d0\u05b1\u05dc\u05b9\u05d4\u05b4\u05d9\u05dd'   # elohim with niqqud, final mem
+DICTIONARY = {
+    'H430': {'lemma': ELOHIM_POINTED, 'xlit': '\u02bc\u0115l\u014dh\u00eem', 'pron': 'el-o-heem'},
+    'H433': {'lemma': '\u05d0\u05b1\u05dc\u05d5\u05b9\u05d4\u05b7\u05bc', 'xlit': '\u02bc\u0115l\u00f4wahh'},
+}
+SCRAPE = [
+    {'strongs': 'H430', 'spellings': ['\u02bcElohiym', "'El@ohiym"], 'hebrew': [ELOHIM_POINTED]},
+]
+
+
+@pytest.fixture
+def sources(tmp_path):
+    openscriptures = tmp_path / 'strongs-hebrew.js'
+    openscriptures.write_text(f'var strongsHebrewDictionary = {json.dumps(DICTIONARY)};\n', encoding='utf-8')
+    scraped = tmp_path / 'strongs_scraped.json'
+    scraped.write_text(json.dumps(SCRAPE), encoding='utf-8')
+    return str(tmp_path / 'strongs_index.sqlite'), str(openscriptures), str(scraped)
+
+
+def test_normalize_xlit():
+    assert normalize_xlit("\u02bc\u0115l\u014dh\u00eem") == "'elohim"
+    assert normalize_xlit('ben-adam') == 'benadam'
+    assert normalize_spelling("'El@ohiym") == "'elohiym"
+
+
+def test_build_and_lookup(sources):
+    path, openscriptures, scraped = sources
+    assert strongs_index.build(path, openscriptures, scraped)['entries'] == 3
+    index = open_index(path, openscriptures, scraped)
+    try:
+        [(key, entry)] = index.lookup(TRANSLIT, normalize_xlit('el-o-heem'))
+        assert (key, entry['lemma']) == ('H430', ELOHIM_POINTED)
+        assert index.keys(LEMMA, DICTIONARY['H433']['lemma']) == ['H433']
+        assert index.keys(SPELLING, normalize_spelling("'Elohiym")) == ['H430']
+        assert [e['strongs'] for e in index.entries(SCRAPED)] == ['H430']
+        view = index.terms(TRANSLIT)
+        assert "'elohim" in view and 'nothing' not in view
+        assert view.get('nothing') is None
+        with pytest.raises(KeyError):
+            view['nothing']
+    finally:
+        index.close()
+
+
+def test_open_index_rebuilds_when_a_source_changes(sources):
+    path, openscriptures, scraped = sources
+    index = open_index(path, openscriptures, scraped)
+    assert index.is_current([openscriptures, scraped])
+    index.close()
+    extended = {**DICTIONARY, 'H1': {'lemma': '\u05d0\u05b8\u05d1', 'xlit': '\u02bc\u0101b'}}
+    with open(openscriptures, 'w', encoding='utf-8') as f:
+        f.write(f'var strongsHebrewDictionary = {json.dumps(extended)};\n')
+    stat = os.stat(openscriptures)
+    os.utime(openscriptures, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    index = open_index(path, openscriptures, scraped)
+    try:
+        assert index.keys(TRANSLIT, "'ab") == ['H1']
+    finally:
+        index.close()
+
+
+def test_open_index_without_sources(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        open_index(str(tmp_path / 'missing.sqlite'), str(tmp_path / 'a.json'), str(tmp_path / 'b.json'))
+
+
+ELOHIM_SKELETON = '\u05d0\u05dc\u05d4\u05d9\u05de'
+
+
+def test_skeleton_drops_points_and_folds_finals():
+    assert strongs_index.hebrew_skeleton(ELOHIM_POINTED) == ELOHIM_SKELETON
+    assert strongs_index.hebrew_skeleton('\u05d0\u05dc\u05d4\u05d9\u05dd') == ELOHIM_SKELETON
+
+
+def test_skeleton_drops_cantillation_punctuation_and_latin():
+    assert strongs_index.hebrew_skeleton('\u05d0\u0591\u05dc\u05be\u05d4 abc 1') == '\u05d0\u05dc\u05d4'
+    assert strongs_index.hebrew_skeleton('') == ''
+    assert strongs_index.hebrew_skeleton(None) == ''
+    shamar = '\u05e9\u05c1\u05b8\u05de\u05b7\u05e8'
+    assert strongs_index.hebrew_skeleton(shamar) == '\u05e9\u05de\u05e8'
+
+
+def test_prefix_variants():
+    ve_ha_elohim = '\u05d5\u05d4' + ELOHIM_SKELETON
+    assert strongs_index.prefix_variants(ve_ha_elohim) == ['\u05d4' + ELOHIM_SKELETON, ELOHIM_SKELETON]
+    assert strongs_index.prefix_variants(ve_ha_elohim, depth=1) == ['\u05d4' + ELOHIM_SKELETON]
+    # No leading particle, or too little left as a stem
+    assert strongs_index.prefix_variants(ELOHIM_SKELETON) == []
+    assert strongs_index.prefix_variants('\u05d1\u05d0') == []
+
+
+def test_skeleton_terms_come_from_lemmas_and_scraped_hebrew(sources):
+    path, openscriptures, scraped = sources
+    strongs_index.build(path, openscriptures, scraped)
+    index = strongs_index.StrongsIndex(path)
+    try:
+        assert index.term_map(strongs_index.SKELETON)[ELOHIM_SKELETON] == [('openscriptures', 'H430'),
+                                                                          ('scraped', 'H430')]
+    finally:
+        index.close()
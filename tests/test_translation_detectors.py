@@ -0,0 +1,99 @@
+"""Detectors run over small python-docx documents through extract_translations_from_doc."""
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+import parse_word_translations as pwt
+from conftest import add_quote
+from translation_detectors import extract_cite, replace_unicode_chars, trailing_cite, wrap_html
+
+
+def extract(tmp_path, doc, **kwargs):
+    path = tmp_path / 'YY-test.docx'
+    doc.save(str(path))
+    return pwt.extract_translations_from_doc(path, **kwargs)
+
+
+def test_extract_cite():
+    assert extract_cite(' (Psalm 3:4) more') == 'Psalm 3:4'
+    assert extract_cite('\u00a0( Isaiah 1:2 )') == 'Isaiah 1:2'
+    assert extract_cite(' said (Psalm 3:4)') is None
+
+
+def test_trailing_cite_is_balanced():
+    assert trailing_cite('text (Psalm (Mizmowr) 3:4)  ') == ('Psalm (Mizmowr) 3:4', 5)
+    assert trailing_cite('text (a note)') is None
+    assert trailing_cite('text (3:4') is None
+
+
+def test_wrap_html_nests_underline_italic_bold():
+    assert wrap_html('x', ('YadaTowrah', True, True, True)) == \
+        '<b><i><u><span class="YadaTowrah">x</span></u></i></b>'
+    assert wrap_html('x', (None, None, None, None)) == 'x'
+    assert replace_unicode_chars('\uf065\uf066\uf069') == 'efi'
+
+
+def test_quote_detector(tmp_path):
+    doc = Document()
+    add_quote(doc, 'Lead: ', 'Yahowah spoke', 'Dabarym / Words / Deuteronomy 6:4')
+    [t] = extract(tmp_path, doc)
+    assert t.text_word == '<b>Yahowah spoke</b>'
+    assert (t.cite_hebrew, t.cite_common, t.cite_chapter, t.cite_verse) == ('Dabarym', 'Deuteronomy', 6, 4)
+    assert t.para_idx == 0
+    assert t.book == 'YY-test'
+
+
+def test_quote_spanning_paragraphs(tmp_path):
+    doc = Document()
+    p = doc.add_paragraph()
+    p.add_run('\u201c').bold = True
+    p.add_run('first').bold = True
+    doc.add_paragraph().add_run('middle').bold = True
+    p = doc.add_paragraph()
+    p.add_run('last').bold = True
+    p.add_run('\u201d').bold = True
+    p.add_run(' (Isaiah 1:2-3)')
+    [t] = extract(tmp_path, doc)
+    assert 'first' in t.text_word and 'middle' in t.text_word and 'last' in t.text_word
+    assert (t.cite_chapter, t.cite_verse, t.cite_verse_end) == (1, 2, 3)
+    assert t.para_idx == 0
+
+
+def test_quote_without_cite_is_skipped(tmp_path):
+    doc = Document()
+    add_quote(doc, '', 'no cite', None).add_run(' he said.')
+    assert extract(tmp_path, doc) == []
+
+
+def test_cite_terminated_detector(tmp_path):
+    doc = Document()
+    p = doc.add_paragraph()
+    p.add_run('\u201c').bold = True
+    p.add_run('open quote')
+    p.add_run(' (Isaiah 1:2)')
+    [t] = extract(tmp_path, doc)
+    assert t.text_word.strip() == 'open quote'
+    assert (t.cite, t.cite_chapter, t.cite_verse) == ('Isaiah', 1, 2)
+
+
+def test_bold_cite_detector(tmp_path):
+    doc = Document()
+    doc.add_paragraph().add_run('commentary (Psalm 3:4)')
+    doc.add_paragraph().add_run('bold continuation').bold = True
+    doc.add_paragraph().add_run('bold line (Psalm 3:5)').bold = True
+    [t] = extract(tmp_path, doc)
+    assert 'bold continuation' in t.text_word and 'bold line' in t.text_word
+    assert (t.cite_chapter, t.cite_verse) == (3, 5)
+
+
+def test_chapter_detector(tmp_path):
+    doc = Document()
+    doc.styles.add_style('yy_chapter_#', WD_STYLE_TYPE.PARAGRAPH)
+    doc.add_paragraph(style='yy_chapter_#').add_run('1')
+    add_quote(doc, '', 'in chapter one', 'Psalm 1:1')
+    doc.add_paragraph(style='yy_chapter_#').add_run('2')
+    add_quote(doc, '', 'in chapter two', 'Psalm 2:1')
+    translations, structure = extract(tmp_path, doc, detect_chapters=True)
+    assert structure.chapter_numbers == [1, 2]
+    assert structure.chapter_paras == [0, 2]
+    assert [t.chapter_num for t in translations] == [1, 2]
+    assert structure.chapter_at(3) == 2
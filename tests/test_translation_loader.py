@@ -0,0 +1,106 @@
+"""YyTranslationLoader key resolution over preloaded lookup tables (no database)."""
+from types import SimpleNamespace
+
+import pytest
+
+from translation_loader import YyTranslationLoader, normalize_book
+
+# FROM table -> rows, in the column order reload() selects
+TABLES = {
+    'yah_scroll': [(5, 'Dabarym', 'Deuteronomy'), (19, 'Mizmowr', 'Psalms')],
+    'yy_cite_book': [(1, 19, 'Mizmowr', 'Psalm')],
+    'yy_cite_book_map': [(1, 'Tehillim'), (2, 'Unmapped')],
+    'yah_chapter': [(50, 5, 6), (190, 19, 3)],
+    'yah_verse': [(5064, 50, 4), (5065, 50, 5), (1903, 190, 3), (1904, 190, 4)],
+    'yy_volume': [(7, 2, 'YY-Dabarym.docx', 'Dabarym - Words')],
+    'yy_chapter': [(70, 7, 1, 1), (71, 7, 2, 40)],
+}
+
+
+class LookupCursor:
+    """Answers reload()'s SELECTs from TABLES; DDL is accepted and ignored."""
+
+    def __init__(self):
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        words = sql.split()
+        self.rows = list(TABLES[words[words.index('FROM') + 1]]) if words[0] == 'SELECT' else []
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def loader():
+    return YyTranslationLoader(SimpleNamespace(cursor=LookupCursor))
+
+
+def translation(cite, chapter, verse, verse_end=None, page=None, chapter_num=None, para_idx=0, **names):
+    return SimpleNamespace(cite=cite, cite_hebrew=names.get('cite_hebrew'), cite_common=names.get('cite_common'),
+                           cite_chapter=chapter, cite_verse=verse, cite_verse_end=verse_end, page=page,
+                           chapter_num=chapter_num, para_idx=para_idx, text_word='<b>text</b>')
+
+
+def test_normalize_book():
+    assert normalize_book('  Yasha\u2019yahu   Isaiah ') == "yasha'yahu isaiah"
+    assert normalize_book('') is None
+
+
+def test_books_resolve_by_label_cite_book_and_alias(loader):
+    assert loader.resolve_verse(translation('Deuteronomy', 6, 4))[0] == (5, 50, 5064)
+    assert loader.resolve_verse(translation('Psalm', 3, 4))[0] == (19, 190, 1904)
+    assert loader.resolve_verse(translation('tehillim', 3, 3))[0] == (19, 190, 1903)
+    assert loader.resolve_verse(translation('x', 6, 5, cite_hebrew='Dabarym'))[0] == (5, 50, 5065)
+
+
+def test_unresolved_cites_give_a_reason(loader):
+    assert loader.resolve_verse(translation('Unmapped', 1, 1)) == (None, "unknown book 'Unmapped'")
+    assert loader.resolve_verse(translation('Psalm', None, None))[1] == "cite has no chapter:verse"
+    assert loader.resolve_verse(translation('Psalm', 9, 1))[1] == "no chapter 9 in scroll 19"
+    assert loader.resolve_verse(translation('Psalm', 3, 9))[1] == "no verse 3:9 in scroll 19"
+
+
+def test_yy_chapter_by_heading_then_page(loader):
+    assert loader.volume_for('YY-Dabarym') == (7, 2)
+    assert loader.volume_for('dabarym -  words') == (7, 2)
+    assert loader.resolve_yy_chapter(7, translation('Psalm', 3, 4, chapter_num=2, page=1)) == 71
+    assert loader.resolve_yy_chapter(7, translation('Psalm', 3, 4, page=39)) == 70
+    assert loader.resolve_yy_chapter(7, translation('Psalm', 3, 4, page=40)) == 71
+    assert loader.resolve_yy_chapter(7, translation('Psalm', 3, 4)) is None
+
+
+def test_build_rows(loader):
+    translations = [translation('Psalm', 3, 4, page=2), translation('Psalm', 3, 4, page=41, para_idx=9),
+                    translation('Nowhere', 1, 1, page=2)]
+    entries, result = loader.build_rows('YY-Dabarym', translations)
+    assert [row for _, row, _ in entries] == [
+        (19, 190, 1904, 2, 7, 70, 2, 0, '<b>text</b>', 0),
+        (19, 190, 1904, 2, 7, 71, 41, 9, '<b>text</b>', 1),
+    ]
+    assert [reason for _, reason in result.unresolved] == ["unknown book 'Nowhere'"]
+    entries, result = loader.build_rows('YY-Unknown', translations)
+    assert entries == [] and len(result.unresolved) == 3
+
+
+def test_verse_range_expands_within_the_chapter(loader):
+    loader.verse_keys.update({(190, 5): 1905, (190, 7): 1907})
+    loader.chapter_verses[190] = ([3, 4, 5, 7], [1903, 1904, 1905, 1907])
+    assert loader.verse_range(190, 3, 5) == [1903, 1904, 1905]
+    # A missing verse number inside the range is skipped, an end past the chapter is clipped
+    assert loader.verse_range(190, 4, 9) == [1904, 1905, 1907]
+
+
+def test_verse_range_without_a_valid_end_is_the_verse(loader):
+    assert loader.verse_range(190, 4, None) == [1904]
+    assert loader.verse_range(190, 4, 4) == [1904]
+    assert loader.verse_range(190, 4, 2) == [1904]
+
+
+def test_build_rows_carries_the_covered_verses(loader):
+    entries, _ = loader.build_rows('YY-Dabarym', [translation('Psalm', 3, 3, 4, page=2),
+                                                  translation('Deuteronomy', 6, 4, page=2)])
+    assert [verses for _, _, verses in entries] == [[1903, 1904], [5064]]
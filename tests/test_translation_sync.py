@@ -0,0 +1,52 @@
+"""Identities, fingerprints and the sync plan of --diff imports."""
+from types import SimpleNamespace
+
+import translation_sync
+from translation_loader import content_values
+from translation_sync import content_hash, identities, plan
+
+
+def cite(text, chapter, verse, verse_end=None):
+    return SimpleNamespace(cite=text, cite_chapter=chapter, cite_verse=verse, cite_verse_end=verse_end)
+
+
+def test_identities_number_repeated_cites():
+    translations = [cite('Psalm', 3, 4), cite('Isaiah', 1, 2), cite('Psalm', 3, 4), cite('Psalm', 3, 4, 5)]
+    assert identities(translations) == ['Psalm|3:4-None#0', 'Isaiah|1:2-None#0', 'Psalm|3:4-None#1',
+                                        'Psalm|3:4-5#0']
+
+
+def test_content_hash_distinguishes_none_and_values():
+    assert content_hash((1, None, 'a')) == content_hash((1, None, 'a'))
+    assert content_hash((1, None, 'a')) != content_hash((1, '', 'a'))
+    assert content_hash(('ab', 'c')) != content_hash(('a', 'bc'))
+
+
+def test_plan_inserts_updates_deletes():
+    stored = {'a#0': ('h1', 10), 'b#0': ('h2', 11), 'c#0': ('h3', 12)}
+    extracted = [('a#0', 'h1', 'A'), ('b#0', 'h2x', 'B'), ('d#0', 'h4', 'D')]
+    result = plan(stored, extracted)
+    assert result.inserts == [('d#0', 'h4', 'D')]
+    assert result.updates == [('b#0', 'h2x', 'B', 11)]
+    assert result.deletes == [('c#0', 12)]
+    assert result.unchanged == 1
+    assert result.changed == 3
+
+
+def test_position_is_not_fingerprinted():
+    # build_rows row: scroll, chapter, verse, series, volume, yy_chapter, page, paragraph, copy, sort
+    row = (1, 2, 3, 4, 5, 6, 7, 40, '<b>copy</b>', 0)
+    moved = (1, 2, 3, 4, 5, 6, 7, 41, '<b>copy</b>', 1)
+    edited = (1, 2, 3, 4, 5, 6, 7, 40, '<b>copy!</b>', 0)
+    assert content_hash(content_values(row)) == content_hash(content_values(moved))
+    assert content_hash(content_values(row)) != content_hash(content_values(edited))
+
+
+def test_refresh_rows_writes_only_moved_rows_with_triggers_on():
+    executed = []
+    cur = SimpleNamespace(execute=lambda sql, params=None: executed.append(' '.join(sql.split())),
+                          copy_expert=lambda sql, buf: None, rowcount=0)
+    translation_sync.refresh_rows(cur, 'yy_translation', 'yy_translation_key',
+                                  ['yy_translation_paragraph', 'yy_translation_sort'], [(10, 41, 1)])
+    assert not any('session_replication_role' in sql for sql in executed)
+    assert executed[-1].endswith('IS DISTINCT FROM (s.yy_translation_paragraph, s.yy_translation_sort)')
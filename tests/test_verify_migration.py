@@ -0,0 +1,72 @@
+"""verify_migration against two local SQLite files standing in for MySQL and PostgreSQL."""
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+import verify_migration
+from verify_migration import sqlite_side
+
+TABLES = [('yah_verse', 'yah_verse_key', ['yah_verse_key', 'yah_chapter_key', 'yah_verse_number'])]
+KEYS = [('yy_volume', 'yy_volume_key', 3)]
+
+
+def make_db(path, verses, volumes):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE yah_verse (yah_verse_key INTEGER PRIMARY KEY, yah_chapter_key INT, yah_verse_number INT)")
+    conn.execute("CREATE TABLE yy_volume (yy_volume_key INTEGER PRIMARY KEY, yy_volume_sort INT)")
+    conn.executemany("INSERT INTO yah_verse VALUES (?, ?, ?)", verses)
+    conn.executemany("INSERT INTO yy_volume VALUES (?, ?)", volumes)
+    conn.commit()
+    conn.close()
+    return sqlite_side(str(path))
+
+
+@pytest.fixture
+def verses():
+    return [(k, k // 30 + 1, k % 30 + 1) for k in range(1, 1000)]
+
+
+def test_identical_sides_match(tmp_path, verses):
+    left = make_db(tmp_path / 'left.db', verses, [(1, 1), (2, 2), (3, 3)])
+    right = make_db(tmp_path / 'right.db', verses, [(1, 10), (2, 20), (3, 30)])
+    [result] = verify_migration.verify(left, right, TABLES, chunk=100, workers=2)
+    assert (result.left_rows, result.right_rows, result.diffs) == (999, 999, [])
+    assert verify_migration.print_report([result])
+
+
+def test_changed_and_missing_rows_are_isolated(tmp_path, verses):
+    changed = [v if v[0] != 417 else (417, 99, 1) for v in verses if v[0] != 800]
+    left = make_db(tmp_path / 'left.db', verses, [])
+    right = make_db(tmp_path / 'right.db', changed, [])
+    [result] = verify_migration.verify(left, right, TABLES, chunk=100, workers=2)
+    assert [(d.start, d.end, d.left_rows, d.right_rows) for d in result.diffs] == [(417, 418, 1, 1), (800, 801, 1, 0)]
+    assert not verify_migration.print_report([result])
+
+
+def test_merged_tables_check_keys_and_counts(tmp_path, verses):
+    left = make_db(tmp_path / 'left.db', [], [(1, 1), (2, 2), (3, 3)])
+    # Content differs and the right has an extra row: both are expected after the merge
+    right = make_db(tmp_path / 'right.db', [], [(1, 10), (2, 20), (3, 30), (4, 40)])
+    [result] = verify_migration.verify_keys(left, right, KEYS)
+    assert (result.left_rows, result.right_rows, result.missing) == (3, 4, [])
+    assert verify_migration.print_key_report([result])
+
+
+def test_merged_tables_report_missing_keys_and_short_counts(tmp_path):
+    left = make_db(tmp_path / 'left.db', [], [(1, 1), (2, 2), (3, 3)])
+    right = make_db(tmp_path / 'right.db', [], [(1, 10), (3, 30)])
+    [result] = verify_migration.verify_keys(left, right, KEYS)
+    assert result.missing == [2]
+    assert not verify_migration.print_key_report([result])
+    [result] = verify_migration.verify_keys(right, right, KEYS)
+    assert result.missing == []
+    assert not verify_migration.print_key_report([result])
+
+
+def test_normalize_agrees_across_drivers():
+    assert verify_migration._normalize(True) == verify_migration._normalize(1) == b'1'
+    assert verify_migration._normalize(Decimal('2.50')) == verify_migration._normalize(Decimal('2.5'))
+    assert verify_migration._normalize(datetime(2024, 1, 2, 3, 4, 5)) == b'2024-01-02 03:04:05'
+    assert verify_migration._normalize(None) != verify_migration._normalize('')
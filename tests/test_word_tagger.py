@@ -0,0 +1,48 @@
+"""WordTagger offsets, token boundaries and spelling priority."""
+from word_tagger import WordTagger, fold
+
+
+def spans(html, matches):
+    return [(html[start:end], word_id) for start, end, word_id in matches]
+
+
+def test_docstring_example():
+    assert WordTagger([('Yahowah', 12)]).tag('<i>Yahowah</i> said') == [(3, 10, 12)]
+
+
+def test_only_transliteration_fragments_are_tagged():
+    tagger = WordTagger([('towrah', 1)])
+    html = 'towrah <i>the towrah</i> <span class="word">Towrah</span>'
+    assert spans(html, tagger.tag(html)) == [('towrah', 1), ('Towrah', 1)]
+
+
+def test_whole_tokens_leftmost_longest():
+    tagger = WordTagger([("ha 'elohym", 2), ("'elohym", 1), ('ha', 3)])
+    html = "<i>ha \u2019elohym and haelohym</i>"
+    assert spans(html, tagger.tag(html)) == [("ha \u2019elohym", 2)]
+
+
+def test_first_word_wins_a_shared_spelling():
+    tagger = WordTagger([('shamar', 5), ('Shamar', 6)])
+    assert [m[2] for m in tagger.tag('<i>shamar</i>')] == [5]
+    assert len(tagger) == 1
+
+
+def test_nested_fragments_tagged_once():
+    tagger = WordTagger([('yada', 7)])
+    html = '<span class="word"><i>yada</i></span>'
+    assert tagger.tag(html) == [(22, 26, 7)]
+
+
+def test_offsets_are_utf16_code_units():
+    tagger = WordTagger([('beryth', 4)])
+    html = '<i>\U0001d11e beryth</i>'
+    [(start, end, _)] = tagger.tag(html)
+    units = html.encode('utf-16-le')
+    assert units[start * 2:end * 2].decode('utf-16-le') == 'beryth'
+
+
+def test_fold_keeps_length():
+    text = "\u2018Yada\u2019 \u0130"
+    assert len(fold(text)) == len(text)
+    assert fold(text).startswith("'yada'")
@@ -0,0 +1,505 @@
+"""
+Translation detectors fed from one pass over a DocumentView.
+- run_detectors() walks the document once. Each paragraph becomes a
+  ParagraphContext whose run events are built at most once, and only when a
+  detector asks for them (paragraphs nobody needs are never expanded)
+- A RunEvent is one run's text, its character offset in the paragraph and its
+  format tuple fmt = (font class, underline, italic, bold), read on first use
+- Detectors are independent consumers: begin() per paragraph (returning whether
+  they want its run events), run() per event, end() per paragraph, finish() at
+  the end of the document. They coordinate only through the shared context
+  (quote_opened, quote_open, claimed)
+- Completed translations go to an emit(kind, html_parts, raw_cite, para_idx)
+  callback, which returns True when it kept the translation
+
+Detectors, in the order extract_translations_from_doc runs them:
+- QuoteDetector           bold “ ... bold ” followed by a (cite)
+- CiteTerminatedDetector  a quote still open at a paragraph ending in (n:n)
+- BoldCiteDetector        bold paragraph(s) ending in (n:n), no curly quotes
+- ChapterDetector         yy_chapter_# / Heading 1 numbers and section breaks
+
+    quote = QuoteDetector(emit)
+    run_detectors(view, [quote, CiteTerminatedDetector(quote, emit), BoldCiteDetector(emit)])
+"""
+import logging
+import re
+from enum import Enum
+from typing import Callable, List, Optional, Sequence, Tuple
+
+LEFT_QUOTE = "\u201C"  # "
+RIGHT_QUOTE = "\u201D"  # "
+DEFAULT_FONT = 'Times New Roman'
+CHAPTER_STYLES = ('yy_chapter_#', 'Heading 1')
+SECT_PR_TAG = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}sectPr'
+
+# emit() kinds
+QUOTE = 'quote'
+CITE_TERMINATED = 'cite_terminated'
+BOLD_CITE = 'bold_cite'
+
+
+class ExtractionState(Enum):
+    """State machine states for translation extraction."""
+    SEARCHING = 1
+    EXTRACTING = 2
+    FOUND_QUOTE = 3
+    COMPLETE = 4
+
+
+def replace_unicode_chars(text: str) -> str:
+    """
+    Replace private use area Unicode characters with their intended letters.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Text with replacements
+    """
+    # Replace private use area characters
+    text = text.replace('\uf065', 'e')
+    text = text.replace('\uf066', 'f')
+    text = text.replace('\uf069', 'i')
+    return text
+
+
+def wrap_html(text: str, fmt: tuple) -> str:
+    """Wrap already-replaced text in a run's font span and format tags."""
+    font_class, underline, italic, bold = fmt
+    if font_class:
+        text = f'<span class="{font_class}">{text}</span>'
+    # Apply formatting in order: underline -> italic -> bold (innermost to outermost)
+    if underline:
+        text = f"<u>{text}</u>"
+    if italic:
+        text = f"<i>{text}</i>"
+    if bold:
+        text = f"<b>{text}</b>"
+    return text
+
+
+def font_class(run) -> Optional[str]:
+    """The run's font name, or None for the default font."""
+    try:
+        name = run.font.name
+    except:
+        return None
+    return name if name and name != DEFAULT_FONT else None
+
+
+def run_format(run) -> tuple:
+    """(font class, underline, italic, bold) of a python-docx Run."""
+    return font_class(run), run.underline, run.italic, run.bold
+
+
+def extract_cite(text_after_quote: str) -> Optional[str]:
+    """
+    Extract citation from text following the closing quote.
+
+    Args:
+        text_after_quote: Text immediately after the right quote (may span multiple runs)
+
+    Returns:
+        Citation text without parentheses, or None if no match
+    """
+    # Replace special Unicode characters
+    text_after_quote = replace_unicode_chars(text_after_quote)
+
+    # Pattern: optional whitespace/nbsp, then parentheses with content
+    # More flexible pattern to handle various spacing
+    match = re.match(r'^[\s\u00a0]*\(([^)]+)\)', text_after_quote)
+    if match:
+        cite = match.group(1).strip()
+        logging.debug("Extracted cite: %s", cite)
+        return cite
+    return None
+
+
+def trailing_cite(text: str) -> Optional[Tuple[str, int]]:
+    """
+    Balanced (...chapter:verse...) at the end of text.
+
+    Returns:
+        (cite content, position of its opening paren) or None
+    """
+    stripped = text.rstrip()
+    if not stripped.endswith(')'):
+        return None
+    depth = 0
+    for i in range(len(stripped) - 1, -1, -1):
+        if stripped[i] == ')':
+            depth += 1
+        elif stripped[i] == '(':
+            depth -= 1
+            if depth == 0:
+                cite_content = stripped[i + 1:-1].strip()
+                if re.search(r'\d+:\d+', cite_content):
+                    return cite_content, i
+                return None
+    return None
+
+
+_UNREAD = object()
+
+
+class RunEvent:
+    """One run of a paragraph: text and offset up front, bold and format read on first use."""
+
+    __slots__ = ('run', 'text', 'offset', '_bold', '_fmt')
+
+    def __init__(self, run, text: str, offset: int):
+        self.run = run
+        self.text = text
+        self.offset = offset
+        self._bold = _UNREAD
+        self._fmt = None
+
+    @property
+    def bold(self):
+        if self._bold is _UNREAD:
+            self._bold = self.run.bold
+        return self._bold
+
+    @property
+    def fmt(self) -> tuple:
+        if self._fmt is None:
+            run = self.run
+            self._fmt = (font_class(run), run.underline, run.italic, self.bold)
+        return self._fmt
+
+    def html(self, text: Optional[str] = None) -> str:
+        """HTML for the whole run, or for a slice of its text, with its formatting."""
+        return wrap_html(replace_unicode_chars(self.text if text is None else text), self.fmt)
+
+
+class ParagraphContext:
+    """What detectors share about the current paragraph."""
+
+    __slots__ = ('view', 'index', 'quote_opened', 'quote_open', 'claimed', '_events', '_has_bold')
+
+    def __init__(self, view, index: int):
+        self.view = view
+        self.index = index
+        self.quote_opened = False  # a quote started in this paragraph
+        self.quote_open = False    # a quote is still open after this paragraph
+        self.claimed = False       # a translation ended in this paragraph
+        self._events = None
+        self._has_bold = None
+
+    @property
+    def paragraph(self):
+        return self.view.paragraphs[self.index]
+
+    @property
+    def text(self) -> str:
+        return self.view.text(self.index)
+
+    @property
+    def style(self) -> str:
+        return self.view.style_name(self.index)
+
+    @property
+    def has_bold(self) -> bool:
+        """False only if no run can be bold (raw XML check, see DocumentView.has_bold)."""
+        if self._has_bold is None:
+            self._has_bold = self.view.has_bold(self.index)
+        return self._has_bold
+
+    @property
+    def events(self) -> List[RunEvent]:
+        if self._events is None:
+            view = self.view
+            self._events = [RunEvent(view.runs[j], view.run_texts[j], view.run_offsets[j])
+                            for j in view.run_range(self.index)]
+        return self._events
+
+    @property
+    def expanded(self) -> bool:
+        """Whether any detector asked for this paragraph's run events."""
+        return self._events is not None
+
+
+class Detector:
+    """Consumer of the paragraph / run event stream; override what you need."""
+
+    def begin(self, ctx: ParagraphContext) -> bool:
+        """Start of a paragraph; return True to receive its run events."""
+        return False
+
+    def run(self, ctx: ParagraphContext, event: RunEvent) -> None:
+        pass
+
+    def end(self, ctx: ParagraphContext) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+    def idle(self) -> bool:
+        """True when nothing is pending between paragraphs (a fresh detector could take over)."""
+        return False
+
+
+def run_detectors(view, detectors: Sequence[Detector], start: int = 0,
+                  on_boundary: Optional[Callable[[int], bool]] = None) -> int:
+    """
+    Feed every paragraph of view to detectors in one traversal.
+
+    Args:
+        view: DocumentView
+        detectors: Consumers, called in order
+        start: First paragraph (a boundary where fresh detectors are equivalent, see extraction_cache)
+        on_boundary: Called with the index of the next paragraph after each paragraph;
+            returning True stops the walk there without calling finish()
+
+    Returns:
+        Number of walked paragraphs whose run events were never built
+    """
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    skipped = 0
+    for para_idx in range(start, len(view)):
+        if debug:
+            logging.debug("Paragraph %d: %s...", para_idx, view.text(para_idx)[:50])
+        ctx = ParagraphContext(view, para_idx)
+        listeners = [d for d in detectors if d.begin(ctx)]
+        if listeners:
+            for event in ctx.events:
+                for detector in listeners:
+                    detector.run(ctx, event)
+        for detector in detectors:
+            detector.end(ctx)
+        if not ctx.expanded:
+            skipped += 1
+        if on_boundary is not None and on_boundary(para_idx + 1):
+            return skipped
+    for detector in detectors:
+        detector.finish()
+    return skipped
+
+
+class QuoteDetector(Detector):
+    """Bold left quote opens a translation, bold right quote closes it, a (cite) right after completes it."""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.state = ExtractionState.SEARCHING
+        self.html: List[str] = []
+        self.start_para = 0
+        self.cite_text = ""           # text after the right quote, searched for the cite
+        self.para_html_start = None   # where this paragraph's HTML starts in self.html
+        self.para_extract_start = None  # character position where extraction starts in this paragraph
+
+    def reset(self) -> None:
+        self.state = ExtractionState.SEARCHING
+        self.html = []
+        self.cite_text = ""
+
+    def idle(self):
+        return self.state == ExtractionState.SEARCHING
+
+    def begin(self, ctx):
+        extracting = self.state == ExtractionState.EXTRACTING
+        self.para_html_start = len(self.html) if extracting else None
+        self.para_extract_start = 0 if extracting else None
+        # While searching only a bold run can open a quote
+        return extracting or ctx.has_bold
+
+    def run(self, ctx, event):
+        text = event.text
+
+        # If we found the right quote, accumulate remaining text for cite search
+        if self.state == ExtractionState.FOUND_QUOTE:
+            self.cite_text += text
+
+        if self.state == ExtractionState.SEARCHING:
+            if LEFT_QUOTE in text and event.bold:
+                logging.debug("Found LEFT_QUOTE at paragraph %d", ctx.index)
+                self.state = ExtractionState.EXTRACTING
+                ctx.quote_opened = True
+                self.para_html_start = len(self.html)
+                split_idx = text.index(LEFT_QUOTE)
+                self.para_extract_start = event.offset + split_idx + 1
+                self.start_para = ctx.index
+
+                text_after_quote = text[split_idx + 1:]
+                if RIGHT_QUOTE in text_after_quote:
+                    # Complete translation in a single run
+                    end_idx = text_after_quote.index(RIGHT_QUOTE)
+                    self.cite_text = text_after_quote[end_idx + 1:]
+                    self.html.append(event.html(text_after_quote[:end_idx]))
+                    self.state = ExtractionState.FOUND_QUOTE
+                else:
+                    self.html.append(event.html(text_after_quote))
+
+        elif self.state == ExtractionState.EXTRACTING:
+            if RIGHT_QUOTE in text and event.bold:
+                logging.debug("Found RIGHT_QUOTE at paragraph %d", ctx.index)
+                split_idx = text.index(RIGHT_QUOTE)
+                text_before_quote = text[:split_idx]
+                self.cite_text = text[split_idx + 1:]
+                if text_before_quote:
+                    self.html.append(event.html(text_before_quote))
+                self.state = ExtractionState.FOUND_QUOTE
+            else:
+                self.html.append(event.html())
+
+    def end(self, ctx):
+        if self.state == ExtractionState.EXTRACTING:
+            # Quote continues in the next paragraph (CiteTerminatedDetector may still end it here)
+            self.html.append("<br>")
+        elif self.state == ExtractionState.FOUND_QUOTE:
+            self._complete(ctx)
+        ctx.quote_open = self.state != ExtractionState.SEARCHING
+
+    def _complete(self, ctx=None) -> None:
+        raw_cite = extract_cite(self.cite_text)
+        # Only save translations that have a cite reference
+        if raw_cite:
+            kept = self.emit(QUOTE, self.html, raw_cite, self.start_para)
+            if ctx is not None:
+                ctx.claimed = kept
+        else:
+            logging.debug("Skipped translation without cite at paragraph %d", self.start_para)
+        self.reset()
+
+    def finish(self):
+        # Document ended while still searching for the cite
+        if self.state == ExtractionState.FOUND_QUOTE and self.html:
+            self._complete()
+
+
+class CiteTerminatedDetector(Detector):
+    """Ends an open quote at a paragraph that finishes with a balanced (chapter:verse) cite."""
+
+    def __init__(self, quote: QuoteDetector, emit):
+        self.quote = quote
+        self.emit = emit
+
+    def idle(self):
+        return True
+
+    def end(self, ctx):
+        quote = self.quote
+        if quote.state != ExtractionState.EXTRACTING:
+            return
+        found = trailing_cite(replace_unicode_chars(ctx.text))
+        if not found:
+            return
+        raw_cite, cite_start_pos = found
+        extract_from = quote.para_extract_start if quote.para_extract_start is not None else 0
+
+        # Rebuild this paragraph's HTML from the extraction start up to the cite
+        html = quote.html[:quote.para_html_start] if quote.para_html_start is not None else quote.html
+        char_pos = 0
+        for event in ctx.events:
+            r_text = replace_unicode_chars(event.text)
+            r_end = char_pos + len(r_text)
+            if r_end <= extract_from or char_pos >= cite_start_pos:
+                char_pos = r_end
+                continue
+            eff_start = max(0, extract_from - char_pos)
+            eff_end = min(len(r_text), cite_start_pos - char_pos)
+            if eff_end > eff_start:
+                keep = r_text[eff_start:eff_end]
+                if keep:
+                    html.append(wrap_html(keep, event.fmt))
+            char_pos = r_end
+
+        ctx.claimed = self.emit(CITE_TERMINATED, html, raw_cite, quote.start_para)
+        quote.reset()
+        ctx.quote_open = False
+
+
+class BoldCiteDetector(Detector):
+    """Bold paragraphs (no curly quotes) collected until one ends with a (chapter:verse) cite."""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.html: List[str] = []
+        self.start_para = None
+
+    def clear(self) -> None:
+        self.html = []
+        self.start_para = None
+
+    def idle(self):
+        return not self.html and self.start_para is None
+
+    def end(self, ctx):
+        if ctx.quote_opened or ctx.quote_open:
+            self.clear()
+            return
+        if ctx.claimed:
+            return
+        if not ctx.has_bold:
+            # Cannot start with a bold run: ends any pending buffer (unless it holds a plain left quote)
+            if self.html and LEFT_QUOTE not in ctx.text:
+                self.clear()
+            return
+        if LEFT_QUOTE in ctx.text:
+            return
+
+        events = ctx.events
+        first_run_bold = False
+        for event in events:
+            if event.text.strip():
+                first_run_bold = bool(event.bold)
+                break
+        if not first_run_bold:
+            self.clear()
+            return
+        para_text = replace_unicode_chars(ctx.text)
+        if not para_text.rstrip():
+            return
+
+        found = trailing_cite(para_text)
+        if found is None:
+            # Bold paragraph without cite - accumulate for a multi-paragraph translation
+            if not self.html:
+                self.start_para = ctx.index
+            else:
+                self.html.append('<br>')
+            self.html.extend(event.html() for event in events)
+            return
+
+        raw_cite, cite_start_pos = found
+        current_html = []
+        char_pos = 0
+        for event in events:
+            r_text = replace_unicode_chars(event.text)
+            if char_pos >= cite_start_pos:
+                break
+            keep = r_text[:min(len(r_text), cite_start_pos - char_pos)]
+            if keep:
+                current_html.append(wrap_html(keep, event.fmt))
+            char_pos += len(r_text)
+
+        if self.html:
+            self.html.append('<br>')
+        self.html.extend(current_html)
+        start_para = self.start_para if self.start_para is not None else ctx.index
+        self.emit(BOLD_CITE, self.html, raw_cite, start_para)
+        self.clear()
+
+
+class ChapterDetector(Detector):
+    """Chapter headings and section breaks into a DocumentStructure."""
+
+    def __init__(self, structure):
+        self.structure = structure
+
+    def idle(self):
+        return True
+
+    def begin(self, ctx):
+        if ctx.style in CHAPTER_STYLES:
+            text = ctx.text.strip()
+            if text:
+                first_line = text.split('\n')[0].strip()
+                if first_line.isdigit():
+                    self.structure.add_chapter(ctx.index, int(first_line))
+        # A sectPr in the paragraph properties ends a section after this paragraph
+        p_pr = ctx.paragraph._p.pPr
+        if p_pr is not None and p_pr.find(SECT_PR_TAG) is not None:
+            self.structure.add_section(ctx.index + 1)
+        return False
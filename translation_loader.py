@@ -0,0 +1,319 @@
+"""
+Load extracted translations straight into yy_translation.
+- Preloads yah_scroll -> yah_chapter -> yah_verse, the cite-book maps,
+  yy_volume and yy_chapter into dicts once per run
+- Resolves every cite to (scroll, chapter, verse) keys and every translation
+  to its volume and yy_chapter in memory, no per-row queries
+- Reserves yy_translation_key values in one nextval() round trip and COPYs
+  the volume's rows in; a re-import replaces that volume's rows
+- Expands cite_verse..cite_verse_end into yy_translation_verse
+  (yy_translation_key, yah_verse_key) so a range is found from any verse in it
+- sync_volume() writes only translations whose fingerprint changed
+  (see translation_sync); the fingerprint leaves out paragraph and sort, so
+  a paragraph inserted near the top moves later rows with one UPDATE of those
+  two columns (rows that did not move are not written) instead of rewriting
+  them and their verse coverage
+
+    loader = YyTranslationLoader(conn)
+    result = loader.load_volume('Dabarym-Words', translations, structure)
+    conn.commit()
+"""
+import copy
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import translation_sync
+from pg_copy import copy_rows
+from translation_sync import SyncPlan, content_hash, identities, refresh_rows, reserve_keys, update_rows
+
+COLUMNS = [
+    'yy_translation_key', 'yah_scroll_key', 'yah_chapter_key', 'yah_verse_key',
+    'yy_series_key', 'yy_volume_key', 'yy_chapter_key',
+    'yy_translation_page', 'yy_translation_paragraph', 'yy_translation_copy', 'yy_translation_sort',
+]
+COVERAGE_COLUMNS = ['yy_translation_key', 'yah_verse_key']
+# Document position, refreshed in place rather than fingerprinted (indexes into a build_rows row)
+POSITION_COLUMNS = ['yy_translation_paragraph', 'yy_translation_sort']
+POSITION_INDEXES = [COLUMNS[1:].index(c) for c in POSITION_COLUMNS]
+SYNC_TARGET = 'yy_translation'
+SMALLINT_MAX = 32767
+
+APOSTROPHES = str.maketrans({'\u2019': "'", '\u2018': "'", '\u02bc': "'"})
+
+
+def normalize_book(name: Optional[str]) -> Optional[str]:
+    """Cite book name as matched against the cite-book maps (curly apostrophes folded, case/space insensitive)."""
+    if not name:
+        return None
+    return ' '.join(name.translate(APOSTROPHES).split()).lower()
+
+
+def ensure_coverage_table(cur) -> None:
+    """Verse coverage of each translation; rows go with their translation on delete."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_translation_verse (
+            yy_translation_key INT NOT NULL REFERENCES yy_translation(yy_translation_key) ON DELETE CASCADE,
+            yah_verse_key INT NOT NULL REFERENCES yah_verse(yah_verse_key) ON DELETE CASCADE,
+            PRIMARY KEY (yah_verse_key, yy_translation_key)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_yy_translation_verse_translation ON yy_translation_verse(yy_translation_key)")
+
+
+def content_values(row) -> tuple:
+    """A build_rows row without its position columns, for the sync fingerprint."""
+    return tuple(v for i, v in enumerate(row) if i not in POSITION_INDEXES)
+
+
+class LoadResult:
+    """Outcome of one volume load."""
+
+    __slots__ = ('volume', 'loaded', 'replaced', 'verses_linked', 'unresolved')
+
+    def __init__(self, volume):
+        self.volume = volume
+        self.loaded = 0
+        self.replaced = 0
+        self.verses_linked = 0
+        self.unresolved = []  # (Translation, reason)
+
+
+class YyTranslationLoader:
+    """In-memory key resolution and bulk load into yy_translation."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.scroll_by_book: Dict[str, int] = {}
+        self.chapter_keys: Dict[Tuple[int, int], int] = {}     # (scroll, chapter number) -> yah_chapter_key
+        self.verse_keys: Dict[Tuple[int, int], int] = {}       # (yah_chapter_key, verse number) -> yah_verse_key
+        self.chapter_verses: Dict[int, Tuple[List[int], List[int]]] = {}  # yah_chapter_key -> sorted (numbers, keys)
+        self.volumes: Dict[str, Tuple[int, int]] = {}          # normalized file/name -> (volume, series)
+        self.yy_chapters: Dict[int, Dict[int, int]] = {}       # volume -> {chapter number: yy_chapter_key}
+        self.yy_chapter_pages: Dict[int, Tuple[List[int], List[int]]] = {}  # volume -> (pages, keys)
+        cur = conn.cursor()
+        ensure_coverage_table(cur)
+        translation_sync.ensure_source_table(cur)
+        cur.close()
+        self.reload()
+
+    def bind(self, conn) -> 'YyTranslationLoader':
+        """Copy of this loader writing through conn; the preloaded lookups are shared, not re-read."""
+        bound = copy.copy(self)
+        bound.conn = conn
+        return bound
+
+    def reload(self) -> None:
+        """(Re)read every lookup table; call after editing scrolls, cite books or volumes."""
+        cur = self.conn.cursor()
+
+        cur.execute("SELECT yah_scroll_key, yah_scroll_label_yy, yah_scroll_label_common FROM yah_scroll")
+        scroll_by_book = {}
+        for key, label_yy, label_common in cur.fetchall():
+            for label in (label_common, label_yy):
+                if label:
+                    scroll_by_book.setdefault(normalize_book(label), key)
+        # Curated cite-book names and their aliases take precedence over raw scroll labels
+        cur.execute("SELECT cite_book_id, yah_scroll_key, cite_book_hebrew, cite_book_common FROM yy_cite_book "
+                    "WHERE yah_scroll_key IS NOT NULL")
+        book_scroll = {}
+        for book_id, scroll_key, hebrew, common in cur.fetchall():
+            book_scroll[book_id] = scroll_key
+            for label in (common, hebrew):
+                if label:
+                    scroll_by_book[normalize_book(label)] = scroll_key
+        cur.execute("SELECT cite_book_id, cite_book_map_hebrew FROM yy_cite_book_map")
+        for book_id, alias in cur.fetchall():
+            if alias and book_id in book_scroll:
+                scroll_by_book[normalize_book(alias)] = book_scroll[book_id]
+        self.scroll_by_book = scroll_by_book
+
+        cur.execute("SELECT yah_chapter_key, yah_scroll_key, yah_chapter_number FROM yah_chapter")
+        self.chapter_keys = {(scroll, number): key for key, scroll, number in cur.fetchall()}
+        cur.execute("SELECT yah_verse_key, yah_chapter_key, yah_verse_number FROM yah_verse "
+                    "ORDER BY yah_chapter_key, yah_verse_number")
+        self.verse_keys, self.chapter_verses = {}, {}
+        for key, chapter, number in cur.fetchall():
+            self.verse_keys[(chapter, number)] = key
+            numbers, keys = self.chapter_verses.setdefault(chapter, ([], []))
+            numbers.append(number)
+            keys.append(key)
+
+        cur.execute("SELECT yy_volume_key, yy_series_key, yy_volume_file, yy_volume_name FROM yy_volume")
+        volumes = {}
+        for key, series, file_name, name in cur.fetchall():
+            for label in (name, file_name):
+                if label:
+                    volumes[normalize_book(label.rsplit('.docx', 1)[0])] = (key, series)
+        self.volumes = volumes
+
+        cur.execute("SELECT yy_chapter_key, yy_volume_key, yy_chapter_number, yy_chapter_page FROM yy_chapter "
+                    "ORDER BY yy_volume_key, yy_chapter_page")
+        self.yy_chapters, by_page = {}, {}
+        for key, volume, number, page in cur.fetchall():
+            self.yy_chapters.setdefault(volume, {})[number] = key
+            if page is not None:
+                pages, keys = by_page.setdefault(volume, ([], []))
+                pages.append(page)
+                keys.append(key)
+        self.yy_chapter_pages = by_page
+        cur.close()
+
+    def volume_for(self, document: str) -> Optional[Tuple[int, int]]:
+        """(yy_volume_key, yy_series_key) for a document stem, matched on yy_volume_file or yy_volume_name."""
+        return self.volumes.get(normalize_book(document))
+
+    def scroll_for(self, translation) -> Optional[int]:
+        for name in (translation.cite_hebrew, translation.cite, translation.cite_common):
+            key = self.scroll_by_book.get(normalize_book(name))
+            if key is not None:
+                return key
+        return None
+
+    def resolve_verse(self, translation) -> Tuple[Optional[Tuple[int, int, int]], Optional[str]]:
+        """(scroll, chapter, verse) keys for a translation's cite, or (None, reason)."""
+        scroll = self.scroll_for(translation)
+        if scroll is None:
+            return None, f"unknown book '{translation.cite}'"
+        if translation.cite_chapter is None or translation.cite_verse is None:
+            return None, "cite has no chapter:verse"
+        chapter = self.chapter_keys.get((scroll, translation.cite_chapter))
+        if chapter is None:
+            return None, f"no chapter {translation.cite_chapter} in scroll {scroll}"
+        verse = self.verse_keys.get((chapter, translation.cite_verse))
+        if verse is None:
+            return None, f"no verse {translation.cite_chapter}:{translation.cite_verse} in scroll {scroll}"
+        return (scroll, chapter, verse), None
+
+    def verse_range(self, chapter_key: int, verse: int, verse_end: Optional[int]) -> List[int]:
+        """yah_verse keys for verse..verse_end within a chapter (just the verse when there is no valid end)."""
+        if verse_end is None or verse_end <= verse:
+            return [self.verse_keys[(chapter_key, verse)]]
+        numbers, keys = self.chapter_verses[chapter_key]
+        return keys[bisect_left(numbers, verse):bisect_right(numbers, verse_end)]
+
+    def resolve_yy_chapter(self, volume: int, translation) -> Optional[int]:
+        """yy_chapter by detected chapter heading number, falling back to the last chapter starting at or before the page."""
+        chapters = self.yy_chapters.get(volume, {})
+        number = translation.chapter_num
+        if number is not None and number in chapters:
+            return chapters[number]
+        if translation.page is not None and volume in self.yy_chapter_pages:
+            pages, keys = self.yy_chapter_pages[volume]
+            i = bisect_right(pages, translation.page) - 1
+            if i >= 0:
+                return keys[i]
+        return None
+
+    def build_rows(self, document: str, translations, structure=None) -> Tuple[list, LoadResult]:
+        """
+        Resolve keys for one volume's translations.
+
+        Args:
+            document: Document stem (matched against yy_volume_file / yy_volume_name)
+            translations: Translation records with page and para_idx set
+            structure: Optional DocumentStructure for translations without chapter_num
+
+        Returns:
+            ([(translation, row without yy_translation_key, covered verse keys)],
+             LoadResult with unresolved translations)
+        """
+        result = LoadResult(document)
+        volume = self.volume_for(document)
+        if volume is None:
+            result.unresolved = [(t, f"no yy_volume for '{document}'") for t in translations]
+            return [], result
+        volume_key, series_key = volume
+
+        entries = []
+        sort_by_verse = {}
+        for t in translations:
+            para_idx = t.para_idx
+            keys, reason = self.resolve_verse(t)
+            if keys is None:
+                result.unresolved.append((t, reason))
+                continue
+            if t.chapter_num is None and structure is not None and para_idx is not None:
+                t.chapter_num = structure.chapter_at(para_idx)
+            yy_chapter = self.resolve_yy_chapter(volume_key, t)
+            if yy_chapter is None:
+                result.unresolved.append((t, f"no yy_chapter for page {t.page}"))
+                continue
+            # Order translations of the same verse within a volume as they appear
+            sort = sort_by_verse.get(keys[2], 0)
+            sort_by_verse[keys[2]] = sort + 1
+            paragraph = para_idx if para_idx is not None and para_idx <= SMALLINT_MAX else None
+            page = t.page if t.page is not None and t.page <= SMALLINT_MAX else None
+            row = (*keys, series_key, volume_key, yy_chapter, page, paragraph, t.text_word, sort)
+            entries.append((t, row, self.verse_range(keys[1], t.cite_verse, t.cite_verse_end)))
+        return entries, result
+
+    def _insert(self, cur, entries) -> List[int]:
+        """COPY (translation, row, verses) entries into yy_translation and yy_translation_verse; returns their keys."""
+        keys = reserve_keys(cur, 'yy_translation', 'yy_translation_key', len(entries))
+        copy_rows(cur, 'yy_translation', COLUMNS, [(k, *row) for k, (_, row, _) in zip(keys, entries)])
+        copy_rows(cur, 'yy_translation_verse', COVERAGE_COLUMNS,
+                  [(k, v) for k, (_, _, verses) in zip(keys, entries) for v in verses])
+        return keys
+
+    def load_volume(self, document: str, translations, structure=None) -> LoadResult:
+        """Replace a volume's yy_translation rows with these translations (caller commits)."""
+        entries, result = self.build_rows(document, translations, structure)
+        volume = self.volume_for(document)
+        if volume is None:
+            return result
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM yy_translation WHERE yy_volume_key = %s", (volume[0],))
+        result.replaced = cur.rowcount
+        self._insert(cur, entries)
+        result.loaded = len(entries)
+        result.verses_linked = sum(len(verses) for _, _, verses in entries)
+        translation_sync.forget_book(cur, SYNC_TARGET, document)
+        cur.close()
+        return result
+
+    def sync_volume(self, document: str, translations, structure=None) -> Tuple[LoadResult, Optional[SyncPlan]]:
+        """
+        Write only the translations whose fingerprint changed since the volume was last synced (caller commits).
+
+        A volume without fingerprints is replaced once (load_volume) and fingerprinted.
+
+        Returns:
+            (LoadResult, SyncPlan or None when the volume has no yy_volume)
+        """
+        entries, result = self.build_rows(document, translations, structure)
+        if self.volume_for(document) is None:
+            return result, None
+        cur = self.conn.cursor()
+        stored = translation_sync.load_stored(cur, SYNC_TARGET, document)
+        if not stored:
+            cur.execute("DELETE FROM yy_translation WHERE yy_volume_key = %s", (self.volume_for(document)[0],))
+            result.replaced = cur.rowcount
+
+        extracted = [(identity, content_hash(content_values(row) + (tuple(verses),)), (row, verses))
+                     for identity, (_, row, verses) in zip(identities([e[0] for e in entries]), entries)]
+        sync_plan = translation_sync.plan(stored, extracted)
+
+        # Unchanged content may still have moved (a paragraph inserted above it)
+        refresh_rows(cur, 'yy_translation', 'yy_translation_key', POSITION_COLUMNS,
+                     [(stored[identity][1], *(row[i] for i in POSITION_INDEXES))
+                      for identity, digest, (row, _) in extracted
+                      if identity in stored and stored[identity][0] == digest])
+
+        if sync_plan.deletes:
+            cur.execute("DELETE FROM yy_translation WHERE yy_translation_key = ANY(%s)",
+                        ([key for _, key in sync_plan.deletes],))
+        if sync_plan.updates:
+            updated = [key for _, _, _, key in sync_plan.updates]
+            update_rows(cur, 'yy_translation', 'yy_translation_key', COLUMNS[1:],
+                        [(key, *row) for _, _, (row, _), key in sync_plan.updates])
+            cur.execute("DELETE FROM yy_translation_verse WHERE yy_translation_key = ANY(%s)", (updated,))
+            copy_rows(cur, 'yy_translation_verse', COVERAGE_COLUMNS,
+                      [(key, v) for _, _, (_, verses), key in sync_plan.updates for v in verses])
+        keys = self._insert(cur, [(None, row, verses) for _, _, (row, verses) in sync_plan.inserts])
+        translation_sync.record(cur, SYNC_TARGET, document, sync_plan, keys)
+        cur.close()
+
+        result.loaded = len(sync_plan.inserts) + len(sync_plan.updates)
+        result.verses_linked = (sum(len(verses) for _, _, (_, verses) in sync_plan.inserts)
+                                + sum(len(verses) for _, _, (_, verses), _ in sync_plan.updates))
+        return result, sync_plan
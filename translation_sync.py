@@ -0,0 +1,169 @@
+"""
+Fingerprint-based diff of a re-imported document against what was last imported.
+- Every imported translation is recorded in yy_translation_source with a stable
+  identity (cite + ordinal of that cite within the document), a hash of the
+  values written, and the key of the row it produced
+- On re-import only new identities are inserted, changed hashes updated and
+  vanished identities deleted, so writes, trigger activity and revision rows
+  scale with the edit rather than the volume
+- The first diff import of a document that has no fingerprints yet replaces
+  the document's existing rows once and records them
+
+Targets: 'translation' (legacy table, parse_word_translations.py) and
+'yy_translation' (translation_loader.YyTranslationLoader).
+"""
+import hashlib
+from typing import Dict, List, Tuple
+
+from pg_copy import copy_rows, upsert_rows
+
+SOURCE_COLUMNS = ['source_target', 'source_book', 'source_identity', 'source_hash', 'source_row_key']
+
+
+def ensure_source_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS yy_translation_source (
+            source_target VARCHAR(32) NOT NULL,
+            source_book VARCHAR(255) NOT NULL,
+            source_identity VARCHAR(800) NOT NULL,
+            source_hash CHAR(32) NOT NULL,
+            source_row_key INT NOT NULL,
+            PRIMARY KEY (source_target, source_book, source_identity)
+        )
+    """)
+
+
+def identities(translations) -> List[str]:
+    """Stable identity per translation: its cite, numbered when the same cite recurs in the document."""
+    seen = {}
+    result = []
+    for t in translations:
+        cite = f"{t.cite or ''}|{t.cite_chapter}:{t.cite_verse}-{t.cite_verse_end}"
+        n = seen.get(cite, 0)
+        seen[cite] = n + 1
+        result.append(f"{cite}#{n}")
+    return result
+
+
+def content_hash(values) -> str:
+    """Hash of the column values a translation writes."""
+    h = hashlib.blake2b(digest_size=16)
+    for v in values:
+        h.update(b'\x00' if v is None else str(v).encode('utf-8'))
+        h.update(b'\x1f')
+    return h.hexdigest()
+
+
+class SyncPlan:
+    """What a re-import has to change: entries are (identity, hash, payload[, row_key])."""
+
+    __slots__ = ('inserts', 'updates', 'deletes', 'unchanged')
+
+    def __init__(self):
+        self.inserts = []    # (identity, hash, payload)
+        self.updates = []    # (identity, hash, payload, row_key)
+        self.deletes = []    # (identity, row_key)
+        self.unchanged = 0
+
+    @property
+    def changed(self) -> int:
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+
+def plan(stored: Dict[str, Tuple[str, int]], extracted: List[Tuple[str, str, object]]) -> SyncPlan:
+    """
+    Compare stored fingerprints {identity: (hash, row_key)} with extracted (identity, hash, payload) entries.
+    """
+    result = SyncPlan()
+    current = set()
+    for identity, digest, payload in extracted:
+        current.add(identity)
+        previous = stored.get(identity)
+        if previous is None:
+            result.inserts.append((identity, digest, payload))
+        elif previous[0] != digest:
+            result.updates.append((identity, digest, payload, previous[1]))
+        else:
+            result.unchanged += 1
+    result.deletes = [(identity, row_key) for identity, (_, row_key) in stored.items() if identity not in current]
+    return result
+
+
+def load_stored(cur, target: str, book: str) -> Dict[str, Tuple[str, int]]:
+    ensure_source_table(cur)
+    cur.execute("""
+        SELECT source_identity, source_hash, source_row_key FROM yy_translation_source
+        WHERE source_target = %s AND source_book = %s
+    """, (target, book))
+    return {identity: (digest, key) for identity, digest, key in cur.fetchall()}
+
+
+def record(cur, target: str, book: str, sync_plan: SyncPlan, inserted_keys: List[int]) -> None:
+    """Write the fingerprints of inserted and updated translations and forget deleted ones."""
+    if sync_plan.deletes:
+        cur.execute("""
+            DELETE FROM yy_translation_source
+            WHERE source_target = %s AND source_book = %s AND source_identity = ANY(%s)
+        """, (target, book, [identity for identity, _ in sync_plan.deletes]))
+    rows = [(target, book, identity, digest, key)
+            for (identity, digest, _), key in zip(sync_plan.inserts, inserted_keys)]
+    rows.extend((target, book, identity, digest, key) for identity, digest, _, key in sync_plan.updates)
+    if rows:
+        upsert_rows(cur, 'yy_translation_source', ['source_target', 'source_book', 'source_identity'],
+                    SOURCE_COLUMNS, rows)
+
+
+def forget_book(cur, target: str, book: str) -> None:
+    cur.execute("DELETE FROM yy_translation_source WHERE source_target = %s AND source_book = %s", (target, book))
+
+
+def reserve_keys(cur, table: str, key_column: str, n: int) -> List[int]:
+    """n values from a serial column's sequence in one round trip."""
+    if n <= 0:
+        return []
+    cur.execute(f"SELECT nextval(pg_get_serial_sequence('{table}', '{key_column}')) FROM generate_series(1, %s)", (n,))
+    return [r[0] for r in cur.fetchall()]
+
+
+def _stage_rows(cur, table: str, key_column: str, columns, rows) -> str:
+    """COPY (key, *columns) rows into a temp table shaped like table's columns; returns its name."""
+    temp_table = f"tmp_sync_{table}"
+    cur.execute(f"DROP TABLE IF EXISTS {temp_table}")
+    cur.execute(f"""
+        CREATE TEMP TABLE {temp_table} ON COMMIT DROP AS
+        SELECT {key_column}, {', '.join(columns)} FROM {table} WITH NO DATA
+    """)
+    copy_rows(cur, temp_table, [key_column] + list(columns), rows)
+    return temp_table
+
+
+def update_rows(cur, table: str, key_column: str, columns, rows) -> int:
+    """UPDATE table from (key, *columns) rows staged with COPY; returns rows updated."""
+    if not rows:
+        return 0
+    temp_table = _stage_rows(cur, table, key_column, columns, rows)
+    cur.execute(f"""
+        UPDATE {table} t SET {', '.join(f"{c} = s.{c}" for c in columns)}
+        FROM {temp_table} s WHERE t.{key_column} = s.{key_column}
+    """)
+    return cur.rowcount
+
+
+def refresh_rows(cur, table: str, key_column: str, columns, rows) -> int:
+    """
+    update_rows that writes only the rows whose values differ.
+
+    Triggers stay on, so each row that really changed gets its revision row and
+    unchanged rows get none. Returns rows updated.
+    """
+    if not rows:
+        return 0
+    temp_table = _stage_rows(cur, table, key_column, columns, rows)
+    target = ', '.join(f"t.{c}" for c in columns)
+    source = ', '.join(f"s.{c}" for c in columns)
+    cur.execute(f"""
+        UPDATE {table} t SET {', '.join(f"{c} = s.{c}" for c in columns)}
+        FROM {temp_table} s
+        WHERE t.{key_column} = s.{key_column} AND ({target}) IS DISTINCT FROM ({source})
+    """)
+    return cur.rowcount
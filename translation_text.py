@@ -0,0 +1,56 @@
+"""
+Text helpers for yy_translation_copy HTML shared by the offline index builders.
+- Extracts the fragments the PHP API treats as transliterations:
+  <i>...</i> runs and <span class="word">...</span> markup
+- Strips tags and tokenizes the way the API's word-boundary regexes do
+  (a token is a run of ASCII letters and apostrophes, compared lowercase)
+"""
+import re
+from collections import Counter
+from typing import List
+
+ITALIC_RE = re.compile(r'<i[^>]*>(.*?)</i>', re.S | re.I)
+WORD_SPAN_RE = re.compile(r'<span\s+class="word"[^>]*>(.*?)</span>', re.S | re.I)
+TAG_RE = re.compile(r'<[^>]+>')
+TOKEN_RE = re.compile(r"[a-z']+")
+SIMPLE_SPELLING_RE = re.compile(r"[a-z']+")
+
+
+def strip_tags(html: str) -> str:
+    return TAG_RE.sub('', html)
+
+
+def word_span_fragments(html: str) -> List[str]:
+    """Plain text of every <span class="word"> in a translation."""
+    if not html:
+        return []
+    return [strip_tags(m) for m in WORD_SPAN_RE.findall(html)]
+
+
+def spelling_fragments(html: str) -> List[str]:
+    """Plain text of every <i> and <span class="word"> fragment (the spelling-count scope)."""
+    if not html:
+        return []
+    return [strip_tags(m) for m in ITALIC_RE.findall(html)] + word_span_fragments(html)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase letter/apostrophe tokens of plain text."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def is_simple_spelling(spelling: str) -> bool:
+    """True when a spelling is a single token, so token equality matches the API regex."""
+    return SIMPLE_SPELLING_RE.fullmatch(spelling.lower()) is not None
+
+
+def phrase_pattern(spelling: str):
+    """Compiled equivalent of the API's (?<![a-zA-Z'])spelling(?![a-zA-Z']) match."""
+    return re.compile(r"(?<![a-zA-Z'])" + re.escape(spelling.lower()) + r"(?![a-zA-Z'])", re.I)
+
+
+def count_tokens(fragments: List[str]) -> Counter:
+    counts = Counter()
+    for fragment in fragments:
+        counts.update(tokenize(fragment))
+    return counts
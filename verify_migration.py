@@ -0,0 +1,357 @@
+"""
+Verify that two copies of the Yada tables hold identical content.
+- Splits each table's primary-key span into fixed-width key ranges
+- Hashes every range on both sides in parallel (one connection per worker thread)
+- Drills into mismatched ranges until the differing keys are isolated
+- Checks the key sets and row counts of the tables the migration merges
+  rather than copies (yy_series, yy_volume)
+- Works against any DB-API driver: MySQL and PostgreSQL for the migration,
+  or two local SQLite files as a stand-in (see --left-sqlite / --right-sqlite)
+
+Values are normalized in Python before hashing because MySQL and PostgreSQL
+render booleans, timestamps and decimals differently; a server-side MD5 of
+the row text would never agree across the two engines.
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+
+# (table, key column, compared columns) - tables the migration copies row for row from MySQL.
+# yy_series and yy_volume are left out: step_migrate_data only updates the PostgreSQL rows that
+# already exist (names, counts) and backfills the rest (yy_series_name from the label,
+# yy_volume_sort = number * 10), so their content legitimately differs between the two sides.
+VERIFY_TABLES = [
+    ('yah_scroll', 'yah_scroll_key',
+     ['yah_scroll_key', 'yah_scroll_label_common', 'yah_scroll_label_yy', 'yah_scroll_sort']),
+    ('yah_chapter', 'yah_chapter_key',
+     ['yah_chapter_key', 'yah_scroll_key', 'yah_chapter_number', 'yah_chapter_sort']),
+    ('yah_verse', 'yah_verse_key',
+     ['yah_verse_key', 'yah_chapter_key', 'yah_verse_number', 'yah_verse_sort']),
+    ('yy_chapter', 'yy_chapter_key',
+     ['yy_chapter_key', 'yy_volume_key', 'yy_chapter_number', 'yy_chapter_page',
+      'yy_chapter_name', 'yy_chapter_label', 'yy_chapter_sort']),
+    ('yy_user', 'yy_user_key',
+     ['yy_user_key', 'yy_user_code', 'yy_user_pass', 'yy_user_name_last', 'yy_user_name_first',
+      'yy_user_name_middle', 'yy_user_name_prefix', 'yy_user_name_suffix', 'yy_user_name_full',
+      'yy_user_email', 'yy_user_text']),
+    ('yy_user_preference', 'yy_user_preference_key',
+     ['yy_user_preference_key', 'yy_user_key', 'yy_preference_name', 'yy_preference_value']),
+    ('yy_translation', 'yy_translation_key',
+     ['yy_translation_key', 'yah_scroll_key', 'yah_chapter_key', 'yah_verse_key',
+      'yy_series_key', 'yy_volume_key', 'yy_chapter_key',
+      'yy_translation_page', 'yy_translation_paragraph', 'yy_translation_copy',
+      'yy_translation_date', 'yy_translation_sort', 'yy_translation_dtime']),
+]
+
+# (table, key column, minimum rows) - the tables left out above. Every key on the left must still
+# exist on the right, which may hold more rows, and the right must have at least the row count
+# the migration has always required.
+KEY_TABLES = [
+    ('yy_series', 'yy_series_key', 8),
+    ('yy_volume', 'yy_volume_key', 34),
+]
+
+DEFAULT_CHUNK = 2000    # keys per hashed range
+DEFAULT_WORKERS = 8     # concurrent range hashes per side
+REFINE_FACTOR = 16      # sub-ranges per mismatched range when drilling down
+MAX_REPORTED = 200      # stop drilling once this many ranges differ in one table
+
+# A database to verify: connect() returns a new DB-API connection, placeholder is its paramstyle marker
+Side = namedtuple('Side', 'name connect placeholder')
+
+# One key range [start, end) whose content differs between the two sides
+RangeDiff = namedtuple('RangeDiff', 'table start end left_rows right_rows')
+
+# Per-table outcome
+TableResult = namedtuple('TableResult', 'table left_rows right_rows ranges diffs seconds')
+
+# Per-table outcome of a key-set check; missing lists the left keys absent on the right
+KeyResult = namedtuple('KeyResult', 'table left_rows right_rows expected_min missing')
+
+
+def _normalize(value):
+    """Render a column value as bytes that are identical across drivers."""
+    if value is None:
+        return b'\x00'
+    if isinstance(value, bool):
+        return b'1' if value else b'0'
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).isoformat(sep=' ').encode()
+    if isinstance(value, date):
+        return value.isoformat().encode()
+    if isinstance(value, Decimal):
+        return str(value.normalize()).encode()
+    if isinstance(value, float):
+        return repr(value).encode()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex().encode()
+    return str(value).encode('utf-8')
+
+
+class _ConnectionCache:
+    """Hands each worker thread its own connection for one side."""
+
+    def __init__(self, side: Side):
+        self.side = side
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.side.connect()
+            self._local.conn = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def close(self):
+        for conn in self._all:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._all = []
+
+
+def _fetch_bounds(conn, table, key):
+    cur = conn.cursor()
+    cur.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+    row = cur.fetchone()
+    cur.close()
+    if isinstance(row, dict):
+        row = tuple(row.values())
+    return row[0], row[1]
+
+
+def hash_range(conn, placeholder, table, key, columns, start, end):
+    """
+    Hash all rows of table with start <= key < end.
+
+    Returns:
+        (row_count, hex digest) - identical content yields identical digests
+    """
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {', '.join(columns)} FROM {table} "
+        f"WHERE {key} >= {placeholder} AND {key} < {placeholder} ORDER BY {key}",
+        (start, end)
+    )
+    h = hashlib.blake2b(digest_size=16)
+    count = 0
+    while True:
+        rows = cur.fetchmany(1000)
+        if not rows:
+            break
+        for row in rows:
+            if isinstance(row, dict):
+                row = [row[c] for c in columns]
+            h.update(b'\x1f'.join(_normalize(v) for v in row))
+            h.update(b'\x1e')
+            count += 1
+    cur.close()
+    return count, h.hexdigest()
+
+
+def split_range(start, end, width):
+    """Split [start, end) into consecutive ranges of at most width keys."""
+    return [(s, min(s + width, end)) for s in range(start, end, max(1, width))]
+
+
+def _hash_both(pool, left, right, table, key, columns, ranges):
+    """Hash ranges on both sides concurrently; returns {(start, end): (left, right)}."""
+    futures = {}
+    for rng in ranges:
+        futures[rng] = (
+            pool.submit(lambda r=rng: hash_range(left.get(), left.side.placeholder, table, key, columns, *r)),
+            pool.submit(lambda r=rng: hash_range(right.get(), right.side.placeholder, table, key, columns, *r)),
+        )
+    return {rng: (lf.result(), rf.result()) for rng, (lf, rf) in futures.items()}
+
+
+def verify_table(pool, left, right, table, key, columns, chunk=DEFAULT_CHUNK, resolution=1):
+    """
+    Compare one table between two sides.
+
+    Args:
+        pool: ThreadPoolExecutor shared across tables
+        left, right: _ConnectionCache for each side
+        chunk: Width of the initial key ranges
+        resolution: Stop drilling into a mismatched range once it is this narrow
+
+    Returns:
+        TableResult with the list of differing RangeDiff entries
+    """
+    t0 = time.perf_counter()
+    l_lo, l_hi = _fetch_bounds(left.get(), table, key)
+    r_lo, r_hi = _fetch_bounds(right.get(), table, key)
+    lows = [v for v in (l_lo, r_lo) if v is not None]
+    highs = [v for v in (l_hi, r_hi) if v is not None]
+    if not lows:
+        return TableResult(table, 0, 0, 0, [], time.perf_counter() - t0)
+
+    ranges = split_range(min(lows), max(highs) + 1, chunk)
+    results = _hash_both(pool, left, right, table, key, columns, ranges)
+    left_rows = sum(res[0][0] for res in results.values())
+    right_rows = sum(res[1][0] for res in results.values())
+    checked = len(ranges)
+
+    diffs = []
+    pending = [rng for rng, (l_res, r_res) in results.items() if l_res != r_res]
+    while pending:
+        narrow = [rng for rng in pending if rng[1] - rng[0] <= resolution]
+        wide = [rng for rng in pending if rng[1] - rng[0] > resolution]
+        for rng in narrow:
+            l_res, r_res = results[rng]
+            diffs.append(RangeDiff(table, rng[0], rng[1], l_res[0], r_res[0]))
+        if not wide or len(diffs) + len(wide) > MAX_REPORTED:
+            for rng in wide:
+                l_res, r_res = results[rng]
+                diffs.append(RangeDiff(table, rng[0], rng[1], l_res[0], r_res[0]))
+            break
+        sub_ranges = []
+        for start, end in wide:
+            sub_width = max(resolution, -(-(end - start) // REFINE_FACTOR))
+            sub_ranges.extend(split_range(start, end, sub_width))
+        results = _hash_both(pool, left, right, table, key, columns, sub_ranges)
+        checked += len(sub_ranges)
+        pending = [rng for rng, (l_res, r_res) in results.items() if l_res != r_res]
+
+    diffs.sort(key=lambda d: d.start)
+    return TableResult(table, left_rows, right_rows, checked, diffs, time.perf_counter() - t0)
+
+
+def verify(left: Side, right: Side, tables=None, chunk=DEFAULT_CHUNK,
+           workers=DEFAULT_WORKERS, resolution=1):
+    """
+    Compare every table in tables (default VERIFY_TABLES) between two sides.
+
+    Returns:
+        List of TableResult, in table order
+    """
+    tables = tables or VERIFY_TABLES
+    left_cache = _ConnectionCache(left)
+    right_cache = _ConnectionCache(right)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            table_pool = ThreadPoolExecutor(max_workers=len(tables))
+            futures = [table_pool.submit(verify_table, pool, left_cache, right_cache,
+                                         table, key, columns, chunk, resolution)
+                       for table, key, columns in tables]
+            results = [f.result() for f in futures]
+            table_pool.shutdown()
+        return results
+    finally:
+        left_cache.close()
+        right_cache.close()
+
+
+def _fetch_keys(conn, table, key):
+    cur = conn.cursor()
+    cur.execute(f"SELECT {key} FROM {table}")
+    keys = {tuple(row.values())[0] if isinstance(row, dict) else row[0] for row in cur.fetchall()}
+    cur.close()
+    return keys
+
+
+def verify_keys(left: Side, right: Side, tables=None):
+    """
+    Check that every key of each table in tables (default KEY_TABLES) on the left exists on the right.
+
+    Returns:
+        List of KeyResult, in table order
+    """
+    left_conn = left.connect()
+    right_conn = right.connect()
+    try:
+        results = []
+        for table, key, expected_min in tables or KEY_TABLES:
+            left_keys = _fetch_keys(left_conn, table, key)
+            right_keys = _fetch_keys(right_conn, table, key)
+            results.append(KeyResult(table, len(left_keys), len(right_keys), expected_min,
+                                     sorted(left_keys - right_keys)))
+        return results
+    finally:
+        left_conn.close()
+        right_conn.close()
+
+
+def print_key_report(results, left_name='left', right_name='right'):
+    """Print the key-set checks; returns True when no key is missing and every count is reached."""
+    all_ok = True
+    for r in results:
+        ok = not r.missing and r.right_rows >= r.expected_min
+        all_ok = all_ok and ok
+        print(f"  {r.table}: {left_name}={r.left_rows} {right_name}={r.right_rows} keys "
+              f"(expected >={r.expected_min}) [{'OK' if ok else 'MISMATCH'}]")
+        if r.missing:
+            shown = ', '.join(str(k) for k in r.missing[:MAX_REPORTED])
+            print(f"    missing on {right_name}: {shown}")
+    return all_ok
+
+
+def print_report(results, left_name='left', right_name='right'):
+    """Print a per-table summary; returns True when every table matches."""
+    all_ok = True
+    for r in results:
+        ok = not r.diffs
+        all_ok = all_ok and ok
+        print(f"  {r.table}: {left_name}={r.left_rows} {right_name}={r.right_rows} rows, "
+              f"{r.ranges} ranges hashed in {r.seconds:.2f}s [{'OK' if ok else 'MISMATCH'}]")
+        for d in r.diffs:
+            span = f"{d.start}" if d.end - d.start == 1 else f"{d.start}..{d.end - 1}"
+            print(f"    key {span}: {left_name} {d.left_rows} row(s), {right_name} {d.right_rows} row(s) differ")
+    return all_ok
+
+
+def sqlite_side(path):
+    return Side(path, lambda: sqlite3.connect(path, check_same_thread=False), '?')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare table contents between two databases by key-range hashes")
+    parser.add_argument('--left-sqlite', help="Use a local SQLite file as the left side instead of MySQL")
+    parser.add_argument('--right-sqlite', help="Use a local SQLite file as the right side instead of PostgreSQL")
+    parser.add_argument('--table', action='append', help="Limit to these tables (repeatable)")
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK, help=f"Keys per range (default: {DEFAULT_CHUNK})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f"Parallel hashes (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--resolution', type=int, default=1, help="Narrowest key range to report (default: 1)")
+    args = parser.parse_args()
+
+    if args.left_sqlite:
+        left = sqlite_side(args.left_sqlite)
+    else:
+        from migrate_to_postgres import get_mysql
+        left = Side('mysql', get_mysql, '%s')
+    if args.right_sqlite:
+        right = sqlite_side(args.right_sqlite)
+    else:
+        from migrate_to_postgres import get_pg
+        right = Side('postgres', get_pg, '%s')
+
+    tables = VERIFY_TABLES
+    key_tables = KEY_TABLES
+    if args.table:
+        tables = [t for t in VERIFY_TABLES if t[0] in args.table]
+        key_tables = [t for t in KEY_TABLES if t[0] in args.table]
+
+    print(f"Comparing {left.name} -> {right.name}")
+    ok = True
+    if tables:
+        results = verify(left, right, tables, chunk=args.chunk, workers=args.workers, resolution=args.resolution)
+        ok = print_report(results, left.name, right.name)
+    if key_tables:
+        ok = print_key_report(verify_keys(left, right, key_tables), left.name, right.name) and ok
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
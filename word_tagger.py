@@ -0,0 +1,117 @@
+"""
+Transliteration tagger: finds yy_word spellings in translation HTML.
+- Every active word's spellings are compiled once into one Aho-Corasick
+  automaton (aho_corasick), lowercased with curly apostrophes folded the way
+  the front end's normalizeWord() does
+- tag() scans the text of each <i> and <span class="word"> fragment (the
+  front end's transliteration scope) once and keeps whole-token matches only,
+  using the API's [a-zA-Z'] word boundary; overlapping matches resolve
+  leftmost-longest
+- A spelling shared by several words goes to the first by word_spelling_sort,
+  as api/word-lookup.php picks it
+- Offsets are into the stored HTML, counted in UTF-16 code units so the
+  browser can slice yy_translation_copy with them directly; matches never
+  cross a tag
+
+    tagger = WordTagger.load(cur)
+    tagger.tag('<i>Yahowah</i> said')   # [(3, 10, 12)]: (start, end, word_id)
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aho_corasick import Automaton
+from translation_text import ITALIC_RE, WORD_SPAN_RE
+
+APOSTROPHES = {'\u2018': "'", '\u2019': "'", '\u2032': "'"}
+TEXT_RE = re.compile(r'[^<]+')
+FRAGMENT_RES = (ITALIC_RE, WORD_SPAN_RE)
+
+
+def fold(text: str) -> str:
+    """Lowercase with curly apostrophes as ', one character for one (offsets stay valid)."""
+    folded = []
+    for ch in text:
+        ch = APOSTROPHES.get(ch, ch)
+        lower = ch.lower()
+        folded.append(lower if len(lower) == 1 else ch)
+    return ''.join(folded)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch == "'" or ('a' <= ch <= 'z')
+
+
+def _utf16_offsets(html: str):
+    """Code point offset -> UTF-16 offset (the identity unless html has characters outside the BMP)."""
+    if not html or max(html) <= '\uffff':
+        return None
+    shift = [0] * (len(html) + 1)
+    extra = 0
+    for i, ch in enumerate(html):
+        shift[i] = extra
+        if ch > '\uffff':
+            extra += 1
+    shift[len(html)] = extra
+    return shift
+
+
+class WordTagger:
+    """Automaton over every active spelling; tag() returns (start, end, word_id) matches."""
+
+    def __init__(self, spellings: Iterable[Tuple[str, int]]):
+        """spellings: (spelling text, word_id) in priority order; the first word_id per folded spelling wins."""
+        self.automaton = Automaton()
+        self.words: Dict[str, int] = {}
+        for text, word_id in spellings:
+            key = fold((text or '').strip())
+            if key and key not in self.words:
+                self.words[key] = word_id
+                self.automaton.add(key, word_id)
+        self.automaton.build()
+
+    @classmethod
+    def load(cls, cur) -> 'WordTagger':
+        cur.execute("""
+            SELECT s.word_spelling_text, s.word_id
+            FROM yy_word_spelling s
+            JOIN yy_word w ON w.word_id = s.word_id
+            WHERE w.word_active_flag = true AND s.word_spelling_text IS NOT NULL
+            ORDER BY s.word_spelling_sort, s.word_spelling_id
+        """)
+        return cls(cur.fetchall())
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _scan(self, text: str, base: int, matches: List[Tuple[int, int, int]]) -> None:
+        folded = fold(text)
+        candidates = []
+        for start, end, word_id in self.automaton.iter_spans(folded):
+            if start > 0 and _is_word_char(folded[start - 1]):
+                continue
+            if end < len(folded) and _is_word_char(folded[end]):
+                continue
+            candidates.append((start, -end, word_id))
+        candidates.sort()
+        taken = 0
+        for start, neg_end, word_id in candidates:
+            if start >= taken:
+                matches.append((base + start, base - neg_end, word_id))
+                taken = -neg_end
+
+    def tag(self, html: Optional[str]) -> List[Tuple[int, int, int]]:
+        """(start, end, word_id) of each spelling in the transliteration fragments, in order."""
+        if not html or not self.words:
+            return []
+        matches: List[Tuple[int, int, int]] = []
+        for fragment_re in FRAGMENT_RES:
+            for fragment in fragment_re.finditer(html):
+                inner_start, inner_end = fragment.span(1)
+                for segment in TEXT_RE.finditer(html, inner_start, inner_end):
+                    self._scan(segment.group(), segment.start(), matches)
+        # Nested fragments (<span class="word"><i>..</i></span>) are seen twice
+        matches = sorted(set(matches))
+        shift = _utf16_offsets(html)
+        if shift:
+            matches = [(start + shift[start], end + shift[end], word_id) for start, end, word_id in matches]
+        return matches